@@ -1,4 +1,5 @@
 import asyncio
+import re
 from logging.config import fileConfig
 
 from alembic import context
@@ -28,6 +29,17 @@ target_metadata = Base.metadata
 # my_important_option = config.get_main_option("my_important_option")
 # ... etc.
 
+# Monthly partitions of notification_delivery are created and dropped at runtime
+# by app.workers.partitions, so autogenerate must not try to remove them. Neither the
+# default partition, which has no model of its own.
+PARTITION_NAME_RE = re.compile(r"^notification_delivery_(y\d{4}m\d{2}|default)$")
+
+
+def include_name(name: str | None, type_: str, parent_names: dict) -> bool:
+    if type_ == "table":
+        return PARTITION_NAME_RE.match(name) is None
+    return True
+
 
 def run_migrations_offline() -> None:
     """Run migrations in 'offline' mode.
@@ -45,6 +57,7 @@ def run_migrations_offline() -> None:
     context.configure(
         url=url,
         target_metadata=target_metadata,
+        include_name=include_name,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
     )
@@ -54,7 +67,9 @@ def run_migrations_offline() -> None:
 
 
 def do_run_migrations(connection: Connection) -> None:
-    context.configure(connection=connection, target_metadata=target_metadata)
+    context.configure(
+        connection=connection, target_metadata=target_metadata, include_name=include_name
+    )
 
     with context.begin_transaction():
         context.run_migrations()
@@ -0,0 +1,31 @@
+"""add default delivery partition
+
+Revision ID: 0ee15b3af28b
+Revises: f231b08a2969
+Create Date: 2026-10-18 16:18:36.797789
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "0ee15b3af28b"
+down_revision: Union[str, Sequence[str], None] = "f231b08a2969"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Deliveries of months without a partition land here instead of failing to insert,
+    # maintain_notification_delivery_partitions moves them out once the month is created.
+    op.execute(
+        "CREATE TABLE notification_delivery_default PARTITION OF notification_delivery DEFAULT"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP TABLE notification_delivery_default")
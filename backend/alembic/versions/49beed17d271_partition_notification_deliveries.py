@@ -0,0 +1,129 @@
+"""partition notification deliveries
+
+Revision ID: 49beed17d271
+Revises: e44be935301e
+Create Date: 2026-10-18 15:34:17.515912
+
+"""
+
+from datetime import date, datetime, timezone
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "49beed17d271"
+down_revision: Union[str, Sequence[str], None] = "e44be935301e"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+PARTITIONS_AHEAD = 2
+
+
+def _add_months(month: date, months: int) -> date:
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def _create_delivery_table(name: str, partitioned: bool) -> None:
+    op.create_table(
+        name,
+        sa.Column("id", sa.UUID(), nullable=False),
+        sa.Column("notification_rule_id", sa.UUID(), nullable=True),
+        sa.Column("scheduled_for", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("processed_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("status", sa.String(length=20), nullable=False),
+        sa.Column("payload", postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+        sa.Column("provider_message_id", sa.String(), nullable=True),
+        sa.Column("notification_rule_ids", sa.ARRAY(sa.UUID()), nullable=True),
+        sa.ForeignKeyConstraint(
+            ["notification_rule_id"],
+            ["notification_rule.id"],
+            name="notification_delivery_notification_rule_id_fkey",
+            ondelete="SET NULL",
+        ),
+        sa.PrimaryKeyConstraint(
+            *(["id", "scheduled_for"] if partitioned else ["id"]),
+            name="notification_delivery_pkey",
+        ),
+        postgresql_partition_by="RANGE (scheduled_for)" if partitioned else None,
+    )
+    op.create_index(
+        op.f("ix_notification_delivery_notification_rule_id"),
+        name,
+        ["notification_rule_id"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_notification_delivery_status_scheduled_for",
+        name,
+        ["status", "scheduled_for"],
+        unique=False,
+    )
+
+
+def _replace_delivery_table(partitioned: bool) -> None:
+    op.drop_index("ix_notification_delivery_status_scheduled_for", "notification_delivery")
+    op.drop_index(op.f("ix_notification_delivery_notification_rule_id"), "notification_delivery")
+    op.rename_table("notification_delivery", "notification_delivery_old")
+    op.execute(
+        "ALTER TABLE notification_delivery_old RENAME CONSTRAINT notification_delivery_pkey "
+        "TO notification_delivery_old_pkey"
+    )
+    _create_delivery_table("notification_delivery", partitioned)
+
+    if partitioned:
+        oldest = op.get_bind().scalar(
+            sa.text("SELECT min(scheduled_for) FROM notification_delivery_old")
+        )
+        current = datetime.now(timezone.utc).date().replace(day=1)
+        month = min(oldest.date().replace(day=1), current) if oldest else current
+        while month <= _add_months(current, PARTITIONS_AHEAD):
+            op.execute(
+                f"CREATE TABLE notification_delivery_y{month.year:04d}m{month.month:02d} "
+                "PARTITION OF notification_delivery "
+                f"FOR VALUES FROM ('{month.isoformat()} 00:00:00+00') "
+                f"TO ('{_add_months(month, 1).isoformat()} 00:00:00+00')"
+            )
+            month = _add_months(month, 1)
+
+    op.execute("INSERT INTO notification_delivery SELECT * FROM notification_delivery_old")
+    op.drop_table("notification_delivery_old")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # ### commands auto generated by Alembic - please adjust! ###
+    op.create_table(
+        "notification_delivery_daily_stats",
+        sa.Column("id", sa.UUID(), nullable=False),
+        sa.Column("day", sa.Date(), nullable=False),
+        sa.Column("notification_rule_id", sa.UUID(), nullable=True),
+        sa.Column("status", sa.String(length=20), nullable=False),
+        sa.Column("count", sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "ix_notification_delivery_daily_stats_day_rule_status",
+        "notification_delivery_daily_stats",
+        ["day", "notification_rule_id", "status"],
+        unique=True,
+        postgresql_nulls_not_distinct=True,
+    )
+    # ### end Alembic commands ###
+    _replace_delivery_table(partitioned=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    _replace_delivery_table(partitioned=False)
+    # ### commands auto generated by Alembic - please adjust! ###
+    op.drop_index(
+        "ix_notification_delivery_daily_stats_day_rule_status",
+        table_name="notification_delivery_daily_stats",
+        postgresql_nulls_not_distinct=True,
+    )
+    op.drop_table("notification_delivery_daily_stats")
+    # ### end Alembic commands ###
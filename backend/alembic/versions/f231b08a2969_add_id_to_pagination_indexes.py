@@ -0,0 +1,75 @@
+"""add id to pagination indexes
+
+Revision ID: f231b08a2969
+Revises: 001964efc49a
+Create Date: 2026-10-18 15:54:15.285620
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "f231b08a2969"
+down_revision: Union[str, Sequence[str], None] = "001964efc49a"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Like the indexes they replace, these are built and dropped concurrently, so writes to
+    # routines and products are not blocked meanwhile. The new index is in place before
+    # the old one is dropped, so pagination never runs without one.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_product_user_id_updated_at_id",
+            "product",
+            ["user_id", sa.literal_column("updated_at DESC"), sa.literal_column("id DESC")],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            "ix_product_user_id_updated_at", table_name="product", postgresql_concurrently=True
+        )
+        op.create_index(
+            "ix_routine_user_id_performed_at_id",
+            "routine",
+            ["user_id", sa.literal_column("performed_at DESC"), sa.literal_column("id DESC")],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            "ix_routine_user_id_performed_at", table_name="routine", postgresql_concurrently=True
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_routine_user_id_performed_at",
+            "routine",
+            ["user_id", sa.literal_column("performed_at DESC")],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            "ix_routine_user_id_performed_at_id",
+            table_name="routine",
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "ix_product_user_id_updated_at",
+            "product",
+            ["user_id", sa.literal_column("updated_at DESC")],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            "ix_product_user_id_updated_at_id",
+            table_name="product",
+            postgresql_concurrently=True,
+        )
@@ -0,0 +1,139 @@
+"""add hot query indexes
+
+Revision ID: ff63829708f2
+Revises: d530aa712942
+Create Date: 2026-10-18 15:21:06.593949
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "ff63829708f2"
+down_revision: Union[str, Sequence[str], None] = "d530aa712942"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Indexes are built concurrently, so writes to these tables are not blocked meanwhile.
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction block.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            op.f("ix_notification_delivery_notification_rule_id"),
+            "notification_delivery",
+            ["notification_rule_id"],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "ix_notification_delivery_status_scheduled_for",
+            "notification_delivery",
+            ["status", "scheduled_for"],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "ix_notification_rule_next_run_enabled",
+            "notification_rule",
+            ["next_run"],
+            unique=False,
+            postgresql_where=sa.text("enabled"),
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            op.f("ix_notification_rule_user_id"),
+            "notification_rule",
+            ["user_id"],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "ix_product_user_id_updated_at",
+            "product",
+            ["user_id", sa.literal_column("updated_at DESC")],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "ix_routine_user_id_performed_at",
+            "routine",
+            ["user_id", sa.literal_column("performed_at DESC")],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            op.f("ix_routine_product_product_id"),
+            "routine_product",
+            ["product_id"],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "ix_routine_product_routine_id_product_id",
+            "routine_product",
+            ["routine_id", "product_id"],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            op.f("ix_user_device_user_id"),
+            "user_device",
+            ["user_id"],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            op.f("ix_user_device_user_id"),
+            table_name="user_device",
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            "ix_routine_product_routine_id_product_id",
+            table_name="routine_product",
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            op.f("ix_routine_product_product_id"),
+            table_name="routine_product",
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            "ix_routine_user_id_performed_at",
+            table_name="routine",
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            "ix_product_user_id_updated_at",
+            table_name="product",
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            op.f("ix_notification_rule_user_id"),
+            table_name="notification_rule",
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            "ix_notification_rule_next_run_enabled",
+            table_name="notification_rule",
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            "ix_notification_delivery_status_scheduled_for",
+            table_name="notification_delivery",
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            op.f("ix_notification_delivery_notification_rule_id"),
+            table_name="notification_delivery",
+            postgresql_concurrently=True,
+        )
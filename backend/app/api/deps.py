@@ -11,7 +11,8 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.core import settings
 from app.database import AsyncSessionLocal
 from app.database.models import User
-from app.schemas import RefreshToken, TokenPayload
+from app.schemas import RefreshToken, TokenPayload, UserRead
+from app.services import TokenCache, UserCache
 
 REUSABLE_OAUTH2 = OAuth2PasswordBearer(
     tokenUrl=f"{settings.API_PATH}/auth/token", refreshUrl=f"{settings.API_PATH}/auth/refresh"
@@ -35,6 +36,9 @@ TokenDep = Annotated[str, Depends(REUSABLE_OAUTH2)]
 
 
 def parse_jwt_token(token: TokenDep) -> TokenPayload:
+    data = TokenCache.get(token)
+    if data is not None:
+        return data
     try:
         payload = jwt.decode(
             token, settings.ACCESS_TOKEN_SECRET_KEY, algorithms=[settings.JWT_ALGORITHM]
@@ -46,6 +50,7 @@ def parse_jwt_token(token: TokenDep) -> TokenPayload:
             detail="Invalid or expired token",
             headers={"WWW-Authenticate": "Bearer"},
         ) from exc
+    TokenCache.set(token, data)
     return data
 
 
@@ -71,15 +76,36 @@ def parse_jwt_refresh_token(body: RefreshToken) -> TokenPayload:
 ParseJWTRefreshTokenDep = Annotated[TokenPayload, Depends(parse_jwt_refresh_token)]
 
 
-async def get_current_user(session: SessionDep, payload: ParseJWTTokenDep) -> User:
-    user: User | None = await session.get(User, uuid.UUID(payload.sub))
-    if user is None:
+def get_current_user_id(payload: ParseJWTTokenDep) -> uuid.UUID:
+    """Returns the ID of the user the verified token was issued to, without database access."""
+    try:
+        return uuid.UUID(payload.sub)
+    except ValueError as exc:
         raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="User not found",
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid or expired token",
             headers={"WWW-Authenticate": "Bearer"},
-        )
+        ) from exc
+
+
+CurrentUserIdDep = Annotated[uuid.UUID, Depends(get_current_user_id)]
+
+
+async def get_current_user(user_id: CurrentUserIdDep) -> UserRead:
+    """Returns the current user from UserCache, a database session is opened on misses only."""
+    user = await UserCache.get(user_id)
+    if user is None:
+        async with AsyncSessionLocal() as session:
+            db_user: User | None = await session.get(User, user_id)
+        if db_user is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="User not found",
+                headers={"WWW-Authenticate": "Bearer"},
+            )
+        user = UserRead.model_validate(db_user)
+        await UserCache.set(user)
     return user
 
 
-CurrentUserDep = Annotated[User, Depends(get_current_user)]
+CurrentUserDep = Annotated[UserRead, Depends(get_current_user)]
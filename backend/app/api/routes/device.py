@@ -1,7 +1,7 @@
 from fastapi import APIRouter, HTTPException, status
 
 from app import crud
-from app.api.deps import CurrentUserDep, SessionDep
+from app.api.deps import CurrentUserIdDep, SessionDep
 from app.database.models import UserDevice
 from app.schemas import GenericMultipleItems, UserDeviceCreate, UserDeviceRead
 
@@ -15,7 +15,7 @@ router = APIRouter(prefix="/devices", tags=["devices"])
     response_model=UserDeviceRead,
 )
 async def register_device(
-    *, device_in: UserDeviceCreate, session: SessionDep, user: CurrentUserDep
+    *, device_in: UserDeviceCreate, session: SessionDep, user_id: CurrentUserIdDep
 ) -> UserDevice:
     device = await crud.device.get_device_by_fcm_token(session, device_in.fcm_token)
     if device is not None:
@@ -23,7 +23,7 @@ async def register_device(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Device with this FCM token is already registered",
         )
-    device = await crud.device.create_user_device(session, user.id, device_in)
+    device = await crud.device.create_user_device(session, user_id, device_in)
     return device
 
 
@@ -33,7 +33,7 @@ async def register_device(
     response_model=GenericMultipleItems[UserDeviceRead],
 )
 async def get_devices(
-    session: SessionDep, user: CurrentUserDep
+    session: SessionDep, user_id: CurrentUserIdDep
 ) -> GenericMultipleItems[UserDeviceRead]:
-    devices = await crud.device.get_user_devices(session, user.id)
+    devices = await crud.device.get_user_devices(session, user_id)
     return GenericMultipleItems[UserDeviceRead](items=devices)
@@ -3,7 +3,7 @@ import uuid
 from fastapi import APIRouter, Response, status
 
 from app import crud
-from app.api.deps import CurrentUserDep, SessionDep
+from app.api.deps import CurrentUserIdDep, SessionDep
 from app.api.utils import get_owned_resource_or_404
 from app.database.models import NotificationRule
 from app.schemas import (
@@ -12,6 +12,7 @@ from app.schemas import (
     NotificationRuleRead,
     NotificationRuleUpdatePartial,
 )
+from app.services import RedisScheduleIndex
 
 router = APIRouter(prefix="/notification-rules", tags=["notification-rules"])
 
@@ -24,9 +25,12 @@ NOTIFICATION_RULE_NOT_FOUND_MESSAGE = "Notification rule not found or you don't
     response_model=NotificationRuleRead,
 )
 async def create_notification_rule(
-    *, rule_in: NotificationRuleCreate, session: SessionDep, user: CurrentUserDep
+    *, rule_in: NotificationRuleCreate, session: SessionDep, user_id: CurrentUserIdDep
 ) -> NotificationRule:
-    rule = await crud.notification.create_notification_rule(session, user.id, rule_in)
+    rule = await crud.notification.create_notification_rule(session, user_id, rule_in)
+    # The schedule index only mirrors committed rules, a rollback must not leave entries behind.
+    await session.commit()
+    await RedisScheduleIndex.sync_rule(rule)
     return rule
 
 
@@ -36,9 +40,9 @@ async def create_notification_rule(
     response_model=GenericMultipleItems[NotificationRuleRead],
 )
 async def get_notification_rules(
-    *, session: SessionDep, user: CurrentUserDep
+    *, session: SessionDep, user_id: CurrentUserIdDep
 ) -> GenericMultipleItems[NotificationRuleRead]:
-    rules = await crud.notification.get_user_notification_rules(session, user.id)
+    rules = await crud.notification.get_user_notification_rules(session, user_id)
     return GenericMultipleItems[NotificationRuleRead](items=rules)
 
 
@@ -46,13 +50,13 @@ async def get_notification_rules(
     "/{id}", summary="Get a specific notification rule", response_model=NotificationRuleRead
 )
 async def get_notification_rule(
-    id: uuid.UUID, *, session: SessionDep, user: CurrentUserDep
+    id: uuid.UUID, *, session: SessionDep, user_id: CurrentUserIdDep
 ) -> NotificationRule:
     rule = await get_owned_resource_or_404(
         session=session,
         getter=crud.notification.get_notification_rule_by_id,
         resource_id=id,
-        owner_id=user.id,
+        owner_id=user_id,
         detail=NOTIFICATION_RULE_NOT_FOUND_MESSAGE,
     )
     return rule
@@ -66,16 +70,18 @@ async def update_notification_rule(
     *,
     rule_in: NotificationRuleUpdatePartial,
     session: SessionDep,
-    user: CurrentUserDep,
+    user_id: CurrentUserIdDep,
 ) -> NotificationRule:
     rule = await get_owned_resource_or_404(
         session=session,
         getter=crud.notification.get_notification_rule_by_id,
         resource_id=id,
-        owner_id=user.id,
+        owner_id=user_id,
         detail=NOTIFICATION_RULE_NOT_FOUND_MESSAGE,
     )
     rule = await crud.notification.update_notification_rule(session, rule, rule_in)
+    await session.commit()
+    await RedisScheduleIndex.sync_rule(rule)
     return rule
 
 
@@ -83,14 +89,16 @@ async def update_notification_rule(
     "/{id}", summary="Delete a specific notification rule", status_code=status.HTTP_204_NO_CONTENT
 )
 async def delete_notification_rule(
-    id: uuid.UUID, *, session: SessionDep, user: CurrentUserDep
+    id: uuid.UUID, *, session: SessionDep, user_id: CurrentUserIdDep
 ) -> Response:
     rule = await get_owned_resource_or_404(
         session=session,
         getter=crud.notification.get_notification_rule_by_id,
         resource_id=id,
-        owner_id=user.id,
+        owner_id=user_id,
         detail=NOTIFICATION_RULE_NOT_FOUND_MESSAGE,
     )
     await crud.notification.delete_notification_rule(session, rule)
+    await session.commit()
+    await RedisScheduleIndex.remove_rule(id)
     return Response(status_code=status.HTTP_204_NO_CONTENT)
@@ -1,25 +1,77 @@
-from contextlib import suppress
+import uuid
 
-from fastapi import APIRouter, Response
-from firebase_admin.exceptions import FirebaseError
+from fastapi import APIRouter, HTTPException, status
 
 from app import crud
 from app.api.deps import SessionDep
-from app.services.fcm import FCMService
+from app.core import celery
+from app.database.models import NotificationCampaign
+from app.schemas import BroadcastJob, BroadcastStatus, CampaignCreate, CampaignRead
+from app.services import CampaignSegments
 
 router = APIRouter(prefix="/private", tags=["private"])
 
 
 @router.post(
-    "/test-notify-all", summary="Send general push notification for all registered devices"
+    "/test-notify-all",
+    summary="Send general push notification for all registered devices",
+    status_code=status.HTTP_202_ACCEPTED,
+    response_model=BroadcastJob,
 )
-async def notify(*, session: SessionDep) -> Response:
-    devices = await crud.device.get_all_user_devices(session)
-    for device in devices:
-        with suppress(FirebaseError):
-            FCMService.send_message(
-                token=device.fcm_token,
-                title="Test Notification",
-                body="This is a test notification sent to all registered devices.",
-            )
-    return Response(status_code=204)
+def notify() -> BroadcastJob:
+    result = celery.send_task(
+        "broadcast_notification",
+        kwargs={
+            "title": "Test Notification",
+            "body": "This is a test notification sent to all registered devices.",
+        },
+    )
+    return BroadcastJob(job_id=result.id)
+
+
+@router.get(
+    "/broadcasts/{job_id}",
+    summary="Get progress of a push notification broadcast",
+    response_model=BroadcastStatus,
+)
+def get_broadcast(job_id: str) -> BroadcastStatus:
+    result = celery.AsyncResult(job_id)
+    progress = result.info if isinstance(result.info, dict) else {}
+    return BroadcastStatus(job_id=job_id, state=result.state, **progress)
+
+
+@router.post(
+    "/campaigns",
+    summary="Send a push notification campaign to segments of devices",
+    status_code=status.HTTP_202_ACCEPTED,
+    response_model=CampaignRead,
+)
+async def create_campaign(
+    *, campaign_in: CampaignCreate, session: SessionDep
+) -> NotificationCampaign:
+    for segment in campaign_in.segments:
+        try:
+            CampaignSegments.get_attributes(segment)
+        except ValueError as exc:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
+    try:
+        CampaignSegments.get_condition(campaign_in.segments)
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
+    campaign = await crud.campaign.create_campaign(session, campaign_in)
+    # The worker has to see the campaign, so it is committed before the task is published.
+    await session.commit()
+    celery.send_task("send_campaign", kwargs={"campaign_id": str(campaign.id)})
+    return campaign
+
+
+@router.get(
+    "/campaigns/{id}",
+    summary="Get status of a push notification campaign",
+    response_model=CampaignRead,
+)
+async def get_campaign(id: uuid.UUID, *, session: SessionDep) -> NotificationCampaign:
+    campaign = await crud.campaign.get_campaign_by_id(session, id)
+    if campaign is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Campaign not found")
+    return campaign
@@ -4,7 +4,7 @@ from typing import Annotated
 from fastapi import APIRouter, Query, Response, status
 
 from app import crud
-from app.api.deps import CurrentUserDep, SessionDep
+from app.api.deps import CurrentUserIdDep, SessionDep
 from app.api.utils import get_owned_resource_or_404, paginate
 from app.database.models import Product
 from app.schemas import (
@@ -27,9 +27,9 @@ PRODUCT_NOT_FOUND_MESSAGE = "Product not found or you don't have access to it"
     response_model=ProductRead,
 )
 async def create_product(
-    *, product_in: ProductCreate, session: SessionDep, user: CurrentUserDep
+    *, product_in: ProductCreate, session: SessionDep, user_id: CurrentUserIdDep
 ) -> Product:
-    product = await crud.product.create_product(session, user.id, product_in)
+    product = await crud.product.create_product(session, user_id, product_in)
     return product
 
 
@@ -42,19 +42,21 @@ async def get_products(
     params: Annotated[PaginationParams, Query()],
     *,
     session: SessionDep,
-    user: CurrentUserDep,
+    user_id: CurrentUserIdDep,
 ) -> PaginatedResponse[ProductRead]:
-    products, total = await crud.product.get_user_products(session, user.id, params)
-    return paginate(items=products, total=total, limit=params.limit, offset=params.offset)
+    products, total, next_cursor = await crud.product.get_user_products(session, user_id, params)
+    return paginate(items=products, total=total, params=params, next_cursor=next_cursor)
 
 
 @router.get("/{id}", summary="Get a specific skin care product", response_model=ProductRead)
-async def get_product_by_id(id: uuid.UUID, *, session: SessionDep, user: CurrentUserDep) -> Product:
+async def get_product_by_id(
+    id: uuid.UUID, *, session: SessionDep, user_id: CurrentUserIdDep
+) -> Product:
     product = await get_owned_resource_or_404(
         session=session,
         getter=crud.product.get_product_by_id,
         resource_id=id,
-        owner_id=user.id,
+        owner_id=user_id,
         detail=PRODUCT_NOT_FOUND_MESSAGE,
     )
     return product
@@ -62,13 +64,17 @@ async def get_product_by_id(id: uuid.UUID, *, session: SessionDep, user: Current
 
 @router.patch("/{id}", summary="Update a specific skin care product", response_model=ProductRead)
 async def update_product(
-    id: uuid.UUID, *, product_in: ProductUpdatePartial, session: SessionDep, user: CurrentUserDep
+    id: uuid.UUID,
+    *,
+    product_in: ProductUpdatePartial,
+    session: SessionDep,
+    user_id: CurrentUserIdDep,
 ) -> Product:
     product = await get_owned_resource_or_404(
         session=session,
         getter=crud.product.get_product_by_id,
         resource_id=id,
-        owner_id=user.id,
+        owner_id=user_id,
         detail=PRODUCT_NOT_FOUND_MESSAGE,
     )
     product = await crud.product.update_product(session, product, product_in)
@@ -78,12 +84,14 @@ async def update_product(
 @router.delete(
     "/{id}", summary="Delete a specific skin care product", status_code=status.HTTP_204_NO_CONTENT
 )
-async def delete_product(id: uuid.UUID, *, session: SessionDep, user: CurrentUserDep) -> Response:
+async def delete_product(
+    id: uuid.UUID, *, session: SessionDep, user_id: CurrentUserIdDep
+) -> Response:
     product = await get_owned_resource_or_404(
         session=session,
         getter=crud.product.get_product_by_id,
         resource_id=id,
-        owner_id=user.id,
+        owner_id=user_id,
         detail=PRODUCT_NOT_FOUND_MESSAGE,
     )
     await crud.product.delete_product(session, product)
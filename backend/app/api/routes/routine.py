@@ -4,14 +4,16 @@ from typing import Annotated
 from fastapi import APIRouter, HTTPException, Query, Response, status
 
 from app import crud
-from app.api.deps import CurrentUserDep, SessionDep
+from app.api.deps import CurrentUserIdDep, SessionDep
 from app.api.utils import get_owned_resource_or_404, paginate
 from app.database.models import Routine
 from app.schemas import (
     PaginatedResponse,
     RoutineCreate,
+    RoutineExpand,
     RoutineParams,
     RoutineRead,
+    RoutineSummary,
     RoutineUpdatePartial,
 )
 
@@ -27,33 +29,42 @@ ROUTINE_NOT_FOUND_MESSAGE = "Routine not found or you don't have access to it"
     response_model=RoutineRead,
 )
 async def create_routine(
-    *, routine_in: RoutineCreate, session: SessionDep, user: CurrentUserDep
+    *, routine_in: RoutineCreate, session: SessionDep, user_id: CurrentUserIdDep
 ) -> Routine:
-    products = await crud.product.get_user_products_by_ids(session, user.id, routine_in.product_ids)
+    products = await crud.product.get_user_products_by_ids(session, user_id, routine_in.product_ids)
     if {p.id for p in products} != set(routine_in.product_ids):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="One or more products do not exist in the user's inventory",
         )
-    routine = await crud.routine.create_routine(session, user.id, routine_in)
+    routine = await crud.routine.create_routine(session, user_id, routine_in)
     return routine
 
 
 @router.get("/", summary="Get all performed routine entries for the current user")
 async def get_routines(
-    params: Annotated[RoutineParams, Query()], *, session: SessionDep, user: CurrentUserDep
-) -> PaginatedResponse[RoutineRead]:
-    routines, total = await crud.routine.get_user_routines(session, user.id, params)
-    return paginate(items=routines, total=total, limit=params.limit, offset=params.offset)
+    params: Annotated[RoutineParams, Query()], *, session: SessionDep, user_id: CurrentUserIdDep
+) -> PaginatedResponse[RoutineSummary] | PaginatedResponse[RoutineRead]:
+    if params.expand == RoutineExpand.PRODUCTS:
+        routines, total, next_cursor = await crud.routine.get_user_routines(
+            session, user_id, params
+        )
+        return paginate(items=routines, total=total, params=params, next_cursor=next_cursor)
+    summaries, total, next_cursor = await crud.routine.get_user_routine_summaries(
+        session, user_id, params
+    )
+    return paginate(items=summaries, total=total, params=params, next_cursor=next_cursor)
 
 
 @router.get("/{id}", summary="Get a specific performed routine entry", response_model=RoutineRead)
-async def get_routine_by_id(id: uuid.UUID, *, session: SessionDep, user: CurrentUserDep) -> Routine:
+async def get_routine_by_id(
+    id: uuid.UUID, *, session: SessionDep, user_id: CurrentUserIdDep
+) -> Routine:
     routine = await get_owned_resource_or_404(
         session=session,
         getter=crud.routine.get_routine_by_id,
         resource_id=id,
-        owner_id=user.id,
+        owner_id=user_id,
         detail=ROUTINE_NOT_FOUND_MESSAGE,
     )
     return routine
@@ -63,11 +74,15 @@ async def get_routine_by_id(id: uuid.UUID, *, session: SessionDep, user: Current
     "/{id}", summary="Update a specific performed routine entry", response_model=RoutineRead
 )
 async def update_routine_by_id(
-    id: uuid.UUID, *, routine_in: RoutineUpdatePartial, session: SessionDep, user: CurrentUserDep
+    id: uuid.UUID,
+    *,
+    routine_in: RoutineUpdatePartial,
+    session: SessionDep,
+    user_id: CurrentUserIdDep,
 ) -> Routine:
     if routine_in.product_ids is not None:
         products = await crud.product.get_user_products_by_ids(
-            session, user.id, routine_in.product_ids
+            session, user_id, routine_in.product_ids
         )
         if {p.id for p in products} != set(routine_in.product_ids):
             raise HTTPException(
@@ -79,7 +94,7 @@ async def update_routine_by_id(
         session=session,
         getter=crud.routine.get_routine_by_id,
         resource_id=id,
-        owner_id=user.id,
+        owner_id=user_id,
         detail=ROUTINE_NOT_FOUND_MESSAGE,
     )
 
@@ -93,13 +108,13 @@ async def update_routine_by_id(
     status_code=status.HTTP_204_NO_CONTENT,
 )
 async def delete_routine_by_id(
-    id: uuid.UUID, *, session: SessionDep, user: CurrentUserDep
+    id: uuid.UUID, *, session: SessionDep, user_id: CurrentUserIdDep
 ) -> Response:
     routine = await get_owned_resource_or_404(
         session=session,
         getter=crud.routine.get_routine_by_id,
         resource_id=id,
-        owner_id=user.id,
+        owner_id=user_id,
         detail=ROUTINE_NOT_FOUND_MESSAGE,
     )
     await crud.routine.delete_routine(session, routine)
@@ -1,9 +1,10 @@
 from fastapi import APIRouter, HTTPException, Response, status
 
 from app import crud
-from app.api.deps import CurrentUserDep, SessionDep
+from app.api.deps import CurrentUserDep, CurrentUserIdDep, SessionDep
 from app.database.models import User
 from app.schemas import UserCreate, UserRead, UserUpdatePartial
+from app.services import UserCache
 
 router = APIRouter(prefix="/users", tags=["users"])
 
@@ -20,18 +21,25 @@ async def create_user(*, user_in: UserCreate, session: SessionDep) -> User:
 
 
 @router.get("/me", summary="Get current user information", response_model=UserRead)
-async def get_user_me(user: CurrentUserDep) -> User:
+async def get_user_me(user: CurrentUserDep) -> UserRead:
     return user
 
 
 @router.patch("/me", summary="Update current user information", response_model=UserRead)
 async def update_user_me(
-    *, user_in: UserUpdatePartial, session: SessionDep, user: CurrentUserDep
+    *, user_in: UserUpdatePartial, session: SessionDep, user_id: CurrentUserIdDep
 ) -> User:
+    user = await crud.user.get_user_by_id(session, user_id)
+    if user is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
     user = await crud.user.update_user(session, user, user_in)
+    # Cached copies are dropped once the update is committed, so that a concurrent request
+    # missing the cache cannot store the previous version again.
+    await session.commit()
+    await UserCache.invalidate(user.id)
     return user
 
 
 @router.get("/me/stats", summary="Get current user statistics related to skin care activities")
-async def get_user_stats_me(session: SessionDep, user: CurrentUserDep) -> Response:
+async def get_user_stats_me(session: SessionDep, user_id: CurrentUserIdDep) -> Response:
     raise NotImplementedError
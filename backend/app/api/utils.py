@@ -9,12 +9,20 @@ from app.schemas import PaginatedResponse, PaginationMeta, PaginationParams
 M = TypeVar("M")
 
 
-def paginate(items: list[M], total: int, limit: int, offset: int) -> PaginatedResponse[M]:
+def paginate(
+    items: list[M], total: int | None, params: PaginationParams, next_cursor: str | None = None
+) -> PaginatedResponse[M]:
     """Utility function to create a paginated response."""
     return PaginatedResponse[M](
         items=items,
         meta=PaginationMeta(total=total, count=len(items)),
-        pagination=PaginationParams(limit=limit, offset=offset),
+        pagination=PaginationParams(
+            limit=params.limit,
+            offset=params.offset,
+            cursor=params.cursor,
+            include_total=params.include_total,
+        ),
+        next_cursor=next_cursor,
     )
 
 
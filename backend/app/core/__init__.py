@@ -4,6 +4,7 @@ from app.core.security import (
     create_access_token,
     create_refresh_token,
     get_password_hash,
+    verify_and_update_password,
     verify_password,
 )
 from app.core.settings import settings
@@ -12,6 +13,7 @@ __all__ = [
     "settings",
     "get_password_hash",
     "verify_password",
+    "verify_and_update_password",
     "create_access_token",
     "create_refresh_token",
     "exceptions",
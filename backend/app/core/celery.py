@@ -12,22 +12,72 @@ celery = Celery(
 
 celery.conf.update(
     task_serializer="json",
-    accept_content=["json"],
+    # Notification send tasks are serialized with msgpack, see app.workers.tasks.
+    accept_content=["json", "msgpack"],
     result_serializer="json",
     timezone="UTC",
     enable_utc=True,
+    # Most tasks are fire-and-forget, those reporting progress store results explicitly.
+    task_ignore_result=True,
     task_track_started=True,
+    result_expires=settings.CELERY_RESULT_EXPIRES_SECONDS,
     task_acks_late=True,
     task_default_queue="default",
     task_routes={
         "dispatch_due_notifications": {"queue": "periodic"},
+        "reconcile_notification_schedule": {"queue": "periodic"},
+        "maintain_notification_delivery_partitions": {"queue": "periodic"},
+        "subscribe_device_topics": {"queue": "periodic"},
+        "expire_stale_deliveries": {"queue": "periodic"},
         "send_fcm_notification": {"queue": "notifications"},
+        "send_fcm_notification_batch": {"queue": "notifications"},
+        "broadcast_notification": {"queue": "default"},
+        "send_campaign": {"queue": "default"},
     },
 )
 
-celery.conf.beat_schedule = {
-    "dispatch-notifications-every-minute": {
-        "task": "dispatch_due_notifications",
-        "schedule": crontab(minute="*"),
-    },
+if settings.NOTIFICATION_SCHEDULER_ENGINE == "redis":
+    # Due rules are consumed from the redis schedule index by app.workers.scheduler,
+    # beat only keeps the index consistent with postgres.
+    celery.conf.beat_schedule = {
+        "reconcile-notification-schedule": {
+            "task": "reconcile_notification_schedule",
+            "schedule": crontab(minute=f"*/{settings.NOTIFICATION_SCHEDULER_RECONCILE_MINUTES}"),
+        },
+    }
+else:
+    celery.conf.beat_schedule = {
+        "dispatch-notifications-every-minute": {
+            "task": "dispatch_due_notifications",
+            "schedule": crontab(minute="*"),
+        },
+    }
+
+celery.conf.beat_schedule["maintain-notification-delivery-partitions"] = {
+    "task": "maintain_notification_delivery_partitions",
+    "schedule": crontab(minute=0, hour=3),
+}
+celery.conf.beat_schedule["expire-stale-deliveries"] = {
+    "task": "expire_stale_deliveries",
+    "schedule": crontab(minute="*/10"),
+}
+celery.conf.beat_schedule["subscribe-device-topics-every-minute"] = {
+    "task": "subscribe_device_topics",
+    "schedule": crontab(minute="*"),
 }
+
+
+def get_queue_names() -> list[str]:
+    routes = celery.conf.task_routes.values()
+    return sorted({celery.conf.task_default_queue, *(route["queue"] for route in routes)})
+
+
+def get_queue_depth(queue: str) -> int:
+    """Returns the number of tasks waiting in the given broker queue."""
+    with celery.connection_for_read() as connection:
+        try:
+            declared = connection.default_channel.queue_declare(queue=queue, passive=True)
+        except connection.channel_errors:
+            # The broker does not know the queue until anything is published to it.
+            return 0
+    return declared.message_count
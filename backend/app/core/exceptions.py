@@ -8,6 +8,17 @@ class RequirementMismatchError(ValidationException):
     """Raised when an entity update violates domain-specific requirements."""
 
 
+class ServiceOverloadedError(HTTPException):
+    """Raised when a bounded pool of workers cannot take more work, answered with 503."""
+
+    def __init__(self, detail: str, retry_after: int = 1) -> None:
+        super().__init__(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=detail,
+            headers={"Retry-After": str(retry_after)},
+        )
+
+
 STATUS_TITLES = {
     status.HTTP_400_BAD_REQUEST: "Bad Request",
     status.HTTP_401_UNAUTHORIZED: "Unauthorized",
@@ -18,6 +29,7 @@ STATUS_TITLES = {
     status.HTTP_422_UNPROCESSABLE_ENTITY: "Unprocessable Entity",
     status.HTTP_429_TOO_MANY_REQUESTS: "Too Many Requests",
     status.HTTP_500_INTERNAL_SERVER_ERROR: "Internal Server Error",
+    status.HTTP_503_SERVICE_UNAVAILABLE: "Service Unavailable",
 }
 
 
@@ -0,0 +1,73 @@
+import os
+
+from prometheus_client import REGISTRY, CollectorRegistry, Counter, Histogram, multiprocess
+
+DISPATCH_LAG_SECONDS = Histogram(
+    "notification_dispatch_lag_seconds",
+    "Delay between the next run of a notification rule and the moment it was claimed.",
+    buckets=(0.5, 1, 2.5, 5, 15, 30, 60, 120, 300, 600, 900, 1800),
+)
+DISPATCH_BATCH_RULES = Histogram(
+    "notification_dispatch_batch_rules",
+    "Number of notification rules claimed in a single batch.",
+    buckets=(1, 10, 50, 100, 250, 500, 1000),
+)
+DISPATCH_TICK_DELIVERIES = Histogram(
+    "notification_dispatch_tick_deliveries",
+    "Number of deliveries created by a single dispatcher tick.",
+    buckets=(0, 10, 100, 1_000, 10_000, 100_000, 1_000_000),
+)
+SCHEDULE_PLANNING_SECONDS = Histogram(
+    "notification_schedule_planning_seconds",
+    "Time spent planning next runs of a batch of notification rules.",
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25),
+)
+FCM_SEND_SECONDS = Histogram(
+    "fcm_send_duration_seconds",
+    "Latency of single messages and batches sent to FCM.",
+    ["operation", "outcome"],
+)
+FCM_MESSAGES = Counter(
+    "fcm_messages",
+    "Messages sent to FCM by outcome.",
+    ["outcome"],
+)
+DELIVERY_STATUS_FLUSH_SECONDS = Histogram(
+    "delivery_status_flush_duration_seconds",
+    "Time spent writing a batch of buffered delivery statuses.",
+)
+PASSWORD_HASH_WAIT_SECONDS = Histogram(
+    "password_hash_wait_seconds",
+    "Time password hashing and verification waited for a free worker thread.",
+    ["operation"],
+    buckets=(0.001, 0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+)
+PASSWORD_HASH_SECONDS = Histogram(
+    "password_hash_duration_seconds",
+    "Time spent hashing or verifying a single password.",
+    ["operation"],
+    buckets=(0.05, 0.1, 0.25, 0.5, 1, 2.5),
+)
+PASSWORD_HASH_REJECTIONS = Counter(
+    "password_hash_rejections",
+    "Password hashing and verification requests shed because the queue was full.",
+    ["operation"],
+)
+ACCESS_TOKEN_CACHE_LOOKUPS = Counter(
+    "access_token_cache_lookups",
+    "Lookups of verified access tokens in the per-process cache by result, hit or miss.",
+    ["result"],
+)
+
+
+def get_registry() -> CollectorRegistry:
+    """Returns the registry to expose.
+
+    When PROMETHEUS_MULTIPROC_DIR is set, metrics are aggregated across all processes
+    writing to that directory, e.g. prefork Celery children or uvicorn workers.
+    """
+    if "PROMETHEUS_MULTIPROC_DIR" not in os.environ:
+        return REGISTRY
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry)
+    return registry
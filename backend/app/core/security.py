@@ -5,7 +5,9 @@ from passlib.context import CryptContext
 
 from app.core.settings import settings
 
-PWD_CONTEXT = CryptContext(schemes=["bcrypt"], deprecated="auto")
+PWD_CONTEXT = CryptContext(
+    schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=settings.PASSWORD_BCRYPT_ROUNDS
+)
 
 
 def _create_token(subject: str, name: str, delta: timedelta, key: str) -> str:
@@ -28,5 +30,10 @@ def verify_password(plain: str, hashed: str) -> bool:
     return PWD_CONTEXT.verify(plain, hashed)
 
 
+def verify_and_update_password(plain: str, hashed: str) -> tuple[bool, str | None]:
+    """Verifies the password and returns a new hash if the current one uses other rounds."""
+    return PWD_CONTEXT.verify_and_update(plain, hashed)
+
+
 def get_password_hash(password: str) -> str:
     return PWD_CONTEXT.hash(password)
@@ -13,7 +13,14 @@ class Settings(BaseSettings):
     ACCESS_TOKEN_SECRET_KEY: str = secrets.token_urlsafe(32)
     REFRESH_TOKEN_SECRET_KEY: str = secrets.token_urlsafe(32)
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60 * 24
+    # Verified access tokens remembered per process, see app.services.tokens.
+    ACCESS_TOKEN_CACHE_SIZE: int = 10_000
     REFRESH_TOKEN_EXPIRE_DAYS: int = 7
+    # Changing the rounds rehashes passwords of users as they sign in.
+    PASSWORD_BCRYPT_ROUNDS: int = 12
+    # Threads hashing passwords per process and the number of requests waiting for them.
+    PASSWORD_HASH_WORKERS: int = 2
+    PASSWORD_HASH_QUEUE_SIZE: int = 16
 
     POSTGRES_USER: str
     POSTGRES_PASSWORD: str
@@ -52,9 +59,58 @@ class Settings(BaseSettings):
         )
 
     FCM_CREDENTIALS_PATH: FilePath
+    # Transport used to talk to FCM: "firebase" uses the blocking Firebase Admin SDK,
+    # "http2" keeps many HTTP v1 API requests in flight over pooled HTTP/2 connections.
+    FCM_TRANSPORT: Literal["firebase", "http2"] = "firebase"
+    FCM_ENDPOINT: str = "https://fcm.googleapis.com"
+    FCM_IID_ENDPOINT: str = "https://iid.googleapis.com"
+    FCM_PROJECT_ID: str | None = None
+    FCM_MAX_CONCURRENCY: int = 100
+    # Only meant to be disabled when FCM_ENDPOINT points to the local stub server.
+    FCM_AUTH_ENABLED: bool = True
+    # Messages sent to FCM per second across all workers, unlimited when not set.
+    FCM_RATE_LIMIT_PER_SECOND: float | None = None
+    FCM_RATE_LIMIT_BURST: int = 500
     NOTIFICATION_OFFSET_MINUTES: int = 15
+    # Engine used to find due notification rules: "database" polls postgres every minute,
+    # "redis" mirrors next runs into a sorted set consumed with second precision.
+    NOTIFICATION_SCHEDULER_ENGINE: Literal["database", "redis"] = "database"
+    NOTIFICATION_SCHEDULER_POLL_SECONDS: float = 1.0
+    NOTIFICATION_SCHEDULER_RECONCILE_MINUTES: int = 5
+    # Number of dispatch_due_notifications runs allowed to work at the same time, runs
+    # started on top of that are skipped. A run stops after the given number of seconds
+    # and leaves the rest of the backlog to the next one.
+    NOTIFICATION_DISPATCH_SLOTS: int = 1
+    NOTIFICATION_DISPATCH_MAX_SECONDS: float = 50.0
+    # Number of pending send tasks in the notifications queue above which dispatchers only
+    # claim rules about to run out of their NOTIFICATION_OFFSET_MINUTES head start.
+    NOTIFICATION_QUEUE_MAX_DEPTH: int = 200
+    # Delivery status updates are buffered per worker process and written in bulk.
+    DELIVERY_STATUS_FLUSH_SIZE: int = 500
+    DELIVERY_STATUS_FLUSH_INTERVAL_MS: int = 1000
+    # Deliveries still pending this long after they were due are marked as failed.
+    NOTIFICATION_DELIVERY_STALE_MINUTES: int = 60
+    # Deliveries are kept in monthly partitions. Months older than the retention period are
+    # rolled up into daily statistics and dropped, upcoming ones are created in advance.
+    NOTIFICATION_DELIVERY_RETENTION_MONTHS: int = 3
+    NOTIFICATION_DELIVERY_PARTITIONS_AHEAD: int = 2
+    # Meta attributes of devices which campaigns can target, every device is subscribed to
+    # the topic of the "all" segment and of a "<key>-<value>" segment for each such attribute.
+    CAMPAIGN_SEGMENT_ATTRIBUTES: list[str] = ["platform", "brand"]
+    DEVICE_TOPIC_SYNC_BATCH_SIZE: int = 5000
     CELERY_BROKER_URL: str = "redis://localhost:6379/0"
     CELERY_RESULT_BACKEND: str = "redis://localhost:6379/0"
+    CELERY_RESULT_EXPIRES_SECONDS: int = 3600
+    REDIS_URL: str = "redis://localhost:6379/0"
+    # Authenticated users are cached per process, and in Redis too if its TTL is set.
+    USER_CACHE_TTL_SECONDS: int = 30
+    USER_CACHE_MAX_SIZE: int = 10_000
+    USER_CACHE_REDIS_TTL_SECONDS: int | None = None
+    # Port of the Prometheus exporter started by workers and the scheduler, disabled if unset.
+    WORKER_METRICS_PORT: int | None = None
+    # Port of the exporter run next to the API by scripts/start.sh, disabled if unset. Like
+    # the worker port, it must only be reachable from the internal network.
+    API_METRICS_PORT: int | None = None
 
 
 settings = Settings()
@@ -1,3 +1,3 @@
-from app.crud import device, notification, product, routine, user
+from app.crud import campaign, device, notification, product, routine, user
 
-__all__ = ["user", "device", "product", "routine", "notification"]
+__all__ = ["user", "device", "product", "routine", "notification", "campaign"]
@@ -0,0 +1,25 @@
+import uuid
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database.models import NotificationCampaign
+from app.schemas import CampaignCreate
+
+
+async def get_campaign_by_id(session: AsyncSession, id: uuid.UUID) -> NotificationCampaign | None:
+    campaign = await session.get(NotificationCampaign, id)
+    return campaign
+
+
+async def create_campaign(
+    session: AsyncSession, campaign_in: CampaignCreate
+) -> NotificationCampaign:
+    campaign = NotificationCampaign(
+        title=campaign_in.title,
+        body=campaign_in.body,
+        segments=list(dict.fromkeys(campaign_in.segments)),
+    )
+    session.add(campaign)
+    await session.flush()
+    await session.refresh(campaign)
+    return campaign
@@ -40,7 +40,7 @@ async def create_notification_rule(
     session.add(rule)
     await session.flush()
     await session.refresh(rule)
-    rule.next_run = NotificationScheduler.plan_next_run(rule, last_run=None)
+    rule.next_run = NotificationScheduler.plan_next_run(rule)
     return rule
 
 
@@ -63,7 +63,7 @@ async def update_notification_rule(
         _ = TypeAdapter(NotificationRuleCreate).validate_python(rule, from_attributes=True)
     except ValidationError as exc:
         raise RequirementMismatchError(errors=exc.errors()) from exc
-    rule.next_run = NotificationScheduler.plan_next_run(rule, last_run=None)
+    rule.next_run = NotificationScheduler.plan_next_run(rule)
 
     await session.flush()
     await session.refresh(rule)
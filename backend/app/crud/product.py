@@ -10,21 +10,19 @@ from app.schemas import PaginationParams, ProductCreate, ProductUpdatePartial
 
 async def get_user_products(
     session: AsyncSession, user_id: uuid.UUID, pagination: PaginationParams | None = None
-) -> tuple[list[Product], int]:
+) -> tuple[list[Product], int | None, str | None]:
     """Retrieve products for a specific user with pagination.
 
     Returns:
-        A tuple containing a list of Product instances and the total count of products.
+        A tuple containing a list of Product instances, the total count of products or
+        None, and the cursor of the next page or None.
     """
     if pagination is None:
         pagination = PaginationParams()
-    statement = (
-        select(Product).where(Product.user_id == user_id).order_by(Product.updated_at.desc())
+    statement = select(Product).where(Product.user_id == user_id)
+    return await get_paginated_resources(
+        session, statement, pagination, sort_column=Product.updated_at, id_column=Product.id
     )
-    products, total = await get_paginated_resources(
-        session, statement, limit=pagination.limit, offset=pagination.offset
-    )
-    return products, total
 
 
 async def get_product_by_id(session: AsyncSession, id: uuid.UUID) -> Product | None:
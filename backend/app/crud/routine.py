@@ -1,43 +1,92 @@
 import uuid
+from typing import Any
 
-from sqlalchemy import select
+from sqlalchemy import Row, Select, func, inspect, literal_column, select
+from sqlalchemy.dialects.postgresql import JSONB, aggregate_order_by
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
 from app.crud.product import get_user_products_by_ids
 from app.crud.utils import get_paginated_resources
-from app.database.models import Routine
+from app.database.models import Product, Routine, RoutineProduct
 from app.schemas import RoutineCreate, RoutineParams, RoutineUpdatePartial
 
+# Products are never loaded implicitly, so refreshing a routine has to name them.
+_REFRESHED_ATTRIBUTES = [*inspect(Routine).column_attrs.keys(), "products"]
+
+
+def _filter_user_routines(
+    statement: Select[Any], user_id: uuid.UUID, params: RoutineParams
+) -> Select[Any]:
+    statement = statement.where(Routine.user_id == user_id)
+    if params.performed_after is not None:
+        statement = statement.where(Routine.performed_at >= params.performed_after)
+    if params.performed_before is not None:
+        statement = statement.where(Routine.performed_at <= params.performed_before)
+    return statement
+
 
 async def get_user_routines(
     session: AsyncSession, user_id: uuid.UUID, params: RoutineParams | None = None
-) -> tuple[list[Routine], int]:
+) -> tuple[list[Routine], int | None, str | None]:
     """Retrieve routines for a specific user with optional filtering and pagination.
 
+    Products of the page are loaded with one additional query.
+
     Returns:
-        A tuple containing a list of Routine instances and the total count of routines.
+        A tuple containing a list of Routine instances, the total count of routines or
+        None, and the cursor of the next page or None.
     """
     if params is None:
         params = RoutineParams()
-    statement = (
-        select(Routine).where(Routine.user_id == user_id).options(selectinload(Routine.products))
+    statement = _filter_user_routines(
+        select(Routine).options(selectinload(Routine.products)), user_id, params
+    )
+    return await get_paginated_resources(
+        session, statement, params, sort_column=Routine.performed_at, id_column=Routine.id
     )
 
-    if params.performed_after is not None:
-        statement = statement.where(Routine.performed_at >= params.performed_after)
-    if params.performed_before is not None:
-        statement = statement.where(Routine.performed_at <= params.performed_before)
 
-    statement = statement.order_by(Routine.performed_at.desc())
-    routines, total = await get_paginated_resources(
-        session, statement, limit=params.limit, offset=params.offset
+async def get_user_routine_summaries(
+    session: AsyncSession, user_id: uuid.UUID, params: RoutineParams | None = None
+) -> tuple[list[Row[Any]], int | None, str | None]:
+    """Retrieve routines for a specific user like get_user_routines, in a single query.
+
+    Instead of Product instances, every row carries the ids and names of its products in
+    the products column, aggregated only for the routines of the page.
+
+    Returns:
+        A tuple containing a list of routine rows, the total count of routines or None,
+        and the cursor of the next page or None.
+    """
+    if params is None:
+        params = RoutineParams()
+    products = (
+        select(
+            func.coalesce(
+                func.jsonb_agg(
+                    aggregate_order_by(
+                        func.jsonb_build_object("id", Product.id, "name", Product.name),
+                        Product.name,
+                    )
+                ),
+                literal_column("'[]'::jsonb"),
+                type_=JSONB,
+            )
+        )
+        .join(RoutineProduct, RoutineProduct.product_id == Product.id)
+        .where(RoutineProduct.routine_id == Routine.id)
+        .scalar_subquery()
+        .label("products")
+    )
+    statement = _filter_user_routines(select(*Routine.__table__.columns, products), user_id, params)
+    return await get_paginated_resources(
+        session, statement, params, sort_column=Routine.performed_at, id_column=Routine.id
     )
-    return list(routines), total
 
 
 async def get_routine_by_id(session: AsyncSession, id: uuid.UUID) -> Routine | None:
-    routine = await session.get(Routine, id)
+    routine = await session.get(Routine, id, options=[selectinload(Routine.products)])
     return routine
 
 
@@ -55,7 +104,7 @@ async def create_routine(
 
     session.add(routine)
     await session.flush()
-    await session.refresh(routine)
+    await session.refresh(routine, _REFRESHED_ATTRIBUTES)
     return routine
 
 
@@ -72,7 +121,7 @@ async def update_routine(
         setattr(routine, field, value)
 
     await session.flush()
-    await session.refresh(routine)
+    await session.refresh(routine, _REFRESHED_ATTRIBUTES)
     return routine
 
 
@@ -3,9 +3,9 @@ import uuid
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core import get_password_hash, verify_password
 from app.database.models import User
 from app.schemas import UserCreate, UserUpdatePartial
+from app.services import PasswordHasher
 
 
 async def get_user_by_id(session: AsyncSession, id: uuid.UUID) -> User | None:
@@ -24,7 +24,7 @@ async def create_user(session: AsyncSession, user_in: UserCreate) -> User:
         name=user_in.name,
         surname=user_in.surname,
         username=user_in.username,
-        password=get_password_hash(user_in.password),
+        password=await PasswordHasher.hash(user_in.password),
     )
     session.add(user)
     await session.flush()
@@ -42,9 +42,16 @@ async def update_user(session: AsyncSession, user: User, user_in: UserUpdatePart
 
 
 async def authenticate_user(session: AsyncSession, email: str, password: str) -> User | None:
+    """Returns the user if the password matches, rehashing it if the bcrypt cost changed.
+
+    Raises:
+        ServiceOverloadedError: If too many passwords are being verified already.
+    """
     user = await get_user_by_email(session, email)
     if user is not None:
-        mismatch = not verify_password(password, user.password)
-        if mismatch:
+        verified, new_hash = await PasswordHasher.verify_and_update(password, user.password)
+        if not verified:
             user = None
+        elif new_hash is not None:
+            user.password = new_hash
     return user
@@ -1,23 +1,58 @@
+from datetime import datetime
 from typing import TypeVar
 
-from sqlalchemy import Select, func, select
+from sqlalchemy import Select, func, select, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import InstrumentedAttribute
+
+from app.schemas import PaginationParams
+from app.schemas.common import decode_cursor, encode_cursor
 
 T = TypeVar("T")
 
 
 async def get_paginated_resources(
-    session: AsyncSession, statement: Select[tuple[T]], limit: int, offset: int
-) -> tuple[list[T], int]:
-    """Retrieve paginated resources based on the provided SQLAlchemy statement.
+    session: AsyncSession,
+    statement: Select[tuple[T]],
+    pagination: PaginationParams,
+    sort_column: InstrumentedAttribute[datetime],
+    id_column: InstrumentedAttribute,
+) -> tuple[list[T], int | None, str | None]:
+    """Retrieve a page of resources ordered by the sort column and id, newest first.
+
+    Pages requested with a cursor are read with a keyset condition on (sort column, id),
+    which an index on these columns answers without scanning the skipped rows. The
+    offset is still honoured for pages requested without a cursor. The total count
+    is only computed for pages without a cursor, and only if requested. Statements of a
+    single entity return instances, projections of several columns return rows.
 
     Returns:
-        A tuple containing a list of resources and the total count of resources.
+        A tuple containing a list of resources, the total count of resources or None, and
+        the cursor of the next page or None on the last page.
     """
-    total = await session.scalar(select(func.count()).select_from(statement.subquery()))
-    total = total or 0
+    total = None
+    if pagination.include_total and pagination.cursor is None:
+        total = await session.scalar(select(func.count()).select_from(statement.subquery()))
+        total = total or 0
 
-    statement = statement.offset(offset).limit(limit)
+    if pagination.cursor is not None:
+        statement = statement.where(
+            tuple_(sort_column, id_column) < tuple_(*decode_cursor(pagination.cursor))
+        )
+    statement = (
+        statement.order_by(sort_column.desc(), id_column.desc())
+        .offset(pagination.offset)
+        .limit(pagination.limit + 1)
+    )
     result = await session.execute(statement)
-    resources = result.scalars().all()
-    return list(resources), total
+    if len(statement.column_descriptions) == 1:
+        resources = list(result.scalars().all())
+    else:
+        resources = list(result.all())
+
+    next_cursor = None
+    if len(resources) > pagination.limit:
+        resources = resources[: pagination.limit]
+        last = resources[-1]
+        next_cursor = encode_cursor(getattr(last, sort_column.key), getattr(last, id_column.key))
+    return resources, total, next_cursor
@@ -1,4 +1,15 @@
 from app.database import models
-from app.database.conn import AsyncSessionLocal, SessionLocal, get_sync_db_context
+from app.database.conn import (
+    AsyncSessionLocal,
+    SessionLocal,
+    get_sync_db_context,
+    try_advisory_lock,
+)
 
-__all__ = ["AsyncSessionLocal", "models", "SessionLocal", "get_sync_db_context"]
+__all__ = [
+    "AsyncSessionLocal",
+    "models",
+    "SessionLocal",
+    "get_sync_db_context",
+    "try_advisory_lock",
+]
@@ -1,7 +1,7 @@
 from contextlib import contextmanager
 from typing import Generator
 
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, func, select
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import Session, sessionmaker
@@ -38,3 +38,21 @@ def get_sync_db_context() -> Generator[Session, None]:
         raise exc
     finally:
         session.close()
+
+
+@contextmanager
+def try_advisory_lock(*keys: int) -> Generator[int | None, None]:
+    """Holds the first free session-level advisory lock out of the given keys.
+
+    Yields the acquired key, or None if all of them are held by other sessions. The lock
+    is released on exit, or by postgres as soon as the connection is lost.
+    """
+    with sync_engine.connect().execution_options(isolation_level="AUTOCOMMIT") as connection:
+        for key in keys:
+            if connection.scalar(select(func.pg_try_advisory_lock(key))):
+                try:
+                    yield key
+                finally:
+                    connection.scalar(select(func.pg_advisory_unlock(key)))
+                return
+        yield None
@@ -1,10 +1,13 @@
 from app.database.models.base import Base
+from app.database.models.campaign import NotificationCampaign
 from app.database.models.device import UserDevice
 from app.database.models.notification import (
     NotificationDelivery,
+    NotificationDeliveryDailyStats,
     NotificationFrequency,
     NotificationRule,
     NotificationStatus,
+    NotificationTemplate,
 )
 from app.database.models.product import Product
 from app.database.models.routine import Routine, RoutineProduct, RoutineType
@@ -21,5 +24,8 @@ __all__ = [
     "NotificationRule",
     "NotificationFrequency",
     "NotificationDelivery",
+    "NotificationDeliveryDailyStats",
     "NotificationStatus",
+    "NotificationTemplate",
+    "NotificationCampaign",
 ]
@@ -0,0 +1,32 @@
+import uuid
+from datetime import datetime
+
+from sqlalchemy import ARRAY, DateTime, Integer, String
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.database.models.base import Base
+from app.database.models.notification import NotificationStatus
+
+
+class NotificationCampaign(Base):
+    """
+    Announcement sent as a single FCM message to the union of its segments' topics instead
+    of one per device. Delivery is accounted for per campaign, there are no per device rows.
+    """
+
+    __tablename__ = "notification_campaign"
+
+    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    title: Mapped[str] = mapped_column(String(255), nullable=False)
+    body: Mapped[str] = mapped_column(String, nullable=False)
+    segments: Mapped[list[str]] = mapped_column(ARRAY(String), nullable=False)
+    status: Mapped[NotificationStatus] = mapped_column(
+        String(20), nullable=False, default=NotificationStatus.PENDING
+    )
+    # Number of subscribed devices in the targeted segments when the campaign was sent.
+    audience: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    # FCM message ID of the condition message, if it was sent.
+    message_id: Mapped[str | None] = mapped_column(String(255), nullable=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=datetime.now)
+    sent_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
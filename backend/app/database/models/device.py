@@ -2,8 +2,8 @@ import re
 import uuid
 from datetime import datetime
 
-from sqlalchemy import DateTime, ForeignKey
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import ARRAY, DateTime, ForeignKey, Index, String, text
+from sqlalchemy.dialects.postgresql import JSONB, UUID
 from sqlalchemy.orm import Mapped, mapped_column, validates
 
 from app.database.models.base import Base
@@ -11,12 +11,36 @@ from app.database.models.base import Base
 META_PATTERN = re.compile(r"^(?:[a-zA-Z0-9_]+=[^;=]*;)*[a-zA-Z0-9_]+=[^;=]*$")
 
 
+def parse_meta(meta: str) -> dict[str, str]:
+    """Returns the pairs of 'key1=value1;key2=value2;...' formatted meta as a dictionary."""
+    return dict(pair.split("=", 1) for pair in meta.split(";") if pair)
+
+
 class UserDevice(Base):
     __tablename__ = "user_device"
+    __table_args__ = (
+        Index(
+            "ix_user_device_attributes",
+            "attributes",
+            postgresql_using="gin",
+            postgresql_ops={"attributes": "jsonb_path_ops"},
+        ),
+        Index(
+            "ix_user_device_registered_at_unsubscribed",
+            "registered_at",
+            postgresql_where=text("topics IS NULL"),
+        ),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    user_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("user.id"))
+    user_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("user.id"), index=True)
     meta: Mapped[str] = mapped_column(nullable=False)
+    # Parsed meta, kept in sync by the validator and used to select campaign segments.
+    attributes: Mapped[dict[str, str]] = mapped_column(
+        JSONB, nullable=False, default=dict, server_default=text("'{}'::jsonb")
+    )
+    # FCM topics the token is subscribed to, NULL until the subscriptions are made.
+    topics: Mapped[list[str] | None] = mapped_column(ARRAY(String), nullable=True)
     fcm_token: Mapped[str] = mapped_column(nullable=False, unique=True, index=True)
     registered_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=datetime.now)
 
@@ -24,4 +48,5 @@ class UserDevice(Base):
     def _validate_meta(self, key: str, value: str) -> str:
         if not META_PATTERN.match(value):
             raise ValueError("Meta must be in the format 'key1=value1;key2=value2;...'")
+        self.attributes = parse_meta(value)
         return value
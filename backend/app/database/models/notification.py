@@ -1,9 +1,20 @@
 import uuid
-from datetime import datetime, time
+from datetime import date, datetime, time
 from enum import StrEnum
 from typing import Any
 
-from sqlalchemy import ARRAY, DateTime, ForeignKey, SmallInteger, String, Time
+from sqlalchemy import (
+    ARRAY,
+    Date,
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    SmallInteger,
+    String,
+    Time,
+    text,
+)
 from sqlalchemy.dialects.postgresql import JSONB, UUID
 from sqlalchemy.orm import Mapped, mapped_column
 
@@ -20,9 +31,14 @@ class NotificationFrequency(StrEnum):
 
 class NotificationRule(Base):
     __tablename__ = "notification_rule"
+    __table_args__ = (
+        Index(
+            "ix_notification_rule_next_run_enabled", "next_run", postgresql_where=text("enabled")
+        ),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    user_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("user.id"))
+    user_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("user.id"), index=True)
     time_of_day: Mapped[time] = mapped_column(Time(timezone=True), nullable=False)
     frequency: Mapped[NotificationFrequency] = mapped_column(String(20), nullable=False)
     every_n: Mapped[int] = mapped_column(nullable=True)
@@ -35,8 +51,27 @@ class NotificationRule(Base):
     )
 
 
+class NotificationTemplate(Base):
+    """Notification content shared by deliveries, rendered with their variables when sent."""
+
+    __tablename__ = "notification_template"
+
+    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    name: Mapped[str] = mapped_column(String(100), unique=True, nullable=False)
+    title: Mapped[str] = mapped_column(String(255), nullable=False)
+    body: Mapped[str] = mapped_column(String, nullable=False)
+    version: Mapped[int] = mapped_column(Integer, nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), default=datetime.now, onupdate=datetime.now
+    )
+
+    __mapper_args__ = {"version_id_col": version}
+
+
 class NotificationStatus(StrEnum):
     PENDING = "PENDING"
+    # Only used by campaigns, while their message is handed to FCM.
+    SENDING = "SENDING"
     SENT = "SENT"
     FAILED = "FAILED"
 
@@ -45,18 +80,58 @@ class NotificationDelivery(Base):
     """
     Represents a specific instance of a notification attempt.
     Acts as audit log and a state holder for the workers.
+
+    The table is partitioned by month of scheduled_for, see app.workers.partitions.
     """
 
     __tablename__ = "notification_delivery"
+    __table_args__ = (
+        Index("ix_notification_delivery_status_scheduled_for", "status", "scheduled_for"),
+        {"postgresql_partition_by": "RANGE (scheduled_for)"},
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     notification_rule_id: Mapped[uuid.UUID | None] = mapped_column(
-        ForeignKey("notification_rule.id", ondelete="SET NULL"), nullable=True
+        ForeignKey("notification_rule.id", ondelete="SET NULL"), nullable=True, index=True
+    )
+    # All rules coalesced into this delivery, notification_rule_id is the first of them.
+    notification_rule_ids: Mapped[list[uuid.UUID] | None] = mapped_column(
+        ARRAY(UUID(as_uuid=True)), nullable=True
     )
-    scheduled_for: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    scheduled_for: Mapped[datetime] = mapped_column(DateTime(timezone=True), primary_key=True)
     processed_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=True)
     status: Mapped[NotificationStatus] = mapped_column(
         String(20), nullable=False, default=NotificationStatus.PENDING
     )
-    payload: Mapped[dict[str, Any]] = mapped_column(JSONB, nullable=False)
+    template_id: Mapped[uuid.UUID | None] = mapped_column(
+        ForeignKey("notification_template.id"), nullable=True
+    )
+    variables: Mapped[dict[str, str] | None] = mapped_column(JSONB, nullable=True)
+    # Rendered content, only set for deliveries created before templates were introduced.
+    payload: Mapped[dict[str, Any] | None] = mapped_column(JSONB, nullable=True)
     provider_message_id: Mapped[str] = mapped_column(String, nullable=True)
+
+
+class NotificationDeliveryDailyStats(Base):
+    """Number of deliveries per day, rule and status, kept after detailed rows expire."""
+
+    __tablename__ = "notification_delivery_daily_stats"
+    __table_args__ = (
+        Index(
+            "ix_notification_delivery_daily_stats_day_rule_status",
+            "day",
+            "notification_rule_id",
+            "status",
+            unique=True,
+            postgresql_nulls_not_distinct=True,
+        ),
+    )
+
+    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    day: Mapped[date] = mapped_column(Date, nullable=False)
+    # Not a foreign key, statistics outlive the rules they describe.
+    notification_rule_id: Mapped[uuid.UUID | None] = mapped_column(
+        UUID(as_uuid=True), nullable=True
+    )
+    status: Mapped[NotificationStatus] = mapped_column(String(20), nullable=False)
+    count: Mapped[int] = mapped_column(Integer, nullable=False)
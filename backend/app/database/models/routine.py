@@ -2,7 +2,7 @@ import uuid
 from datetime import datetime
 from enum import StrEnum
 
-from sqlalchemy import DateTime, ForeignKey, String
+from sqlalchemy import DateTime, ForeignKey, Index, String, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -18,6 +18,14 @@ class RoutineType(StrEnum):
 
 class Routine(Base):
     __tablename__ = "routine"
+    __table_args__ = (
+        Index(
+            "ix_routine_user_id_performed_at_id",
+            "user_id",
+            text("performed_at DESC"),
+            text("id DESC"),
+        ),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     user_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("user.id"))
@@ -29,14 +37,20 @@ class Routine(Base):
         DateTime(timezone=True), default=datetime.now, onupdate=datetime.now
     )
 
+    # Loaded explicitly by the queries that need them, see app.crud.routine.
     products: Mapped[list["Product"]] = relationship(  # noqa: F821
-        "Product", secondary="routine_product", lazy="joined"
+        "Product", secondary="routine_product", lazy="raise", passive_deletes=True
     )
 
 
 class RoutineProduct(Base):
     __tablename__ = "routine_product"
+    __table_args__ = (
+        Index("ix_routine_product_routine_id_product_id", "routine_id", "product_id"),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     routine_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("routine.id", ondelete="CASCADE"))
-    product_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("product.id", ondelete="CASCADE"))
+    product_id: Mapped[uuid.UUID] = mapped_column(
+        ForeignKey("product.id", ondelete="CASCADE"), index=True
+    )
@@ -0,0 +1,28 @@
+import logging
+import os
+
+from prometheus_client import start_http_server
+
+from app.core import settings
+from app.core.metrics import get_registry
+
+logger = logging.getLogger(__name__)
+
+
+def run(port: int) -> None:
+    """Serves metrics of the API workers on a port which is not published.
+
+    Runs as a process of its own next to the API, aggregating the metrics its workers
+    write to PROMETHEUS_MULTIPROC_DIR, so they are not exposed on the public API port.
+    """
+    if "PROMETHEUS_MULTIPROC_DIR" not in os.environ:
+        raise SystemExit("PROMETHEUS_MULTIPROC_DIR must be shared with the API workers")
+    _, thread = start_http_server(port, registry=get_registry())
+    logger.info("Serving API metrics on port %d", port)
+    thread.join()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    if settings.API_METRICS_PORT is not None:
+        run(settings.API_METRICS_PORT)
@@ -1,3 +1,5 @@
+from app.schemas.broadcast import BroadcastJob, BroadcastProgress, BroadcastStatus
+from app.schemas.campaign import CampaignCreate, CampaignRead
 from app.schemas.common import (
     GenericMultipleItems,
     PaginatedResponse,
@@ -18,8 +20,15 @@ from app.schemas.notification import (
     SimpleRule,
     SimpleVariant,
 )
-from app.schemas.product import ProductCreate, ProductRead, ProductUpdatePartial
-from app.schemas.routine import RoutineCreate, RoutineParams, RoutineRead, RoutineUpdatePartial
+from app.schemas.product import ProductCreate, ProductRead, ProductSummary, ProductUpdatePartial
+from app.schemas.routine import (
+    RoutineCreate,
+    RoutineExpand,
+    RoutineParams,
+    RoutineRead,
+    RoutineSummary,
+    RoutineUpdatePartial,
+)
 from app.schemas.token import RefreshToken, Token, TokenPayload
 from app.schemas.user import UserCreate, UserRead, UserUpdatePartial
 
@@ -39,10 +48,13 @@ __all__ = [
     "ProductRead",
     "ProductCreate",
     "ProductUpdatePartial",
+    "ProductSummary",
     "RoutineRead",
     "RoutineCreate",
     "RoutineUpdatePartial",
     "RoutineParams",
+    "RoutineExpand",
+    "RoutineSummary",
     "NotificationRuleCreate",
     "NotificationRuleRead",
     "NotificationRuleUpdatePartial",
@@ -54,4 +66,9 @@ __all__ = [
     "SimpleVariant",
     "NotificationMetadata",
     "NotificationTask",
+    "BroadcastJob",
+    "BroadcastProgress",
+    "BroadcastStatus",
+    "CampaignCreate",
+    "CampaignRead",
 ]
@@ -0,0 +1,19 @@
+from pydantic import BaseModel, Field
+
+
+class BroadcastJob(BaseModel):
+    job_id: str
+
+
+class BroadcastProgress(BaseModel):
+    processed: int = Field(default=0, ge=0, description="Number of devices handled so far")
+    sent: int = Field(default=0, ge=0, description="Number of notifications accepted by FCM")
+    failed: int = Field(default=0, ge=0, description="Number of notifications which failed")
+    invalid: int = Field(
+        default=0, ge=0, description="Number of devices removed due to invalid tokens"
+    )
+
+
+class BroadcastStatus(BroadcastProgress):
+    job_id: str
+    state: str = Field(..., description="Celery state of the job, e.g. PENDING or PROGRESS")
@@ -0,0 +1,29 @@
+import uuid
+from datetime import datetime
+
+from pydantic import BaseModel, ConfigDict, Field
+
+from app.database.models.notification import NotificationStatus
+
+
+class CampaignCreate(BaseModel):
+    title: str = Field(..., max_length=255)
+    body: str
+    segments: list[str] = Field(
+        default=["all"],
+        min_length=1,
+        description="Targeted segments, 'all' or '<attribute>-<value>', e.g. 'brand-samsung'",
+    )
+
+
+class CampaignInDB(CampaignCreate):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: uuid.UUID
+    status: NotificationStatus
+    audience: int | None = None
+    created_at: datetime
+    sent_at: datetime | None = None
+
+
+class CampaignRead(CampaignInDB): ...
@@ -1,6 +1,11 @@
-from typing import Generic, TypeVar
+import base64
+import binascii
+import json
+import uuid
+from datetime import datetime
+from typing import Generic, Self, TypeVar
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, field_validator, model_validator
 from pydantic.generics import GenericModel
 
 M = TypeVar("M", bound=BaseModel)
@@ -10,6 +15,26 @@ class GenericMultipleItems(GenericModel, Generic[M]):
     items: list[M]
 
 
+def encode_cursor(sort_value: datetime, id: uuid.UUID) -> str:
+    """Returns an opaque cursor pointing right after the item with the given sort key."""
+    payload = json.dumps([sort_value.isoformat(), str(id)], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, uuid.UUID]:
+    """Returns the sort key stored in a cursor created by encode_cursor.
+
+    Raises:
+        ValueError: If the cursor is malformed.
+    """
+    try:
+        payload = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        sort_value, id = json.loads(payload)
+        return datetime.fromisoformat(sort_value), uuid.UUID(id)
+    except (binascii.Error, UnicodeDecodeError, TypeError, ValueError) as exc:
+        raise ValueError("Invalid pagination cursor") from exc
+
+
 class PaginationParams(BaseModel):
     limit: int = Field(
         default=15, gt=0, le=100, description="Maximum number of items to return per page (1-100)"
@@ -19,11 +44,35 @@ class PaginationParams(BaseModel):
         ge=0,
         description="Number of items to skip before starting to collect the result set",
     )
+    cursor: str | None = Field(
+        default=None,
+        description="Continue after the page that returned this next_cursor, instead of offset",
+    )
+    include_total: bool = Field(
+        default=True,
+        description="Count all matching items, this is only done for pages without a cursor",
+    )
+
+    @field_validator("cursor")
+    @classmethod
+    def _validate_cursor(cls, v: str | None) -> str | None:
+        if v is not None:
+            decode_cursor(v)
+        return v
+
+    @model_validator(mode="after")
+    def _validate_cursor_offset(self) -> Self:
+        if self.cursor is not None and self.offset:
+            raise ValueError("Pagination accepts either a cursor or an offset, not both")
+        return self
 
 
 class PaginationMeta(BaseModel):
-    total: int = Field(
-        ..., ge=0, description="Total number of items matching the query across all pages"
+    total: int | None = Field(
+        ...,
+        ge=0,
+        description="Total number of items matching the query across all pages, "
+        "null on pages requested with a cursor or without include_total",
     )
     count: int = Field(
         ..., ge=0, description="Number of items actually returned in the page (<= limit)"
@@ -33,3 +82,6 @@ class PaginationMeta(BaseModel):
 class PaginatedResponse(GenericMultipleItems[M], Generic[M]):
     meta: PaginationMeta
     pagination: PaginationParams
+    next_cursor: str | None = Field(
+        default=None, description="Cursor of the next page, null on the last page"
+    )
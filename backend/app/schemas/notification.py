@@ -1,11 +1,14 @@
 import uuid
-from datetime import datetime, time
-from typing import Annotated, Literal, Self
+from datetime import datetime, time, timedelta, timezone
+from typing import Annotated, Any, Literal, Self, Sequence
 
 from pydantic import BaseModel, ConfigDict, Field, field_validator, model_validator
 
 from app.database.models.notification import NotificationFrequency
 
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_MICROSECOND = timedelta(microseconds=1)
+
 
 class NotificationRuleBase(BaseModel):
     time_of_day: time = Field(
@@ -108,8 +111,63 @@ NotificationRuleRead = Annotated[
 class NotificationTask(BaseModel):
     delivery_id: uuid.UUID
     user_fcm_token: str
-    title: str
-    body: str
+    template_id: uuid.UUID | None = None
+    # Version of the template at dispatch, missing in tasks enqueued by the previous release.
+    template_version: int | None = None
+    variables: dict[str, str] = {}
+    # Partition key of the delivery, missing in tasks enqueued by the previous release.
+    scheduled_for: datetime | None = None
+    # Tasks enqueued before templates were introduced carry the rendered content instead of
+    # a template. They are accepted for one release.
+    title: str | None = None
+    body: str | None = None
+
+    @model_validator(mode="after")
+    def _validate_content(self) -> Self:
+        if self.template_id is None and (self.title is None or self.body is None):
+            raise ValueError("Either a template or a title and body are required")
+        return self
+
+    def to_compact(self) -> Sequence[Any] | dict[str, Any]:
+        """Returns the task as a tuple with raw UUID bytes and the scheduled time in whole
+        microseconds since the epoch, the form sent to the workers.
+
+        Tasks carrying rendered content instead of a template are returned as a model_dump()
+        dictionary, which from_compact() accepts as well.
+        """
+        if self.template_id is None:
+            return self.model_dump(mode="json", exclude_none=True)
+        scheduled_for = None
+        if self.scheduled_for is not None:
+            scheduled_for = (self.scheduled_for - _EPOCH) // _MICROSECOND
+        return (
+            self.delivery_id.bytes,
+            self.user_fcm_token,
+            self.template_id.bytes,
+            self.variables,
+            scheduled_for,
+            self.template_version,
+        )
+
+    @classmethod
+    def from_compact(cls, data: Sequence[Any] | dict[str, Any]) -> Self:
+        """Restores the task from to_compact() output, or from a model_dump() dictionary.
+
+        Tuples without the scheduled time or the template version and dictionaries with a
+        title and body instead of a template, as enqueued by previous releases, are accepted.
+        """
+        if isinstance(data, dict):
+            return cls.model_validate(data)
+        delivery_id, user_fcm_token, template_id, variables, *rest = data
+        scheduled_for, template_version = (*rest, None, None)[:2]
+        return cls(
+            delivery_id=uuid.UUID(bytes=delivery_id),
+            user_fcm_token=user_fcm_token,
+            template_id=uuid.UUID(bytes=template_id),
+            template_version=template_version,
+            variables=variables,
+            scheduled_for=None if scheduled_for is None else _EPOCH + scheduled_for * _MICROSECOND,
+        )
 
 
 class NotificationMetadata(BaseModel):
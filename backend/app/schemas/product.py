@@ -28,3 +28,8 @@ class ProductInDB(ProductBase):
 
 
 class ProductRead(ProductInDB): ...
+
+
+class ProductSummary(BaseModel):
+    id: uuid.UUID
+    name: str
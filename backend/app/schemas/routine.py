@@ -1,12 +1,17 @@
 import uuid
 from datetime import datetime, timezone
+from enum import StrEnum
 from typing import Self
 
 from pydantic import BaseModel, ConfigDict, Field, field_validator, model_validator
 
 from app.database.models.routine import RoutineType
 from app.schemas.common import PaginationParams
-from app.schemas.product import ProductRead
+from app.schemas.product import ProductRead, ProductSummary
+
+
+class RoutineExpand(StrEnum):
+    PRODUCTS = "products"
 
 
 class RoutineParams(PaginationParams):
@@ -16,6 +21,9 @@ class RoutineParams(PaginationParams):
     performed_before: datetime | None = Field(
         None, description="Time before which this routine was performed (timezone-aware)"
     )
+    expand: RoutineExpand | None = Field(
+        None, description="Return full products instead of only their ids and names"
+    )
 
 
 class RoutineBase(BaseModel):
@@ -65,3 +73,13 @@ class RoutineInDB(RoutineBase):
 
 
 class RoutineRead(RoutineInDB): ...
+
+
+class RoutineSummary(RoutineBase):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: uuid.UUID
+    user_id: uuid.UUID
+    created_at: datetime
+    updated_at: datetime
+    products: list[ProductSummary]
@@ -1,4 +1,38 @@
-from app.services.fcm import FCMService
+from app.services.campaigns import ALL_DEVICES_SEGMENT, CampaignSegments
+from app.services.fcm import (
+    FCM_BATCH_SIZE,
+    PERMANENT_FCM_ERRORS,
+    PERMANENT_TOPIC_ERRORS,
+    FCMSendResult,
+    FCMService,
+)
+from app.services.passwords import PasswordHasher
+from app.services.ratelimit import FCMRateLimiter
+from app.services.schedule import RedisScheduleIndex
 from app.services.scheduler import NotificationScheduler
+from app.services.templates import (
+    ROUTINE_REMINDER_TEMPLATE,
+    CachedTemplate,
+    NotificationTemplateRegistry,
+)
+from app.services.tokens import TokenCache
+from app.services.users import UserCache
 
-__all__ = ["FCMService", "NotificationScheduler"]
+__all__ = [
+    "FCMService",
+    "FCMSendResult",
+    "FCM_BATCH_SIZE",
+    "PERMANENT_FCM_ERRORS",
+    "PERMANENT_TOPIC_ERRORS",
+    "FCMRateLimiter",
+    "NotificationScheduler",
+    "RedisScheduleIndex",
+    "NotificationTemplateRegistry",
+    "CachedTemplate",
+    "ROUTINE_REMINDER_TEMPLATE",
+    "CampaignSegments",
+    "ALL_DEVICES_SEGMENT",
+    "UserCache",
+    "TokenCache",
+    "PasswordHasher",
+]
@@ -0,0 +1,57 @@
+from typing import Sequence
+from urllib.parse import quote, unquote
+
+from app.core import settings
+from app.services.fcm.transport import FCM_CONDITION_MAX_TOPICS
+
+ALL_DEVICES_SEGMENT = "all"
+
+
+class CampaignSegments:
+    """Maps device attributes to campaign segments, which double as FCM topic names.
+
+    Values are percent-encoded, so that any value results in a valid topic name and the
+    attribute it was derived from can be recovered from the segment.
+    """
+
+    @classmethod
+    def get_device_segments(cls, attributes: dict[str, str]) -> list[str]:
+        """Returns the segments a device with the given attributes belongs to."""
+        segments = [ALL_DEVICES_SEGMENT]
+        for key in settings.CAMPAIGN_SEGMENT_ATTRIBUTES:
+            value = attributes.get(key)
+            if value:
+                segments.append(f"{key}-{quote(value, safe='')}")
+        return segments
+
+    @classmethod
+    def get_attributes(cls, segment: str) -> dict[str, str]:
+        """Returns the attributes shared by all devices of the segment.
+
+        Raises:
+            ValueError: If the segment does not exist.
+        """
+        if segment == ALL_DEVICES_SEGMENT:
+            return {}
+        key, _, value = segment.partition("-")
+        if key not in settings.CAMPAIGN_SEGMENT_ATTRIBUTES or not value:
+            raise ValueError(f"Unknown campaign segment {segment!r}")
+        return {key: unquote(value)}
+
+    @classmethod
+    def get_condition(cls, segments: Sequence[str]) -> str:
+        """Returns the FCM condition matching devices in any of the segments.
+
+        A device belonging to several of the segments matches it once, so it receives a
+        single message.
+
+        Raises:
+            ValueError: If the segments are too many for a single condition.
+        """
+        if ALL_DEVICES_SEGMENT in segments:
+            segments = [ALL_DEVICES_SEGMENT]
+        if len(segments) > FCM_CONDITION_MAX_TOPICS:
+            raise ValueError(
+                f"A campaign can target at most {FCM_CONDITION_MAX_TOPICS} segments at once"
+            )
+        return " || ".join(f"'{segment}' in topics" for segment in segments)
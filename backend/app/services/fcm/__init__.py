@@ -0,0 +1,25 @@
+from app.services.fcm.service import FCMService
+from app.services.fcm.transport import (
+    FCM_BATCH_SIZE,
+    FCM_CONDITION_MAX_TOPICS,
+    FCM_TOPIC_BATCH_SIZE,
+    PERMANENT_FCM_ERRORS,
+    PERMANENT_TOPIC_ERRORS,
+    FCMSendResult,
+    FCMTransport,
+    FirebaseAdminTransport,
+    HTTPv1Transport,
+)
+
+__all__ = [
+    "FCMService",
+    "FCMSendResult",
+    "FCMTransport",
+    "FirebaseAdminTransport",
+    "HTTPv1Transport",
+    "FCM_BATCH_SIZE",
+    "PERMANENT_FCM_ERRORS",
+    "FCM_TOPIC_BATCH_SIZE",
+    "FCM_CONDITION_MAX_TOPICS",
+    "PERMANENT_TOPIC_ERRORS",
+]
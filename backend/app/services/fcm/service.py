@@ -0,0 +1,156 @@
+import logging
+import time
+from collections import Counter
+from typing import Sequence
+
+from firebase_admin import messaging
+from firebase_admin.exceptions import FirebaseError
+
+from app.core import settings
+from app.core.metrics import FCM_MESSAGES, FCM_SEND_SECONDS
+from app.schemas import NotificationMetadata
+from app.services.fcm.transport import (
+    FCM_BATCH_SIZE,
+    FCM_TOPIC_BATCH_SIZE,
+    FCMSendResult,
+    FCMTransport,
+    FirebaseAdminTransport,
+    HTTPv1Transport,
+)
+from app.services.ratelimit import FCMRateLimiter
+
+logger = logging.getLogger(__name__)
+
+
+def _get_outcome(result: FCMSendResult) -> str:
+    if result.success:
+        return "success"
+    if result.permanent_failure:
+        return "permanent_failure"
+    return "rejected" if result.rejected else "failure"
+
+
+class FCMService:
+    _transport: FCMTransport | None = None
+
+    @classmethod
+    def _get_transport(cls) -> FCMTransport:
+        if cls._transport is None:
+            if settings.FCM_TRANSPORT == "http2":
+                cls._transport = HTTPv1Transport.from_settings()
+            else:
+                cls._transport = FirebaseAdminTransport()
+        return cls._transport
+
+    @staticmethod
+    def build_message(
+        token: str, title: str, body: str, metadata: NotificationMetadata | None = None
+    ) -> messaging.Message:
+        stringified = {}
+        if metadata:
+            stringified = {
+                key: str(value) for key, value in metadata.model_dump(exclude_none=True).items()
+            }
+        return messaging.Message(
+            notification=messaging.Notification(title=title, body=body),
+            data=stringified,
+            token=token,
+        )
+
+    @classmethod
+    def send_message(
+        cls, token: str, title: str, body: str, metadata: NotificationMetadata | None = None
+    ) -> str:
+        """Sends a Firebase Cloud Messaging (FCM) message to a specific device.
+
+        Returns:
+            The message ID string if the message was sent successfully.
+        """
+        message = cls.build_message(token, title, body, metadata)
+
+        FCMRateLimiter.acquire()
+        started = time.perf_counter()
+        try:
+            message_id = cls._get_transport().send(message)
+        except FirebaseError as exc:
+            FCM_SEND_SECONDS.labels("send", "error").observe(time.perf_counter() - started)
+            FCM_MESSAGES.labels(_get_outcome(FCMSendResult(exception=exc))).inc()
+            logger.error("Failed to send FCM message %s", message, exc_info=True)
+            raise exc
+        FCM_SEND_SECONDS.labels("send", "success").observe(time.perf_counter() - started)
+        FCM_MESSAGES.labels("success").inc()
+        return message_id
+
+    @classmethod
+    def send_batch(cls, messages: Sequence[messaging.Message]) -> list[FCMSendResult]:
+        """Sends multiple FCM messages using batch requests of up to FCM_BATCH_SIZE messages.
+
+        Each batch waits for the shared rate limiter before being sent.
+
+        Returns:
+            A list of results in the same order as the provided messages.
+        """
+        transport = cls._get_transport()
+        results = []
+        for idx in range(0, len(messages), FCM_BATCH_SIZE):
+            chunk = list(messages[idx : idx + FCM_BATCH_SIZE])
+            FCMRateLimiter.acquire(len(chunk))
+            started = time.perf_counter()
+            try:
+                chunk_results = transport.send_each(chunk)
+            except FirebaseError as exc:
+                FCM_SEND_SECONDS.labels("batch", "error").observe(time.perf_counter() - started)
+                logger.error("Failed to send batch of %d FCM messages", len(chunk), exc_info=True)
+                raise exc
+            FCM_SEND_SECONDS.labels("batch", "success").observe(time.perf_counter() - started)
+            outcomes = Counter(_get_outcome(result) for result in chunk_results)
+            for outcome, count in outcomes.items():
+                FCM_MESSAGES.labels(outcome).inc(count)
+            results.extend(chunk_results)
+        return results
+
+    @classmethod
+    def send_to_condition(cls, condition: str, title: str, body: str) -> str:
+        """Sends a single FCM message to every device whose topics match the condition.
+
+        Returns:
+            The message ID string if the message was sent successfully.
+        """
+        message = messaging.Message(
+            notification=messaging.Notification(title=title, body=body), condition=condition
+        )
+
+        FCMRateLimiter.acquire()
+        started = time.perf_counter()
+        try:
+            message_id = cls._get_transport().send(message)
+        except FirebaseError as exc:
+            FCM_SEND_SECONDS.labels("condition", "error").observe(time.perf_counter() - started)
+            FCM_MESSAGES.labels(_get_outcome(FCMSendResult(exception=exc))).inc()
+            logger.error("Failed to send FCM message to condition %s", condition, exc_info=True)
+            raise exc
+        FCM_SEND_SECONDS.labels("condition", "success").observe(time.perf_counter() - started)
+        FCM_MESSAGES.labels("success").inc()
+        return message_id
+
+    @classmethod
+    def subscribe_to_topic(cls, tokens: Sequence[str], topic: str) -> dict[str, str]:
+        """Subscribes registration tokens to the topic using requests of up to
+        FCM_TOPIC_BATCH_SIZE tokens.
+
+        Returns:
+            Reasons of failures by the tokens which could not be subscribed.
+        """
+        transport = cls._get_transport()
+        failures = {}
+        for idx in range(0, len(tokens), FCM_TOPIC_BATCH_SIZE):
+            chunk = list(tokens[idx : idx + FCM_TOPIC_BATCH_SIZE])
+            try:
+                response = transport.subscribe_to_topic(chunk, topic)
+            except FirebaseError as exc:
+                logger.error(
+                    "Failed to subscribe %d tokens to topic %s", len(chunk), topic, exc_info=True
+                )
+                raise exc
+            failures.update((chunk[error.index], error.reason) for error in response.errors)
+        return failures
@@ -0,0 +1,294 @@
+import asyncio
+import threading
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Any, Self, Sequence, override
+
+import firebase_admin
+import google.auth.transport.requests
+import httpx
+from firebase_admin import credentials, exceptions, messaging
+from firebase_admin.exceptions import FirebaseError
+from google.oauth2 import service_account
+
+from app.core import settings
+
+# Maximum number of messages accepted by a single FCM batch request.
+FCM_BATCH_SIZE = 500
+# Maximum number of registration tokens accepted by a single topic management request.
+FCM_TOPIC_BATCH_SIZE = 1000
+# Maximum number of topics a single message condition may reference.
+FCM_CONDITION_MAX_TOPICS = 5
+FCM_SCOPES = ["https://www.googleapis.com/auth/firebase.messaging"]
+# Errors meaning that the registration token will never be accepted again, retrying the
+# message is pointless and the device should be forgotten.
+PERMANENT_FCM_ERRORS = (
+    messaging.UnregisteredError,
+    messaging.SenderIdMismatchError,
+)
+# Errors meaning that FCM rejected the message itself, retrying it is pointless as well.
+# INVALID_ARGUMENT also covers malformed payloads, which would be the same for every
+# recipient of a broken template, so devices are kept.
+REJECTED_FCM_ERRORS = (exceptions.InvalidArgumentError,)
+# Topic management error reasons meaning that the registration token is not valid anymore.
+PERMANENT_TOPIC_ERRORS = frozenset({"NOT_FOUND", "INVALID_ARGUMENT"})
+
+
+@dataclass(frozen=True, slots=True)
+class FCMSendResult:
+    """Outcome of sending a single message as part of a batch."""
+
+    message_id: str | None = None
+    exception: FirebaseError | None = None
+
+    @property
+    def success(self) -> bool:
+        return self.exception is None
+
+    @property
+    def permanent_failure(self) -> bool:
+        return isinstance(self.exception, PERMANENT_FCM_ERRORS)
+
+    @property
+    def rejected(self) -> bool:
+        return isinstance(self.exception, REJECTED_FCM_ERRORS)
+
+
+class FCMTransport(ABC):
+    @abstractmethod
+    def send(self, message: messaging.Message) -> str:
+        """Sends a single message.
+
+        Returns:
+            The message ID string if the message was sent successfully.
+
+        Raises:
+            FirebaseError: If the message could not be sent.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def send_each(self, messages: Sequence[messaging.Message]) -> list[FCMSendResult]:
+        """Sends up to FCM_BATCH_SIZE messages, returning results in the same order."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def subscribe_to_topic(
+        self, tokens: Sequence[str], topic: str
+    ) -> messaging.TopicManagementResponse:
+        """Subscribes up to FCM_TOPIC_BATCH_SIZE registration tokens to the topic.
+
+        Raises:
+            FirebaseError: If the request failed as a whole.
+        """
+        raise NotImplementedError
+
+
+class FirebaseAdminTransport(FCMTransport):
+    """Transport using the blocking API of the Firebase Admin SDK."""
+
+    def __init__(self) -> None:
+        self._initialized = False
+
+    def _ensure_initialized(self) -> None:
+        if not self._initialized:
+            cred = credentials.Certificate(settings.FCM_CREDENTIALS_PATH)
+            try:
+                firebase_admin.get_app()
+            except ValueError:
+                firebase_admin.initialize_app(cred)
+            self._initialized = True
+
+    @override
+    def send(self, message: messaging.Message) -> str:
+        self._ensure_initialized()
+        return messaging.send(message)
+
+    @override
+    def send_each(self, messages: Sequence[messaging.Message]) -> list[FCMSendResult]:
+        self._ensure_initialized()
+        batch = messaging.send_each(list(messages))
+        return [
+            FCMSendResult(message_id=response.message_id, exception=response.exception)
+            for response in batch.responses
+        ]
+
+    @override
+    def subscribe_to_topic(
+        self, tokens: Sequence[str], topic: str
+    ) -> messaging.TopicManagementResponse:
+        self._ensure_initialized()
+        return messaging.subscribe_to_topic(list(tokens), topic)
+
+
+_FCM_ERRORS: dict[str, type[FirebaseError]] = {
+    "UNREGISTERED": messaging.UnregisteredError,
+    "SENDER_ID_MISMATCH": messaging.SenderIdMismatchError,
+    "QUOTA_EXCEEDED": messaging.QuotaExceededError,
+    "THIRD_PARTY_AUTH_ERROR": messaging.ThirdPartyAuthError,
+}
+
+_PLATFORM_ERRORS: dict[str, type[FirebaseError]] = {
+    "INVALID_ARGUMENT": exceptions.InvalidArgumentError,
+    "NOT_FOUND": exceptions.NotFoundError,
+    "PERMISSION_DENIED": exceptions.PermissionDeniedError,
+    "UNAUTHENTICATED": exceptions.UnauthenticatedError,
+    "RESOURCE_EXHAUSTED": exceptions.ResourceExhaustedError,
+    "INTERNAL": exceptions.InternalError,
+    "UNAVAILABLE": exceptions.UnavailableError,
+}
+
+
+def _encode_message(message: messaging.Message) -> dict[str, Any]:
+    encoded: dict[str, Any] = {
+        "token": message.token,
+        "topic": message.topic,
+        "condition": message.condition,
+    }
+    if message.notification is not None:
+        encoded["notification"] = {
+            "title": message.notification.title,
+            "body": message.notification.body,
+        }
+    if message.data:
+        encoded["data"] = message.data
+    return {key: value for key, value in encoded.items() if value is not None}
+
+
+def _error_from_response(response: httpx.Response) -> FirebaseError:
+    try:
+        error = response.json().get("error", {})
+    except ValueError:
+        error = {}
+    if not isinstance(error, dict):
+        # The Instance ID API describes errors with a bare string.
+        error = {"message": str(error)}
+    detail = error.get("message") or f"Unexpected HTTP response with status {response.status_code}"
+    for item in error.get("details", []):
+        error_type = _FCM_ERRORS.get(item.get("errorCode"))
+        if error_type is not None:
+            return error_type(detail)
+    error_type = _PLATFORM_ERRORS.get(error.get("status"), exceptions.UnknownError)
+    return error_type(detail)
+
+
+class HTTPv1Transport(FCMTransport):
+    """Asynchronous client of the FCM HTTP v1 API.
+
+    Requests are multiplexed over pooled HTTP/2 connections by an event loop running in a
+    background thread. The loop outlives single calls, so connections and OAuth access
+    tokens are reused between batches, while up to max_concurrency requests are in flight.
+    """
+
+    def __init__(
+        self,
+        endpoint: str,
+        iid_endpoint: str,
+        project_id: str,
+        credentials: service_account.Credentials | None,
+        max_concurrency: int,
+    ) -> None:
+        self._url = f"{endpoint.rstrip('/')}/v1/projects/{project_id}/messages:send"
+        self._iid_url = f"{iid_endpoint.rstrip('/')}/iid/v1:batchAdd"
+        self._credentials = credentials
+        self._max_concurrency = max_concurrency
+        self._token_lock = threading.Lock()
+        self._client: httpx.AsyncClient | None = None
+        self._semaphore: asyncio.Semaphore | None = None
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(
+            target=self._loop.run_forever, name="fcm-http-transport", daemon=True
+        )
+        self._thread.start()
+
+    @classmethod
+    def from_settings(cls) -> Self:
+        creds = None
+        if settings.FCM_AUTH_ENABLED:
+            creds = service_account.Credentials.from_service_account_file(
+                str(settings.FCM_CREDENTIALS_PATH), scopes=FCM_SCOPES
+            )
+        project_id = settings.FCM_PROJECT_ID or (creds.project_id if creds else None)
+        if project_id is None:
+            raise ValueError("FCM_PROJECT_ID is required when FCM authentication is disabled")
+        return cls(
+            endpoint=settings.FCM_ENDPOINT,
+            iid_endpoint=settings.FCM_IID_ENDPOINT,
+            project_id=project_id,
+            credentials=creds,
+            max_concurrency=settings.FCM_MAX_CONCURRENCY,
+        )
+
+    def _get_headers(self) -> dict[str, str]:
+        if self._credentials is None:
+            return {}
+        with self._token_lock:
+            if not self._credentials.valid:
+                self._credentials.refresh(google.auth.transport.requests.Request())
+            return {"Authorization": f"Bearer {self._credentials.token}"}
+
+    def _get_client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                http2=True,
+                timeout=httpx.Timeout(10.0),
+                limits=httpx.Limits(
+                    max_connections=self._max_concurrency,
+                    max_keepalive_connections=self._max_concurrency,
+                ),
+            )
+            self._semaphore = asyncio.Semaphore(self._max_concurrency)
+        return self._client
+
+    async def _send_one(self, message: messaging.Message, headers: dict[str, str]) -> FCMSendResult:
+        client = self._get_client()
+        async with self._semaphore:
+            try:
+                response = await client.post(
+                    self._url, json={"message": _encode_message(message)}, headers=headers
+                )
+            except httpx.HTTPError as exc:
+                return FCMSendResult(
+                    exception=exceptions.UnavailableError(f"FCM request failed: {exc}", cause=exc)
+                )
+        if response.is_success:
+            return FCMSendResult(message_id=response.json()["name"])
+        return FCMSendResult(exception=_error_from_response(response))
+
+    async def _send_all(
+        self, messages: Sequence[messaging.Message], headers: dict[str, str]
+    ) -> list[FCMSendResult]:
+        return list(await asyncio.gather(*(self._send_one(m, headers) for m in messages)))
+
+    async def _batch_add(self, payload: dict[str, Any], headers: dict[str, str]) -> httpx.Response:
+        client = self._get_client()
+        async with self._semaphore:
+            return await client.post(self._iid_url, json=payload, headers=headers)
+
+    @override
+    def send(self, message: messaging.Message) -> str:
+        (result,) = self.send_each([message])
+        if result.exception is not None:
+            raise result.exception
+        return result.message_id
+
+    @override
+    def send_each(self, messages: Sequence[messaging.Message]) -> list[FCMSendResult]:
+        headers = self._get_headers()
+        future = asyncio.run_coroutine_threadsafe(self._send_all(messages, headers), self._loop)
+        return future.result()
+
+    @override
+    def subscribe_to_topic(
+        self, tokens: Sequence[str], topic: str
+    ) -> messaging.TopicManagementResponse:
+        headers = {**self._get_headers(), "access_token_auth": "true"}
+        payload = {"to": f"/topics/{topic}", "registration_tokens": list(tokens)}
+        future = asyncio.run_coroutine_threadsafe(self._batch_add(payload, headers), self._loop)
+        try:
+            response = future.result()
+        except httpx.HTTPError as exc:
+            raise exceptions.UnavailableError(f"IID request failed: {exc}", cause=exc) from exc
+        if not response.is_success:
+            raise _error_from_response(response)
+        return messaging.TopicManagementResponse(response.json())
@@ -0,0 +1,72 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, TypeVar
+
+from app.core import get_password_hash, settings, verify_and_update_password
+from app.core.exceptions import ServiceOverloadedError
+from app.core.metrics import (
+    PASSWORD_HASH_REJECTIONS,
+    PASSWORD_HASH_SECONDS,
+    PASSWORD_HASH_WAIT_SECONDS,
+)
+
+T = TypeVar("T")
+
+
+class PasswordHasher:
+    """Runs bcrypt on a dedicated thread pool, so that it never blocks the event loop.
+
+    At most PASSWORD_HASH_WORKERS passwords are hashed at once and up to
+    PASSWORD_HASH_QUEUE_SIZE more wait for a free worker. Anything beyond that is shed
+    with ServiceOverloadedError, so a login storm is answered with 503 responses instead
+    of starving all other requests of the process.
+    """
+
+    _executor: ThreadPoolExecutor | None = None
+    # Only touched from the event loop, which makes the check and update atomic.
+    _pending = 0
+
+    @classmethod
+    def _get_executor(cls) -> ThreadPoolExecutor:
+        if cls._executor is None:
+            cls._executor = ThreadPoolExecutor(
+                max_workers=settings.PASSWORD_HASH_WORKERS, thread_name_prefix="password-hash"
+            )
+        return cls._executor
+
+    @classmethod
+    async def _run(cls, operation: str, func: Callable[..., T], *args: str) -> T:
+        if cls._pending >= settings.PASSWORD_HASH_WORKERS + settings.PASSWORD_HASH_QUEUE_SIZE:
+            PASSWORD_HASH_REJECTIONS.labels(operation).inc()
+            raise ServiceOverloadedError("Too many password checks in progress, try again later")
+        submitted = time.perf_counter()
+
+        def run() -> T:
+            started = time.perf_counter()
+            PASSWORD_HASH_WAIT_SECONDS.labels(operation).observe(started - submitted)
+            try:
+                return func(*args)
+            finally:
+                PASSWORD_HASH_SECONDS.labels(operation).observe(time.perf_counter() - started)
+
+        cls._pending += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(cls._get_executor(), run)
+        finally:
+            cls._pending -= 1
+
+    @classmethod
+    async def hash(cls, password: str) -> str:
+        """Returns the hash of the password with the current bcrypt cost."""
+        return await cls._run("hash", get_password_hash, password)
+
+    @classmethod
+    async def verify_and_update(cls, password: str, hashed: str) -> tuple[bool, str | None]:
+        """Checks the password against its hash.
+
+        Returns:
+            Whether the password matches, and a new hash if the stored one was created
+            with different cost parameters and should be replaced.
+        """
+        return await cls._run("verify", verify_and_update_password, password, hashed)
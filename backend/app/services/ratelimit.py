@@ -0,0 +1,66 @@
+import time
+
+import redis
+
+from app.core import settings
+
+RATE_LIMIT_KEY = "fcm:rate_limit"
+
+# Refills the bucket according to the time elapsed since the last call and takes the
+# requested tokens if there are enough of them. Otherwise nothing is taken and the number
+# of seconds after which the request could be satisfied is returned. Redis' own clock is
+# used, so that all workers share the same notion of time.
+_TAKE_TOKENS_SCRIPT = """
+local rate = tonumber(ARGV[1])
+local capacity = tonumber(ARGV[2])
+local requested = tonumber(ARGV[3])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'updated_at')
+local tokens = tonumber(bucket[1]) or capacity
+local updated_at = tonumber(bucket[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - updated_at) * rate)
+local wait = 0
+if tokens >= requested then
+    tokens = tokens - requested
+else
+    wait = (requested - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'updated_at', now)
+redis.call('EXPIRE', KEYS[1], math.ceil(capacity / rate) + 1)
+return tostring(wait)
+"""
+
+
+class FCMRateLimiter:
+    """Token bucket shared by all workers, bounding the rate of messages sent to FCM.
+
+    Disabled unless FCM_RATE_LIMIT_PER_SECOND is set. Up to FCM_RATE_LIMIT_BURST messages
+    can be sent at once after a period of inactivity.
+    """
+
+    _client: redis.Redis | None = None
+
+    @classmethod
+    def _get_client(cls) -> redis.Redis:
+        if cls._client is None:
+            cls._client = redis.Redis.from_url(settings.REDIS_URL, decode_responses=True)
+        return cls._client
+
+    @classmethod
+    def acquire(cls, tokens: int = 1) -> None:
+        """Blocks until the given number of messages may be sent."""
+        rate = settings.FCM_RATE_LIMIT_PER_SECOND
+        if rate is None:
+            return
+        capacity = settings.FCM_RATE_LIMIT_BURST
+        client = cls._get_client()
+        while tokens > 0:
+            requested = min(tokens, capacity)
+            wait = float(
+                client.eval(_TAKE_TOKENS_SCRIPT, 1, RATE_LIMIT_KEY, rate, capacity, requested)
+            )
+            if wait > 0:
+                time.sleep(wait)
+                continue
+            tokens -= requested
@@ -0,0 +1,117 @@
+import logging
+import uuid
+from datetime import datetime
+from typing import Iterable
+
+import redis
+import redis.asyncio as aioredis
+
+from app.core import settings
+from app.database.models import NotificationRule
+
+logger = logging.getLogger(__name__)
+
+SCHEDULE_KEY = "notification:schedule"
+
+# Atomically takes due members out of the sorted set, so that concurrent consumers
+# never receive the same rule twice.
+_POP_DUE_SCRIPT = """
+local members = redis.call('ZRANGEBYSCORE', KEYS[1], '-inf', ARGV[1], 'LIMIT', 0, ARGV[2])
+if #members > 0 then
+    redis.call('ZREM', KEYS[1], unpack(members))
+end
+return members
+"""
+
+
+class RedisScheduleIndex:
+    """Mirror of enabled notification rules' next runs kept in a Redis sorted set.
+
+    Postgres remains the source of truth, the index only tells consumers which rules
+    are worth claiming and when. The API updates it only after committing, and
+    reconcile_notification_schedule rebuilds it every NOTIFICATION_SCHEDULER_RECONCILE_MINUTES,
+    so a failed update is logged instead of failing the request.
+    """
+
+    _client: redis.Redis | None = None
+    _async_client: aioredis.Redis | None = None
+
+    @classmethod
+    def _get_client(cls) -> redis.Redis:
+        if cls._client is None:
+            cls._client = redis.Redis.from_url(settings.REDIS_URL, decode_responses=True)
+        return cls._client
+
+    @classmethod
+    def _get_async_client(cls) -> aioredis.Redis:
+        if cls._async_client is None:
+            cls._async_client = aioredis.Redis.from_url(settings.REDIS_URL, decode_responses=True)
+        return cls._async_client
+
+    @staticmethod
+    def _is_enabled() -> bool:
+        return settings.NOTIFICATION_SCHEDULER_ENGINE == "redis"
+
+    @staticmethod
+    def _is_scheduled(rule: NotificationRule) -> bool:
+        return rule.enabled and rule.next_run is not None
+
+    @classmethod
+    async def sync_rule(cls, rule: NotificationRule) -> None:
+        """Adds, moves or removes a rule in the index according to its committed schedule.
+
+        Does nothing unless NOTIFICATION_SCHEDULER_ENGINE is "redis".
+        """
+        if not cls._is_enabled():
+            return
+        client = cls._get_async_client()
+        try:
+            if cls._is_scheduled(rule):
+                await client.zadd(SCHEDULE_KEY, {str(rule.id): rule.next_run.timestamp()})
+            else:
+                await client.zrem(SCHEDULE_KEY, str(rule.id))
+        except redis.RedisError:
+            logger.error("Failed to sync notification rule %s to Redis", rule.id, exc_info=True)
+
+    @classmethod
+    async def remove_rule(cls, rule_id: uuid.UUID) -> None:
+        if not cls._is_enabled():
+            return
+        try:
+            await cls._get_async_client().zrem(SCHEDULE_KEY, str(rule_id))
+        except redis.RedisError:
+            logger.error("Failed to remove notification rule %s from Redis", rule_id, exc_info=True)
+
+    @classmethod
+    def sync_rules(cls, rules: Iterable[NotificationRule]) -> None:
+        """Synchronous variant of sync_rule for multiple rules, used by the workers."""
+        pipeline = cls._get_client().pipeline(transaction=False)
+        for rule in rules:
+            if cls._is_scheduled(rule):
+                pipeline.zadd(SCHEDULE_KEY, {str(rule.id): rule.next_run.timestamp()})
+            else:
+                pipeline.zrem(SCHEDULE_KEY, str(rule.id))
+        pipeline.execute()
+
+    @classmethod
+    def pop_due(cls, now: datetime, limit: int) -> list[uuid.UUID]:
+        """Removes and returns up to limit rules which are due at the given time."""
+        client = cls._get_client()
+        members = client.eval(_POP_DUE_SCRIPT, 1, SCHEDULE_KEY, now.timestamp(), limit)
+        return [uuid.UUID(member) for member in members]
+
+    @classmethod
+    def replace_all(cls, schedule: dict[uuid.UUID, datetime]) -> None:
+        """Replaces the whole index with the given schedule of rule ids and next runs."""
+        client = cls._get_client()
+        if not schedule:
+            client.delete(SCHEDULE_KEY)
+            return
+        staging_key = f"{SCHEDULE_KEY}:{uuid.uuid4().hex}"
+        pipeline = client.pipeline(transaction=False)
+        items = list(schedule.items())
+        for idx in range(0, len(items), 10_000):
+            chunk = items[idx : idx + 10_000]
+            pipeline.zadd(staging_key, {str(rule_id): run.timestamp() for rule_id, run in chunk})
+        pipeline.rename(staging_key, SCHEDULE_KEY)
+        pipeline.execute()
@@ -1,18 +1,57 @@
 from abc import ABC, abstractmethod
 from datetime import datetime, time, timedelta, timezone
-from typing import override
+from typing import Sequence, override
+
+import numpy as np
 
 from app.core import settings
 from app.core.exceptions import ConfigurationError, InvalidFrequencyError
 from app.database.models import NotificationFrequency, NotificationRule
 
+ONE_DAY = timedelta(days=1)
+WORKING_DAYS_MASK = 0b0011111
+
+# Integer codes of frequencies used by the vectorized scheduling API.
+FREQUENCY_CODES: dict[NotificationFrequency, int] = {
+    frequency: code for code, frequency in enumerate(NotificationFrequency)
+}
+
+_SECONDS_PER_DAY = 86400.0
+# 1970-01-01 was a thursday, so epoch day 0 has weekday 3.
+_EPOCH_WEEKDAY = 3
+
+
+def _days_until_weekday(mask: int, weekday: int) -> int | None:
+    for days in range(7):
+        if mask & (1 << ((weekday + days) % 7)):
+            return days
+    return None
+
+
+# Lookup table of days to wait from a given weekday (monday is 0) until the next weekday
+# enabled in a 7-bit mask (bit 0 is monday), or None if the mask has no bits set.
+DAYS_UNTIL_WEEKDAY: tuple[tuple[int | None, ...], ...] = tuple(
+    tuple(_days_until_weekday(mask, weekday) for weekday in range(7)) for mask in range(1 << 7)
+)
+
+
+# Same table as DAYS_UNTIL_WEEKDAY, with -1 in place of None for vectorized lookups.
+_DAYS_UNTIL_WEEKDAY_ARRAY = np.array(
+    [[-1 if days is None else days for days in row] for row in DAYS_UNTIL_WEEKDAY], dtype=np.int8
+)
+
+
+def weekdays_to_mask(weekdays: list[int]) -> int:
+    """Converts a 7-element binary list (monday to sunday) into a bit mask."""
+    return sum(1 << idx for idx, enabled in enumerate(weekdays) if enabled)
+
 
 class SchedulingStrategy(ABC):
     @abstractmethod
     def get_next_occurrence(
-        self, rule: NotificationRule, last_run: datetime | None
+        self, rule: NotificationRule, last_run: datetime | None, now: datetime
     ) -> datetime | None:
-        """Calculates the next run datetime based on the rule and the last run time."""
+        """Calculates the first run datetime after now based on the rule and its last run."""
         raise NotImplementedError
 
     @staticmethod
@@ -21,15 +60,29 @@ class SchedulingStrategy(ABC):
         event_dt = event_dt.replace(tzinfo=timezone.utc)
         return event_dt - timedelta(minutes=settings.NOTIFICATION_OFFSET_MINUTES)
 
+    @staticmethod
+    def _first_after(candidate: datetime, now: datetime, interval: timedelta = ONE_DAY) -> datetime:
+        """Moves the candidate forward by whole intervals to the first slot later than now."""
+        if candidate > now:
+            return candidate
+        return candidate + ((now - candidate) // interval + 1) * interval
+
+    @staticmethod
+    def _first_on_weekdays(candidate: datetime, mask: int) -> datetime | None:
+        """Moves the candidate forward to the nearest day enabled in the weekday mask."""
+        days = DAYS_UNTIL_WEEKDAY[mask][candidate.weekday()]
+        if days is None:
+            return None
+        return candidate + days * ONE_DAY
+
 
 class OnceStrategy(SchedulingStrategy):
     @override
     def get_next_occurrence(
-        self, rule: NotificationRule, last_run: datetime | None
+        self, rule: NotificationRule, last_run: datetime | None, now: datetime
     ) -> datetime | None:
         if last_run is not None:
             return None
-        now = datetime.now(timezone.utc)
         candidate = self._get_execution_time(now, rule.time_of_day)
         return candidate if candidate > now else None
 
@@ -37,74 +90,51 @@ class OnceStrategy(SchedulingStrategy):
 class DailyStrategy(SchedulingStrategy):
     @override
     def get_next_occurrence(
-        self, rule: NotificationRule, last_run: datetime | None = None
+        self, rule: NotificationRule, last_run: datetime | None, now: datetime
     ) -> datetime | None:
-        now = datetime.now(timezone.utc)
         base_date = last_run if last_run is not None else now
         candidate = self._get_execution_time(base_date, rule.time_of_day)
-
-        while candidate <= now:
-            candidate += timedelta(days=1)
-            candidate = self._get_execution_time(candidate, rule.time_of_day)
-        return candidate
+        return self._first_after(candidate, now)
 
 
 class EveryNDaysStrategy(SchedulingStrategy):
     @override
     def get_next_occurrence(
-        self, rule: NotificationRule, last_run: datetime | None = None
+        self, rule: NotificationRule, last_run: datetime | None, now: datetime
     ) -> datetime | None:
-        now = datetime.now(timezone.utc)
         if not rule.every_n:
             raise ConfigurationError("Every n days frequency requires value for interval")
 
-        if last_run is None:
-            candidate = self._get_execution_time(now, rule.time_of_day)
-            if candidate <= now:
-                target_date = now + timedelta(days=rule.every_n)
-                candidate = self._get_execution_time(target_date, rule.time_of_day)
-            return candidate
-        next_date_base = last_run + timedelta(days=rule.every_n)
-        return self._get_execution_time(next_date_base, rule.time_of_day)
+        interval = timedelta(days=rule.every_n)
+        base_date = last_run + interval if last_run is not None else now
+        candidate = self._get_execution_time(base_date, rule.time_of_day)
+        return self._first_after(candidate, now, interval)
 
 
 class WeekdayOnlyStrategy(SchedulingStrategy):
     @override
     def get_next_occurrence(
-        self, rule: NotificationRule, last_run: datetime | None = None
+        self, rule: NotificationRule, last_run: datetime | None, now: datetime
     ) -> datetime | None:
-        now = datetime.now(timezone.utc)
         base_date = last_run if last_run is not None else now
         candidate = self._get_execution_time(base_date, rule.time_of_day)
-
-        while candidate <= now or candidate.weekday() >= 5:
-            candidate += timedelta(days=1)
-            candidate = self._get_execution_time(candidate, rule.time_of_day)
-        return candidate
+        return self._first_on_weekdays(self._first_after(candidate, now), WORKING_DAYS_MASK)
 
 
 class CustomStrategy(SchedulingStrategy):
     """Strategy for user-selected custom weekdays."""
 
-    _DAYS_AHEAD_CHECK: int = 15
-
     @override
     def get_next_occurrence(
-        self, rule: NotificationRule, last_run: datetime | None = None
+        self, rule: NotificationRule, last_run: datetime | None, now: datetime
     ) -> datetime | None:
         if not rule.weekdays or len(rule.weekdays) != 7:
             raise ConfigurationError("Custom frequency requires a valid 7-day binary mask")
-        now = datetime.now(timezone.utc)
         base_date = last_run if last_run is not None else now
-
-        for days_ahead in range(self._DAYS_AHEAD_CHECK):
-            target_date_raw = base_date + timedelta(days=days_ahead)
-            candidate = self._get_execution_time(target_date_raw, rule.time_of_day)
-            if candidate <= now:
-                continue
-            if rule.weekdays[candidate.weekday()] == 1:
-                return candidate
-        return None
+        candidate = self._get_execution_time(base_date, rule.time_of_day)
+        return self._first_on_weekdays(
+            self._first_after(candidate, now), weekdays_to_mask(rule.weekdays)
+        )
 
 
 class NotificationScheduler:
@@ -118,9 +148,125 @@ class NotificationScheduler:
 
     @classmethod
     def plan_next_run(
-        cls, rule: NotificationRule, last_run: datetime | None = None
+        cls, rule: NotificationRule, last_run: datetime | None = None, now: datetime | None = None
     ) -> datetime | None:
+        """Plans the next run datetime of a single rule, e.g. when it is created or updated.
+
+        Raises:
+            InvalidFrequencyError: If the rule has an unsupported frequency.
+            ConfigurationError: If the rule is missing configuration required by its frequency.
+        """
         strategy = cls._STRATEGIES.get(rule.frequency)
         if strategy is None:
             raise InvalidFrequencyError("Unsupported notification frequency was provided")
-        return strategy.get_next_occurrence(rule, last_run)
+        return strategy.get_next_occurrence(
+            rule, last_run, now if now is not None else datetime.now(timezone.utc)
+        )
+
+    @classmethod
+    def plan_next_runs(
+        cls,
+        rules: Sequence[NotificationRule],
+        last_runs: Sequence[datetime | None],
+        now: datetime | None = None,
+    ) -> list[datetime | None]:
+        """Plans next run datetimes of multiple rules using a single vectorized pass.
+
+        Raises:
+            InvalidFrequencyError: If any rule has an unsupported frequency.
+            ConfigurationError: If any rule is missing configuration required by its frequency.
+        """
+        size = len(rules)
+        frequencies = np.empty(size, dtype=np.int8)
+        times_of_day = np.empty(size, dtype=np.float64)
+        every_n = np.zeros(size, dtype=np.int32)
+        weekdays = np.zeros(size, dtype=np.int8)
+        for idx, rule in enumerate(rules):
+            try:
+                frequency = NotificationFrequency(rule.frequency)
+            except ValueError as exc:
+                raise InvalidFrequencyError(
+                    "Unsupported notification frequency was provided"
+                ) from exc
+            if frequency == NotificationFrequency.EVERY_N_DAYS:
+                if not rule.every_n:
+                    raise ConfigurationError("Every n days frequency requires value for interval")
+                every_n[idx] = rule.every_n
+            elif frequency == NotificationFrequency.CUSTOM:
+                if not rule.weekdays or len(rule.weekdays) != 7:
+                    raise ConfigurationError("Custom frequency requires a valid 7-day binary mask")
+                weekdays[idx] = weekdays_to_mask(rule.weekdays)
+
+            frequencies[idx] = FREQUENCY_CODES[frequency]
+            tod = rule.time_of_day
+            times_of_day[idx] = (
+                tod.hour * 3600 + tod.minute * 60 + tod.second + tod.microsecond / 1_000_000
+            )
+
+        epochs = np.array(
+            [np.nan if last_run is None else last_run.timestamp() for last_run in last_runs],
+            dtype=np.float64,
+        )
+        next_runs = cls.plan_next_run_many(
+            frequencies, times_of_day, every_n, weekdays, epochs, now=now
+        )
+        return [
+            None if np.isnan(ts) else datetime.fromtimestamp(ts, timezone.utc)
+            for ts in next_runs.tolist()
+        ]
+
+    @staticmethod
+    def plan_next_run_many(
+        frequencies: np.ndarray,
+        times_of_day: np.ndarray,
+        every_n: np.ndarray,
+        weekdays: np.ndarray,
+        last_runs: np.ndarray,
+        now: datetime | None = None,
+    ) -> np.ndarray:
+        """Vectorized equivalent of plan_next_run operating on columnar rule data.
+
+        Args:
+            frequencies: Frequency codes as defined in FREQUENCY_CODES.
+            times_of_day: Time of day of the rules in seconds since midnight (UTC).
+            every_n: Interval in days, only used by EVERY_N_DAYS rules.
+            weekdays: 7-bit weekday masks (bit 0 is monday), only used by CUSTOM rules.
+            last_runs: Epoch timestamps of the last runs, NaN if a rule has never run.
+            now: Reference time shared by all rules, defaults to the current time.
+
+        Returns:
+            An array of next run epoch timestamps, NaN where a rule should not run again.
+        """
+        now_ts = (now if now is not None else datetime.now(timezone.utc)).timestamp()
+        offset = settings.NOTIFICATION_OFFSET_MINUTES * 60.0
+        never_run = np.isnan(last_runs)
+
+        is_every_n = frequencies == FREQUENCY_CODES[NotificationFrequency.EVERY_N_DAYS]
+        interval = np.where(is_every_n, np.maximum(every_n, 1) * _SECONDS_PER_DAY, _SECONDS_PER_DAY)
+        base = np.where(never_run, now_ts, last_runs)
+        base = np.where(is_every_n & ~never_run, base + interval, base)
+
+        candidate = np.floor(base / _SECONDS_PER_DAY) * _SECONDS_PER_DAY + times_of_day - offset
+        steps = np.where(candidate > now_ts, 0.0, np.floor((now_ts - candidate) / interval) + 1)
+        candidate = candidate + steps * interval
+
+        masks = np.where(
+            frequencies == FREQUENCY_CODES[NotificationFrequency.WEEKDAY_ONLY],
+            WORKING_DAYS_MASK,
+            weekdays,
+        ).astype(np.intp)
+        days = (np.floor(candidate / _SECONDS_PER_DAY).astype(np.int64) + _EPOCH_WEEKDAY) % 7
+        days_ahead = _DAYS_UNTIL_WEEKDAY_ARRAY[masks, days]
+        uses_weekdays = (frequencies == FREQUENCY_CODES[NotificationFrequency.WEEKDAY_ONLY]) | (
+            frequencies == FREQUENCY_CODES[NotificationFrequency.CUSTOM]
+        )
+        candidate = np.where(
+            uses_weekdays,
+            np.where(days_ahead >= 0, candidate + days_ahead * _SECONDS_PER_DAY, np.nan),
+            candidate,
+        )
+
+        is_once = frequencies == FREQUENCY_CODES[NotificationFrequency.ONCE]
+        today = np.floor(now_ts / _SECONDS_PER_DAY) * _SECONDS_PER_DAY + times_of_day - offset
+        once = np.where(never_run & (today > now_ts), today, np.nan)
+        return np.where(is_once, once, candidate)
@@ -0,0 +1,110 @@
+import threading
+import uuid
+from dataclasses import dataclass
+from typing import Iterable
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.database.models import NotificationTemplate
+
+ROUTINE_REMINDER_TEMPLATE = "routine_reminder"
+
+
+class _Variables(dict[str, str]):
+    def __missing__(self, key: str) -> str:
+        return "{" + key + "}"
+
+
+@dataclass(frozen=True, slots=True)
+class CachedTemplate:
+    id: uuid.UUID
+    name: str
+    version: int
+    title: str
+    body: str
+
+    def render(self, variables: dict[str, str] | None = None) -> tuple[str, str]:
+        """Returns the title and body with {placeholders} replaced by the given variables.
+
+        Placeholders without a matching variable are left as they are.
+        """
+        mapping = _Variables(variables or {})
+        return self.title.format_map(mapping), self.body.format_map(mapping)
+
+
+TemplateKey = tuple[uuid.UUID, int | None]
+
+
+class NotificationTemplateRegistry:
+    """Per-process cache of notification templates used by the workers.
+
+    Templates are cached by their id and version, which is bumped by every update, so a
+    cached entry never goes stale. Tasks carry the version they were created with, which
+    the dispatcher resolves from the template name on every call of get_by_name().
+    """
+
+    _by_key: dict[tuple[uuid.UUID, int], CachedTemplate] = {}
+    _lock = threading.Lock()
+
+    @classmethod
+    def _store(cls, templates: Iterable[NotificationTemplate]) -> dict[uuid.UUID, CachedTemplate]:
+        """Caches the given templates, replacing other versions of them."""
+        stored = {}
+        with cls._lock:
+            for template in templates:
+                cached = CachedTemplate(
+                    id=template.id,
+                    name=template.name,
+                    version=template.version,
+                    title=template.title,
+                    body=template.body,
+                )
+                for key in [key for key in cls._by_key if key[0] == cached.id]:
+                    del cls._by_key[key]
+                cls._by_key[cached.id, cached.version] = cached
+                stored[cached.id] = cached
+        return stored
+
+    @classmethod
+    def get_many(
+        cls, session: Session, keys: Iterable[TemplateKey]
+    ) -> dict[TemplateKey, CachedTemplate]:
+        """Returns the templates of the given (id, version) keys, loading missing ones in one
+        query.
+
+        Versions which are not cached, including a version of None, are answered with the
+        current version of the template.
+        """
+        found, missing = {}, set()
+        for key in set(keys):
+            cached = cls._by_key.get(key) if key[1] is not None else None
+            if cached is not None:
+                found[key] = cached
+            else:
+                missing.add(key)
+        if missing:
+            statement = select(NotificationTemplate).where(
+                NotificationTemplate.id.in_({template_id for template_id, _ in missing})
+            )
+            current = cls._store(session.scalars(statement).all())
+            found.update((key, current[key[0]]) for key in missing if key[0] in current)
+        return found
+
+    @classmethod
+    def get_by_name(cls, session: Session, name: str) -> CachedTemplate:
+        """Returns the current version of the template with the given name.
+
+        Only the id and version are read, the rest comes from the cache.
+
+        Raises:
+            LookupError: If there is no template with such name.
+        """
+        statement = select(NotificationTemplate.id, NotificationTemplate.version).where(
+            NotificationTemplate.name == name
+        )
+        key = session.execute(statement).tuples().one_or_none()
+        templates = cls.get_many(session, [key]) if key is not None else {}
+        if key not in templates:
+            raise LookupError(f"Notification template {name!r} does not exist")
+        return templates[key]
@@ -0,0 +1,56 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+from app.core import settings
+from app.core.metrics import ACCESS_TOKEN_CACHE_LOOKUPS
+from app.schemas import TokenPayload
+
+
+class TokenCache:
+    """Per-process LRU of verified access tokens and their payloads.
+
+    Entries are keyed by the SHA-256 digest of the token, so tokens themselves are not
+    kept in memory, and are served until the exp claim of the token passes. Holds up to
+    ACCESS_TOKEN_CACHE_SIZE tokens, a size of 0 disables the cache.
+    """
+
+    _entries: OrderedDict[bytes, TokenPayload] = OrderedDict()
+    _lock = threading.Lock()
+
+    @staticmethod
+    def _get_key(token: str) -> bytes:
+        return hashlib.sha256(token.encode()).digest()
+
+    @classmethod
+    def get(cls, token: str) -> TokenPayload | None:
+        """Returns the payload of a previously verified token, unless it has expired."""
+        key = cls._get_key(token)
+        with cls._lock:
+            payload = cls._entries.get(key)
+            if payload is not None:
+                if payload.exp > time.time():
+                    cls._entries.move_to_end(key)
+                    ACCESS_TOKEN_CACHE_LOOKUPS.labels("hit").inc()
+                    return payload
+                del cls._entries[key]
+        ACCESS_TOKEN_CACHE_LOOKUPS.labels("miss").inc()
+        return None
+
+    @classmethod
+    def set(cls, token: str, payload: TokenPayload) -> None:
+        """Remembers the payload of a token whose signature and claims were verified."""
+        if settings.ACCESS_TOKEN_CACHE_SIZE <= 0:
+            return
+        key = cls._get_key(token)
+        with cls._lock:
+            cls._entries[key] = payload
+            cls._entries.move_to_end(key)
+            while len(cls._entries) > settings.ACCESS_TOKEN_CACHE_SIZE:
+                cls._entries.popitem(last=False)
+
+    @classmethod
+    def clear(cls) -> None:
+        with cls._lock:
+            cls._entries.clear()
@@ -0,0 +1,93 @@
+import logging
+import time
+import uuid
+from collections import OrderedDict
+
+import redis
+import redis.asyncio as aioredis
+
+from app.core import settings
+from app.schemas import UserRead
+
+logger = logging.getLogger(__name__)
+
+USER_KEY_PREFIX = "user:"
+
+
+class UserCache:
+    """Two-tier cache of authenticated users, keyed by their ID, the sub claim of tokens.
+
+    The first tier is a per-process LRU holding up to USER_CACHE_MAX_SIZE users for
+    USER_CACHE_TTL_SECONDS. The optional second tier is Redis, shared by all processes
+    and enabled by setting USER_CACHE_REDIS_TTL_SECONDS. Invalidation clears the local
+    entry and the Redis one, other processes may keep serving their local copy until it
+    expires. Redis failures are logged and treated as misses.
+    """
+
+    _entries: OrderedDict[uuid.UUID, tuple[float, UserRead]] = OrderedDict()
+    _async_client: aioredis.Redis | None = None
+
+    @classmethod
+    def _get_async_client(cls) -> aioredis.Redis:
+        if cls._async_client is None:
+            cls._async_client = aioredis.Redis.from_url(settings.REDIS_URL, decode_responses=True)
+        return cls._async_client
+
+    @staticmethod
+    def _uses_redis() -> bool:
+        return settings.USER_CACHE_REDIS_TTL_SECONDS is not None
+
+    @classmethod
+    def _store_local(cls, user: UserRead) -> None:
+        cls._entries[user.id] = (time.monotonic() + settings.USER_CACHE_TTL_SECONDS, user)
+        cls._entries.move_to_end(user.id)
+        while len(cls._entries) > settings.USER_CACHE_MAX_SIZE:
+            cls._entries.popitem(last=False)
+
+    @classmethod
+    async def get(cls, user_id: uuid.UUID) -> UserRead | None:
+        """Returns the cached user, or None if neither tier holds a fresh copy."""
+        entry = cls._entries.get(user_id)
+        if entry is not None:
+            expires_at, user = entry
+            if expires_at > time.monotonic():
+                cls._entries.move_to_end(user_id)
+                return user
+            del cls._entries[user_id]
+
+        if not cls._uses_redis():
+            return None
+        try:
+            cached = await cls._get_async_client().get(f"{USER_KEY_PREFIX}{user_id}")
+        except redis.RedisError:
+            logger.warning("Failed to read user %s from Redis", user_id, exc_info=True)
+            return None
+        if cached is None:
+            return None
+        user = UserRead.model_validate_json(cached)
+        cls._store_local(user)
+        return user
+
+    @classmethod
+    async def set(cls, user: UserRead) -> None:
+        cls._store_local(user)
+        if not cls._uses_redis():
+            return
+        try:
+            await cls._get_async_client().set(
+                f"{USER_KEY_PREFIX}{user.id}",
+                user.model_dump_json(),
+                ex=settings.USER_CACHE_REDIS_TTL_SECONDS,
+            )
+        except redis.RedisError:
+            logger.warning("Failed to write user %s to Redis", user.id, exc_info=True)
+
+    @classmethod
+    async def invalidate(cls, user_id: uuid.UUID) -> None:
+        cls._entries.pop(user_id, None)
+        if not cls._uses_redis():
+            return
+        try:
+            await cls._get_async_client().delete(f"{USER_KEY_PREFIX}{user_id}")
+        except redis.RedisError:
+            logger.error("Failed to invalidate user %s in Redis", user_id, exc_info=True)
@@ -0,0 +1,141 @@
+import logging
+import threading
+import uuid
+from datetime import datetime
+from typing import Any, Iterable
+
+from sqlalchemy import DateTime, String, column, update, values
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from app.core import settings
+from app.core.metrics import DELIVERY_STATUS_FLUSH_SECONDS
+from app.database import get_sync_db_context
+from app.database.models import NotificationDelivery
+
+logger = logging.getLogger(__name__)
+
+
+def get_scheduled_for_bounds(
+    scheduled_fors: Iterable[datetime | None],
+) -> tuple[datetime, datetime] | None:
+    """Returns the earliest and latest of the given scheduled times.
+
+    Deliveries are partitioned by scheduled_for, a range condition on it lets postgres
+    skip all other partitions while planning. None is returned if any of the times is
+    unknown, which is the case for tasks enqueued by the previous release.
+    """
+    scheduled_fors = list(scheduled_fors)
+    if not scheduled_fors or None in scheduled_fors:
+        return None
+    return min(scheduled_fors), max(scheduled_fors)
+
+
+def update_delivery_statuses(session: Session, statuses: list[dict[str, Any]]) -> None:
+    """Marks multiple deliveries as processed with a single UPDATE ... FROM (VALUES ...).
+
+    Each item must contain the delivery "id", "scheduled_for", "status", "processed_at"
+    and "provider_message_id" keys. Already processed deliveries are left untouched,
+    which makes repeating the same update harmless.
+    """
+    if not statuses:
+        return
+    rows = values(
+        column("id", UUID(as_uuid=True)),
+        column("scheduled_for", DateTime(timezone=True)),
+        column("status", String),
+        column("processed_at", DateTime(timezone=True)),
+        column("provider_message_id", String),
+        name="statuses",
+    ).data(
+        [
+            (
+                item["id"],
+                item["scheduled_for"],
+                item["status"],
+                item["processed_at"],
+                item["provider_message_id"],
+            )
+            for item in statuses
+        ]
+    )
+    statement = (
+        update(NotificationDelivery)
+        .where(NotificationDelivery.id == rows.c.id)
+        .where(NotificationDelivery.processed_at.is_(None))
+        .values(
+            status=rows.c.status,
+            processed_at=rows.c.processed_at,
+            provider_message_id=rows.c.provider_message_id,
+        )
+        .execution_options(synchronize_session=False)
+    )
+    bounds = get_scheduled_for_bounds(item["scheduled_for"] for item in statuses)
+    if bounds is not None:
+        statement = statement.where(
+            NotificationDelivery.scheduled_for == rows.c.scheduled_for,
+            NotificationDelivery.scheduled_for.between(*bounds),
+        )
+    session.execute(statement)
+
+
+class DeliveryStatusBuffer:
+    """Accumulates delivery status transitions of a worker process and writes them in bulk.
+
+    Buffered transitions of all tasks run by the process are flushed once max_items of
+    them are pending, once the oldest one waited for max_wait_ms and when the worker
+    process shuts down. Transitions which failed to be written are kept and retried by the
+    timer, deliveries left pending by a killed worker are failed by
+    expire_stale_deliveries.
+    """
+
+    def __init__(self, max_items: int, max_wait_ms: int) -> None:
+        self.max_items = max_items
+        self.max_wait_ms = max_wait_ms
+        self._lock = threading.Lock()
+        self._pending: dict[uuid.UUID, dict[str, Any]] = {}
+        self._timer: threading.Timer | None = None
+
+    def add_many(self, statuses: list[dict[str, Any]]) -> None:
+        with self._lock:
+            for item in statuses:
+                self._pending[item["id"]] = item
+            should_flush = len(self._pending) >= self.max_items
+            if not should_flush:
+                self._schedule_flush()
+        if should_flush:
+            self.flush()
+
+    def _schedule_flush(self) -> None:
+        """Starts the flush timer unless it is already running. Requires the lock."""
+        if self._timer is None:
+            self._timer = threading.Timer(self.max_wait_ms / 1000, self.flush)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def flush(self) -> None:
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            statuses = list(self._pending.values())
+            self._pending.clear()
+        if not statuses:
+            return
+
+        try:
+            with DELIVERY_STATUS_FLUSH_SECONDS.time(), get_sync_db_context() as session:
+                update_delivery_statuses(session, statuses)
+        except SQLAlchemyError:
+            logger.error("Failed to flush %d delivery statuses", len(statuses), exc_info=True)
+            with self._lock:
+                for item in statuses:
+                    self._pending.setdefault(item["id"], item)
+                self._schedule_flush()
+
+
+delivery_status_buffer = DeliveryStatusBuffer(
+    max_items=settings.DELIVERY_STATUS_FLUSH_SIZE,
+    max_wait_ms=settings.DELIVERY_STATUS_FLUSH_INTERVAL_MS,
+)
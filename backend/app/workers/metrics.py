@@ -0,0 +1,34 @@
+import os
+from typing import Iterable
+
+from prometheus_client import multiprocess, start_http_server
+from prometheus_client.core import GaugeMetricFamily
+from prometheus_client.registry import Collector
+
+from app.core.celery import get_queue_depth, get_queue_names
+from app.core.metrics import get_registry
+
+
+class QueueDepthCollector(Collector):
+    """Reports the number of tasks waiting in every Celery queue at scrape time."""
+
+    def collect(self) -> Iterable[GaugeMetricFamily]:
+        gauge = GaugeMetricFamily(
+            "celery_queue_depth", "Number of tasks waiting in a Celery queue.", labels=["queue"]
+        )
+        for queue in get_queue_names():
+            gauge.add_metric([queue], get_queue_depth(queue))
+        yield gauge
+
+
+def start_metrics_server(port: int) -> None:
+    """Exposes metrics of this process, and its children in multiprocess mode, over HTTP."""
+    registry = get_registry()
+    registry.register(QueueDepthCollector())
+    start_http_server(port, registry=registry)
+
+
+def release_process_metrics(pid: int) -> None:
+    """Drops live gauges of an exited process, its counters and histograms are kept."""
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        multiprocess.mark_process_dead(pid)
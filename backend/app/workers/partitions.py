@@ -0,0 +1,133 @@
+import logging
+import re
+from datetime import date, datetime, time, timezone
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.database.models import NotificationDelivery, NotificationDeliveryDailyStats
+
+logger = logging.getLogger(__name__)
+
+DELIVERY_TABLE = NotificationDelivery.__tablename__
+# Catches deliveries scheduled for months without a partition of their own, so that
+# inserts keep working if partition maintenance falls behind.
+DEFAULT_PARTITION = f"{DELIVERY_TABLE}_default"
+DAILY_STATS_TABLE = NotificationDeliveryDailyStats.__tablename__
+_PARTITION_NAME_RE = re.compile(rf"^{DELIVERY_TABLE}_y(\d{{4}})m(\d{{2}})$")
+
+
+def add_months(month: date, months: int) -> date:
+    """Returns the first day of the month the given number of months away."""
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def get_partition_name(month: date) -> str:
+    return f"{DELIVERY_TABLE}_y{month.year:04d}m{month.month:02d}"
+
+
+def get_delivery_partitions(session: Session) -> dict[date, str]:
+    """Returns the existing monthly partitions of notification_delivery by their month."""
+    statement = text(
+        "SELECT child.relname FROM pg_inherits "
+        "JOIN pg_class parent ON parent.oid = pg_inherits.inhparent "
+        "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+        "WHERE parent.relname = :table"
+    )
+    partitions = {}
+    for name in session.scalars(statement, {"table": DELIVERY_TABLE}):
+        match = _PARTITION_NAME_RE.match(name)
+        if match:
+            partitions[date(int(match[1]), int(match[2]), 1)] = name
+    return partitions
+
+
+def get_default_partition_months(session: Session) -> set[date]:
+    """Returns the months of deliveries which ended up in the default partition."""
+    statement = text(
+        "SELECT DISTINCT (date_trunc('month', scheduled_for AT TIME ZONE 'UTC'))::date "
+        f'FROM "{DEFAULT_PARTITION}"'
+    )
+    return set(session.scalars(statement))
+
+
+def create_delivery_partition(session: Session, month: date) -> None:
+    """Creates the partition of the given month, taking over its rows from the default one.
+
+    The partition is created as a standalone table and attached afterwards, which does not
+    block reads and writes of other partitions. Attaching fails while the default partition
+    holds rows of the month, so these are moved over first.
+    """
+    name = get_partition_name(month)
+    start = datetime.combine(month, time(), timezone.utc)
+    end = datetime.combine(add_months(month, 1), time(), timezone.utc)
+    session.execute(
+        text(
+            f'CREATE TABLE "{name}" '
+            f'(LIKE "{DELIVERY_TABLE}" INCLUDING DEFAULTS INCLUDING CONSTRAINTS)'
+        )
+    )
+    moved = session.execute(
+        text(
+            f'WITH moved AS (DELETE FROM "{DEFAULT_PARTITION}" '
+            "WHERE scheduled_for >= :start AND scheduled_for < :end RETURNING *) "
+            f'INSERT INTO "{name}" SELECT * FROM moved'
+        ),
+        {"start": start, "end": end},
+    ).rowcount
+    # Partition bounds cannot be bound parameters, they are built from dates only.
+    session.execute(
+        text(
+            f'ALTER TABLE "{DELIVERY_TABLE}" ATTACH PARTITION "{name}" '
+            f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+        )
+    )
+    if moved:
+        logger.warning(
+            "Created partition %s, moved %d deliveries out of %s", name, moved, DEFAULT_PARTITION
+        )
+    else:
+        logger.info("Created partition %s", name)
+
+
+def create_delivery_partitions(session: Session, first_month: date, months: int) -> None:
+    """Makes sure partitions exist for the given month and the following ones.
+
+    Months of deliveries found in the default partition get their partitions as well, so
+    that they are retired together with the rest.
+    """
+    existing = get_delivery_partitions(session)
+    upcoming = {add_months(first_month, offset) for offset in range(months + 1)}
+    for month in sorted(upcoming | get_default_partition_months(session)):
+        if month not in existing:
+            create_delivery_partition(session, month)
+
+
+def retire_delivery_partitions(session: Session, keep_from: date) -> None:
+    """Rolls partitions of months before keep_from up into daily statistics and drops them.
+
+    Coalesced deliveries are counted once for every rule they were sent for. Rolling up
+    and dropping happen in the same transaction, so a partition is never counted twice.
+    """
+    for month, name in sorted(get_delivery_partitions(session).items()):
+        if month >= keep_from:
+            continue
+        session.execute(
+            text(
+                f'INSERT INTO "{DAILY_STATS_TABLE}" (id, day, notification_rule_id, status, count) '
+                "SELECT gen_random_uuid(), stats.* FROM ("
+                "SELECT (delivery.scheduled_for AT TIME ZONE 'UTC')::date AS day, rule_id, "
+                "delivery.status, count(*) "
+                f'FROM "{name}" AS delivery '
+                "CROSS JOIN LATERAL unnest(coalesce("
+                "delivery.notification_rule_ids, ARRAY[delivery.notification_rule_id]"
+                ")) AS rule_id "
+                "GROUP BY 1, 2, 3"
+                ") AS stats "
+                "ON CONFLICT (day, notification_rule_id, status) "
+                f'DO UPDATE SET count = "{DAILY_STATS_TABLE}".count + excluded.count'
+            )
+        )
+        session.execute(text(f'DROP TABLE "{name}"'))
+        logger.info("Rolled up and dropped partition %s", name)
@@ -0,0 +1,40 @@
+import logging
+import time
+from datetime import datetime, timezone
+
+from app.core import settings
+from app.services import RedisScheduleIndex
+from app.workers.metrics import start_metrics_server
+from app.workers.tasks import (
+    DUE_NOTIFICATIONS_BATCH_SIZE,
+    dispatch_scheduled_rules,
+    get_claim_cutoff,
+    reconcile_notification_schedule,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def run() -> None:
+    """Consumes due notification rules from the Redis schedule index until interrupted.
+
+    Used when NOTIFICATION_SCHEDULER_ENGINE is set to "redis", in place of the
+    dispatch_due_notifications task fired by beat every minute.
+    """
+    reconcile_notification_schedule()
+    logger.info("Notification scheduler started")
+    while True:
+        now = get_claim_cutoff(datetime.now(timezone.utc))
+        rule_ids = RedisScheduleIndex.pop_due(now, DUE_NOTIFICATIONS_BATCH_SIZE)
+        if rule_ids:
+            logger.info("Dispatching %d due notification rules", len(rule_ids))
+            dispatch_scheduled_rules(rule_ids, now)
+        if len(rule_ids) < DUE_NOTIFICATIONS_BATCH_SIZE:
+            time.sleep(settings.NOTIFICATION_SCHEDULER_POLL_SECONDS)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    if settings.WORKER_METRICS_PORT is not None:
+        start_metrics_server(settings.WORKER_METRICS_PORT)
+    run()
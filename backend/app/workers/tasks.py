@@ -1,156 +1,579 @@
+import logging
+import time
 import uuid
 from collections import defaultdict
-from datetime import datetime, timezone
-from typing import Any, override
+from datetime import datetime, timedelta, timezone
+from typing import Any, Sequence
 
 from celery import Task
+from celery.signals import worker_init, worker_process_shutdown, worker_shutdown
 from firebase_admin.exceptions import FirebaseError
-from sqlalchemy import select
+from sqlalchemy import delete, func, insert, or_, select, update
 from sqlalchemy.orm import Session
 
-from app.core import celery
-from app.database import get_sync_db_context
+from app.core import celery, settings
+from app.core.celery import get_queue_depth
+from app.core.metrics import (
+    DISPATCH_BATCH_RULES,
+    DISPATCH_LAG_SECONDS,
+    DISPATCH_TICK_DELIVERIES,
+    SCHEDULE_PLANNING_SECONDS,
+)
+from app.database import get_sync_db_context, try_advisory_lock
 from app.database.models import (
+    NotificationCampaign,
     NotificationDelivery,
     NotificationRule,
     NotificationStatus,
+    User,
     UserDevice,
 )
-from app.schemas import NotificationTask
-from app.services import FCMService, NotificationScheduler
+from app.schemas import BroadcastProgress, NotificationTask
+from app.services import (
+    FCM_BATCH_SIZE,
+    PERMANENT_TOPIC_ERRORS,
+    ROUTINE_REMINDER_TEMPLATE,
+    CachedTemplate,
+    CampaignSegments,
+    FCMService,
+    NotificationScheduler,
+    NotificationTemplateRegistry,
+    RedisScheduleIndex,
+)
+from app.workers.buffer import delivery_status_buffer, get_scheduled_for_bounds
+from app.workers.metrics import release_process_metrics, start_metrics_server
+from app.workers.partitions import (
+    add_months,
+    create_delivery_partitions,
+    retire_delivery_partitions,
+)
+
+logger = logging.getLogger(__name__)
 
 DUE_NOTIFICATIONS_BATCH_SIZE = 1000
+DEVICE_PRUNE_BATCH_SIZE = 1000
+NOTIFICATIONS_QUEUE = "notifications"
+# Advisory lock keys of dispatch_due_notifications slots start at this value.
+DISPATCH_LOCK_KEY = 0x6E6F7469
 
 
 def prepare_notification_tasks_for_rules(
-    session: Session, rules: list[NotificationRule], devices_by_user: dict[str, list[str]]
+    session: Session,
+    rules: list[NotificationRule],
+    devices_by_user: dict[str, list[str]],
+    variables_by_user: dict[str, dict[str, str]],
 ) -> list[NotificationTask]:
-    tasks = []
-    for rule in rules:
-        fcm_tokens = devices_by_user.get(str(rule.user_id), [])
-        rule.next_run = NotificationScheduler.plan_next_run(rule, last_run=rule.next_run)  # type: ignore
+    """Advances the schedule of due rules and creates their deliveries.
+
+    Rules of the same user due within the same minute are coalesced, so that every device
+    receives a single notification referencing all of them. Deliveries only reference the
+    reminder template and the user's variables, the content is rendered when sent. They
+    are written for the whole batch with a single multi-row INSERT ... RETURNING
+    statement, so the number of round trips does not grow with the number of devices.
+    """
+    now = datetime.now(timezone.utc)
+    template = NotificationTemplateRegistry.get_by_name(session, ROUTINE_REMINDER_TEMPLATE)
+    slots: dict[tuple[uuid.UUID, datetime], list[uuid.UUID]] = defaultdict(list)
+    with SCHEDULE_PLANNING_SECONDS.time():
+        next_runs = NotificationScheduler.plan_next_runs(
+            rules, [rule.next_run for rule in rules], now=now
+        )
+    for rule, next_run in zip(rules, next_runs, strict=True):
+        slots[rule.user_id, rule.next_run.replace(second=0, microsecond=0)].append(rule.id)
+        rule.next_run = next_run
         if rule.next_run is None:
             rule.enabled = False
 
-        for fcm_token in fcm_tokens:
-            payload = {
-                "title": "Time for your routine!",
-                "body": "Your scheduled skin care treatment is due soon. Let's get that glow!",
-            }
-            delivery = NotificationDelivery(
-                notification_rule_id=rule.id,
-                status=NotificationStatus.PENDING,
-                scheduled_for=datetime.now(timezone.utc),
-                payload=payload,
+    deliveries: list[dict[str, Any]] = []
+    recipients: list[tuple[str, dict[str, str]]] = []
+    for (user_id, _), rule_ids in slots.items():
+        variables = variables_by_user.get(str(user_id), {})
+        for fcm_token in devices_by_user.get(str(user_id), []):
+            deliveries.append(
+                {
+                    "notification_rule_id": rule_ids[0],
+                    "notification_rule_ids": rule_ids,
+                    "status": NotificationStatus.PENDING,
+                    "scheduled_for": now,
+                    "template_id": template.id,
+                    "variables": variables,
+                }
             )
-            session.add(delivery)
-            session.flush()
-            session.refresh(delivery)
-
-            tasks.append(
-                NotificationTask(
-                    delivery_id=delivery.id,
-                    user_fcm_token=fcm_token,
-                    title=payload["title"],
-                    body=payload["body"],
-                )
-            )
-    return tasks
+            recipients.append((fcm_token, variables))
+
+    if not deliveries:
+        return []
+    statement = insert(NotificationDelivery).returning(
+        NotificationDelivery.id, sort_by_parameter_order=True
+    )
+    delivery_ids = session.scalars(statement, deliveries).all()
+    return [
+        NotificationTask(
+            delivery_id=delivery_id,
+            user_fcm_token=fcm_token,
+            template_id=template.id,
+            template_version=template.version,
+            variables=variables,
+            scheduled_for=now,
+        )
+        for delivery_id, (fcm_token, variables) in zip(delivery_ids, recipients, strict=True)
+    ]
 
 
-def process_due_notifications_batch(
-    session: Session, rule_ids: list[uuid.UUID]
-) -> list[NotificationTask]:
-    statement = select(NotificationRule).where(NotificationRule.id.in_(rule_ids)).with_for_update()
+def claim_due_notification_rules(
+    session: Session,
+    now: datetime,
+    limit: int = DUE_NOTIFICATIONS_BATCH_SIZE,
+    rule_ids: list[uuid.UUID] | None = None,
+) -> list[NotificationRule]:
+    """Locks a bounded chunk of due rules for the duration of the current transaction.
+
+    Rows already locked by other workers are skipped, so concurrent dispatchers always
+    claim disjoint sets of rules. Claiming can be narrowed down to the given rule ids.
+    """
+    statement = (
+        select(NotificationRule)
+        .where(NotificationRule.enabled)
+        .where(NotificationRule.next_run <= now)
+        .order_by(NotificationRule.next_run)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+    )
+    if rule_ids is not None:
+        statement = statement.where(NotificationRule.id.in_(rule_ids))
     rules = session.execute(statement).scalars().all()
+    if rules:
+        claimed_at = datetime.now(timezone.utc)
+        DISPATCH_BATCH_RULES.observe(len(rules))
+        for rule in rules:
+            DISPATCH_LAG_SECONDS.observe((claimed_at - rule.next_run).total_seconds())
+    return list(rules)
+
+
+def get_claim_cutoff(now: datetime) -> datetime:
+    """Returns the latest next run of rules which should be claimed at the given time.
+
+    Rules are due NOTIFICATION_OFFSET_MINUTES ahead of their time of day. While the
+    notifications queue is backlogged, only rules which would otherwise miss their time of
+    day by the next dispatcher tick are claimed and the rest is left for later, which
+    spreads a burst of sends over the offset window.
+    """
+    if get_queue_depth(NOTIFICATIONS_QUEUE) <= settings.NOTIFICATION_QUEUE_MAX_DEPTH:
+        return now
+    return min(now, now - timedelta(minutes=settings.NOTIFICATION_OFFSET_MINUTES - 1))
+
 
+def process_due_notifications_batch(
+    session: Session, rules: list[NotificationRule]
+) -> list[NotificationTask]:
     user_ids = {rule.user_id for rule in rules}
     devices_by_user = defaultdict(list)
+    variables_by_user = {}
     devices = (
-        session.query(UserDevice.user_id, UserDevice.fcm_token)
+        session.query(UserDevice.user_id, UserDevice.fcm_token, User.name)
+        .join(User, User.id == UserDevice.user_id)
         .filter(UserDevice.user_id.in_(user_ids))
         .all()
     )
-    for user_id, fcm_token in devices:
+    for user_id, fcm_token, name in devices:
         devices_by_user[str(user_id)].append(fcm_token)
+        variables_by_user[str(user_id)] = {"name": name}
+
+    return prepare_notification_tasks_for_rules(session, rules, devices_by_user, variables_by_user)
 
-    return prepare_notification_tasks_for_rules(session, list(rules), devices_by_user)
+
+def enqueue_notification_tasks(tasks: list[NotificationTask]) -> None:
+    for idx in range(0, len(tasks), FCM_BATCH_SIZE):
+        chunk = tasks[idx : idx + FCM_BATCH_SIZE]
+        send_fcm_notification_batch.delay([task.to_compact() for task in chunk])
+
+
+def dispatch_scheduled_rules(rule_ids: list[uuid.UUID], now: datetime) -> None:
+    """Dispatches rules taken out of the Redis schedule index.
+
+    Postgres decides whether a rule is really due. Every rule which still exists is put
+    back into the index with its current schedule, whether it was claimed or not.
+    """
+    with get_sync_db_context() as session:
+        rules = claim_due_notification_rules(session, now, len(rule_ids), rule_ids)
+        tasks_to_dispatch = process_due_notifications_batch(session, rules) if rules else []
+
+    unclaimed_ids = set(rule_ids) - {rule.id for rule in rules}
+    unclaimed = []
+    if unclaimed_ids:
+        with get_sync_db_context() as session:
+            statement = select(NotificationRule).where(NotificationRule.id.in_(unclaimed_ids))
+            unclaimed = list(session.execute(statement).scalars().all())
+    RedisScheduleIndex.sync_rules([*rules, *unclaimed])
+    enqueue_notification_tasks(tasks_to_dispatch)
+    DISPATCH_TICK_DELIVERIES.observe(len(tasks_to_dispatch))
+
+
+def prune_device_tokens(session: Session, fcm_tokens: list[str]) -> None:
+    """Removes devices whose registration tokens were permanently rejected by FCM."""
+    for idx in range(0, len(fcm_tokens), DEVICE_PRUNE_BATCH_SIZE):
+        chunk = fcm_tokens[idx : idx + DEVICE_PRUNE_BATCH_SIZE]
+        session.execute(delete(UserDevice).where(UserDevice.fcm_token.in_(chunk)))
+    logger.info("Pruned %d devices with dead FCM tokens", len(fcm_tokens))
 
 
 @celery.task(name="dispatch_due_notifications")
 def dispatch_due_notifications() -> None:
-    with get_sync_db_context() as session:
+    """Drains due notification rules chunk by chunk.
+
+    Each chunk is claimed, rescheduled and turned into deliveries within a single
+    transaction. Runs exceeding NOTIFICATION_DISPATCH_SLOTS are skipped instead of competing
+    for the same rules and a run gives up after NOTIFICATION_DISPATCH_MAX_SECONDS. Claiming
+    moves next_run forward, so the next run resumes from the rules left due, whenever they
+    were created or re-enabled. The notifications queue depth is checked before each chunk
+    to apply backpressure.
+    """
+    keys = [DISPATCH_LOCK_KEY + slot for slot in range(settings.NOTIFICATION_DISPATCH_SLOTS)]
+    with try_advisory_lock(*keys) as key:
+        if key is None:
+            logger.info("All dispatch slots are taken, skipping the run")
+            return
+
+        started = time.monotonic()
         now = datetime.now(timezone.utc)
+        deliveries = 0
+        while time.monotonic() - started < settings.NOTIFICATION_DISPATCH_MAX_SECONDS:
+            cutoff = get_claim_cutoff(now)
+            with get_sync_db_context() as session:
+                rules = claim_due_notification_rules(session, cutoff)
+                if not rules:
+                    break
+                tasks_to_dispatch = process_due_notifications_batch(session, rules)
+            enqueue_notification_tasks(tasks_to_dispatch)
+            deliveries += len(tasks_to_dispatch)
+        else:
+            logger.warning("Dispatch run exceeded its time budget, leaving the rest for later")
+        DISPATCH_TICK_DELIVERIES.observe(deliveries)
+
+
+@celery.task(name="reconcile_notification_schedule")
+def reconcile_notification_schedule() -> None:
+    """Rebuilds the Redis schedule index from the rules stored in postgres."""
+    with get_sync_db_context() as session:
         statement = (
-            select(NotificationRule.id)
+            select(NotificationRule.id, NotificationRule.next_run)
             .where(NotificationRule.enabled)
-            .where(NotificationRule.next_run <= now)
-            .with_for_update()
+            .where(NotificationRule.next_run.is_not(None))
         )
-        rules_ids = session.execute(statement).scalars().all()
+        schedule = dict(session.execute(statement).tuples().all())
+    RedisScheduleIndex.replace_all(schedule)
 
-    for idx in range(0, len(rules_ids), DUE_NOTIFICATIONS_BATCH_SIZE):
-        batch_rule_ids = rules_ids[idx : idx + DUE_NOTIFICATIONS_BATCH_SIZE]
-        with get_sync_db_context() as session:
-            tasks_to_dispatch = process_due_notifications_batch(session, batch_rule_ids)
 
-        for task in tasks_to_dispatch:
-            send_fcm_notification.delay(task.model_dump())
+@celery.task(name="maintain_notification_delivery_partitions")
+def maintain_notification_delivery_partitions() -> None:
+    """Creates upcoming monthly partitions of deliveries and retires the expired ones."""
+    current_month = datetime.now(timezone.utc).date().replace(day=1)
+    with get_sync_db_context() as session:
+        create_delivery_partitions(
+            session, current_month, settings.NOTIFICATION_DELIVERY_PARTITIONS_AHEAD
+        )
+        retire_delivery_partitions(
+            session, add_months(current_month, -settings.NOTIFICATION_DELIVERY_RETENTION_MONTHS)
+        )
 
 
-class NotificationDBTask(Task):
-    @override
-    def on_success(self, retval: Any, task_id: str, args: tuple, kwargs: dict[str, Any]) -> None:
-        data = args[0] if args else kwargs.get("data", {})
-        if data:
-            task = NotificationTask(**data)
-            self._update_delivery_status(
-                delivery_id=task.delivery_id, status=NotificationStatus.SENT
-            )
+def render_notification(
+    task: NotificationTask, templates: dict[tuple[uuid.UUID, int | None], CachedTemplate]
+) -> tuple[str, str]:
+    """Returns the title and body of the task, tasks of the previous release carry them."""
+    if task.template_id is None:
+        return task.title, task.body
+    return templates[task.template_id, task.template_version].render(task.variables)
 
-    @override
-    def on_failure(
-        self, exc: Exception, task_id: str, args: tuple, kwargs: dict[str, Any], einfo: Any
-    ) -> None:
-        data = args[0] if args else kwargs.get("data", {})
-        if data:
-            task = NotificationTask(**data)
-            self._update_delivery_status(
-                delivery_id=task.delivery_id, status=NotificationStatus.FAILED
-            )
 
-    @staticmethod
-    def _update_delivery_status(
-        delivery_id: uuid.UUID,
-        status: NotificationStatus,
-        provider_message_id: str | None = None,
-    ) -> None:
-        with get_sync_db_context() as session:
-            delivery = session.get(NotificationDelivery, delivery_id)
-            if delivery and delivery.processed_at is None:
-                delivery.status = status
-                delivery.processed_at = datetime.now(timezone.utc)
-                delivery.provider_message_id = provider_message_id
+@celery.task(name="expire_stale_deliveries")
+def expire_stale_deliveries() -> None:
+    """Fails deliveries still pending NOTIFICATION_DELIVERY_STALE_MINUTES after they were due.
+
+    Their send task was lost, or the worker sending them was killed before it wrote their
+    statuses. Either way the reminders are too late to be sent, a send task redelivered
+    afterwards skips them.
+    """
+    cutoff = datetime.now(timezone.utc) - timedelta(
+        minutes=settings.NOTIFICATION_DELIVERY_STALE_MINUTES
+    )
+    with get_sync_db_context() as session:
+        statement = (
+            update(NotificationDelivery)
+            .where(NotificationDelivery.status == NotificationStatus.PENDING)
+            .where(NotificationDelivery.scheduled_for < cutoff)
+            .where(NotificationDelivery.processed_at.is_(None))
+            .values(status=NotificationStatus.FAILED, processed_at=func.now())
+            .execution_options(synchronize_session=False)
+        )
+        expired = session.execute(statement).rowcount
+    if expired:
+        logger.warning("Failed %d deliveries left pending past their schedule", expired)
 
 
 @celery.task(
-    name="send_fcm_notification",
-    base=NotificationDBTask,
+    bind=True,
+    name="send_fcm_notification_batch",
+    serializer="msgpack",
     max_retries=3,
     default_retry_delay=60,
     autoretry_for=(FirebaseError,),
 )
-def send_fcm_notification(data: dict[str, Any]) -> str | None:
-    task = NotificationTask(**data)
+def send_fcm_notification_batch(self: Task, data: list[Sequence[Any]]) -> None:
+    """Sends a batch of notifications with a single FCM batch request.
+
+    Deliveries which failed to be sent are retried as a smaller batch, until the retries are
+    exhausted and they are marked as failed. Deliveries to dead tokens fail right away and
+    their devices are pruned, messages rejected by FCM fail right away too. Statuses go to
+    the worker's delivery_status_buffer, which writes those of many tasks together.
+    """
+    tasks = [NotificationTask.from_compact(item) for item in data]
     with get_sync_db_context() as session:
-        delivery = session.get(NotificationDelivery, task.delivery_id)
-        if delivery is None:
-            return None
-        if delivery.status == NotificationStatus.SENT:
-            return delivery.provider_message_id
-
-        return FCMService.send_message(
-            token=task.user_fcm_token,
-            title=task.title,
-            body=task.body,
+        statement = select(NotificationDelivery.id).where(
+            NotificationDelivery.id.in_([task.delivery_id for task in tasks]),
+            NotificationDelivery.processed_at.is_(None),
+        )
+        bounds = get_scheduled_for_bounds(task.scheduled_for for task in tasks)
+        if bounds is not None:
+            statement = statement.where(NotificationDelivery.scheduled_for.between(*bounds))
+        pending = set(session.scalars(statement).all())
+        tasks = [task for task in tasks if task.delivery_id in pending]
+        templates = NotificationTemplateRegistry.get_many(
+            session,
+            {
+                (task.template_id, task.template_version)
+                for task in tasks
+                if task.template_id is not None
+            },
         )
+    if not tasks:
+        return
+
+    messages = []
+    for task in tasks:
+        title, body = render_notification(task, templates)
+        messages.append(FCMService.build_message(token=task.user_fcm_token, title=title, body=body))
+    results = FCMService.send_batch(messages)
+
+    now = datetime.now(timezone.utc)
+    statuses, failed, dead_tokens = [], [], []
+    for task, result in zip(tasks, results, strict=True):
+        if result.success:
+            statuses.append(
+                {
+                    "id": task.delivery_id,
+                    "scheduled_for": task.scheduled_for,
+                    "status": NotificationStatus.SENT,
+                    "processed_at": now,
+                    "provider_message_id": result.message_id,
+                }
+            )
+        elif result.permanent_failure or result.rejected:
+            statuses.append(
+                {
+                    "id": task.delivery_id,
+                    "scheduled_for": task.scheduled_for,
+                    "status": NotificationStatus.FAILED,
+                    "processed_at": now,
+                    "provider_message_id": None,
+                }
+            )
+            if result.permanent_failure:
+                dead_tokens.append(task.user_fcm_token)
+        else:
+            failed.append((task, result.exception))
+
+    if dead_tokens:
+        with get_sync_db_context() as session:
+            prune_device_tokens(session, dead_tokens)
+
+    if failed and self.request.retries < self.max_retries:
+        delivery_status_buffer.add_many(statuses)
+        raise self.retry(args=([task.to_compact() for task, _ in failed],), exc=failed[0][1])
+
+    statuses.extend(
+        {
+            "id": task.delivery_id,
+            "scheduled_for": task.scheduled_for,
+            "status": NotificationStatus.FAILED,
+            "processed_at": now,
+            "provider_message_id": None,
+        }
+        for task, _ in failed
+    )
+    delivery_status_buffer.add_many(statuses)
+
+
+@celery.task(name="send_fcm_notification")
+def send_fcm_notification(data: dict[str, Any]) -> None:
+    """Sends a notification enqueued by the previous release, one task per delivery.
+
+    Kept for one release, so that tasks left in the queue by the upgrade are still
+    delivered. They are handed over to send_fcm_notification_batch, which skips
+    deliveries already processed. The JSON decoder turns delivery_id back into a UUID,
+    which msgpack cannot encode, so the payload is converted to its compact form first.
+    """
+    send_fcm_notification_batch.delay([NotificationTask.model_validate(data).to_compact()])
+
+
+@celery.task(bind=True, name="broadcast_notification", ignore_result=False)
+def broadcast_notification(self: Task, title: str, body: str) -> dict[str, int]:
+    """Sends a notification to every registered device.
+
+    Tokens are streamed from a server-side cursor and sent in batches of FCM_BATCH_SIZE,
+    so memory use does not depend on the number of devices. Progress is published as the
+    meta of the PROGRESS state after every batch. Devices with dead tokens are pruned.
+    """
+    progress = BroadcastProgress()
+    dead_tokens = []
+    with get_sync_db_context() as session:
+        statement = select(UserDevice.fcm_token).execution_options(yield_per=FCM_BATCH_SIZE)
+        for fcm_tokens in session.scalars(statement).partitions():
+            messages = [
+                FCMService.build_message(token=fcm_token, title=title, body=body)
+                for fcm_token in fcm_tokens
+            ]
+            progress.processed += len(fcm_tokens)
+            try:
+                results = FCMService.send_batch(messages)
+            except FirebaseError:
+                progress.failed += len(fcm_tokens)
+            else:
+                for fcm_token, result in zip(fcm_tokens, results, strict=True):
+                    if result.success:
+                        progress.sent += 1
+                    elif result.permanent_failure:
+                        progress.invalid += 1
+                        dead_tokens.append(fcm_token)
+                    else:
+                        progress.failed += 1
+            self.update_state(state="PROGRESS", meta=progress.model_dump())
+
+        if dead_tokens:
+            prune_device_tokens(session, dead_tokens)
+    return progress.model_dump()
+
+
+@celery.task(name="subscribe_device_topics")
+def subscribe_device_topics() -> None:
+    """Subscribes newly registered devices to the FCM topics of their campaign segments.
+
+    Devices are handled in chunks of DEVICE_TOPIC_SYNC_BATCH_SIZE, their tokens grouped by
+    topic, so that a single topic management request covers up to FCM_TOPIC_BATCH_SIZE
+    devices. Devices failing for a transient reason are left to the next run.
+    """
+    while True:
+        with get_sync_db_context() as session:
+            statement = (
+                select(UserDevice.id, UserDevice.fcm_token, UserDevice.attributes)
+                .where(UserDevice.topics.is_(None))
+                .order_by(UserDevice.registered_at)
+                .limit(settings.DEVICE_TOPIC_SYNC_BATCH_SIZE)
+                .with_for_update(skip_locked=True)
+            )
+            devices = session.execute(statement).all()
+            if not devices:
+                return
+
+            segments_by_id = {}
+            tokens_by_topic = defaultdict(list)
+            for device in devices:
+                segments_by_id[device.id] = CampaignSegments.get_device_segments(device.attributes)
+                for segment in segments_by_id[device.id]:
+                    tokens_by_topic[segment].append(device.fcm_token)
+
+            failures = {}
+            for topic, fcm_tokens in tokens_by_topic.items():
+                failures.update(FCMService.subscribe_to_topic(fcm_tokens, topic))
+
+            subscribed = [
+                {"id": device.id, "topics": segments_by_id[device.id]}
+                for device in devices
+                if device.fcm_token not in failures
+            ]
+            if subscribed:
+                session.execute(update(UserDevice), subscribed)
+            dead_tokens = [
+                fcm_token
+                for fcm_token, reason in failures.items()
+                if reason in PERMANENT_TOPIC_ERRORS
+            ]
+            if dead_tokens:
+                prune_device_tokens(session, dead_tokens)
+            logger.info(
+                "Subscribed %d devices to topics, %d failed", len(subscribed), len(failures)
+            )
+        if len(devices) < settings.DEVICE_TOPIC_SYNC_BATCH_SIZE or len(subscribed) == 0:
+            return
+
+
+@celery.task(name="send_campaign")
+def send_campaign(campaign_id: str) -> None:
+    """Sends the campaign as a single FCM condition message and records the outcome.
+
+    The condition matches the union of the campaign's segments, so devices in several of
+    them are notified once. The campaign is marked SENDING and committed before FCM is
+    called, a redelivered task finds it taken and sends nothing. A campaign left SENDING
+    by a worker killed mid-send is not retried, as it may already have been delivered.
+    """
+    campaign_uuid = uuid.UUID(campaign_id)
+    with get_sync_db_context() as session:
+        statement = (
+            update(NotificationCampaign)
+            .where(NotificationCampaign.id == campaign_uuid)
+            .where(NotificationCampaign.status == NotificationStatus.PENDING)
+            .values(status=NotificationStatus.SENDING)
+            .returning(
+                NotificationCampaign.title, NotificationCampaign.body, NotificationCampaign.segments
+            )
+        )
+        campaign = session.execute(statement).one_or_none()
+        if campaign is None:
+            logger.warning("Campaign %s does not exist or was already sent", campaign_id)
+            return
+        statement = select(func.count(UserDevice.id)).where(
+            UserDevice.topics.is_not(None),
+            or_(
+                *(
+                    UserDevice.attributes.contains(CampaignSegments.get_attributes(segment))
+                    for segment in campaign.segments
+                )
+            ),
+        )
+        audience = session.scalar(statement)
+
+    try:
+        message_id = FCMService.send_to_condition(
+            CampaignSegments.get_condition(campaign.segments), campaign.title, campaign.body
+        )
+    except FirebaseError:
+        message_id = None
+
+    with get_sync_db_context() as session:
+        session.execute(
+            update(NotificationCampaign)
+            .where(NotificationCampaign.id == campaign_uuid)
+            .values(
+                status=NotificationStatus.SENT if message_id else NotificationStatus.FAILED,
+                audience=audience,
+                message_id=message_id,
+                sent_at=datetime.now(timezone.utc),
+            )
+        )
+
+
+@worker_process_shutdown.connect
+@worker_shutdown.connect
+def flush_delivery_statuses(**kwargs: Any) -> None:
+    delivery_status_buffer.flush()
+
+
+@worker_init.connect
+def start_worker_metrics_server(**kwargs: Any) -> None:
+    if settings.WORKER_METRICS_PORT is not None:
+        start_metrics_server(settings.WORKER_METRICS_PORT)
+
+
+@worker_process_shutdown.connect
+def release_worker_process_metrics(pid: int, **kwargs: Any) -> None:
+    release_process_metrics(pid)
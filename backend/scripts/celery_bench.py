@@ -0,0 +1,132 @@
+"""Measures what notification send tasks cost in the Redis broker and result backend.
+
+Publishes the same deliveries as send_fcm_notification_batch messages twice into scratch
+queues of the configured broker: once the way they were sent before, as JSON dictionaries
+with a stored result for every task, and once as compact msgpack tuples with results
+ignored. Reports broker and result backend bytes per delivery and the growth of Redis
+used_memory for both, then removes everything it created.
+
+Run it from the backend directory with the usual environment variables set:
+
+    python -m scripts.celery_bench --deliveries 100000
+
+Use a Redis instance nobody else writes to, otherwise the memory figures are meaningless.
+"""
+
+import argparse
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timezone
+
+import redis
+from app.core import celery, settings
+from app.schemas import NotificationTask
+from app.services import FCM_BATCH_SIZE
+from app.workers.tasks import send_fcm_notification_batch
+
+QUEUE_PREFIX = "celery-bench"
+
+
+@dataclass(frozen=True, slots=True)
+class Profile:
+    name: str
+    serializer: str
+    compact: bool
+    store_results: bool
+
+
+PROFILES = (
+    Profile(name="json, results stored", serializer="json", compact=False, store_results=True),
+    Profile(name="msgpack, no results", serializer="msgpack", compact=True, store_results=False),
+)
+
+
+@dataclass(frozen=True, slots=True)
+class Measurement:
+    profile: Profile
+    deliveries: int
+    broker_bytes: int
+    result_bytes: int
+    used_memory: int
+
+
+def build_tasks(count: int) -> list[NotificationTask]:
+    template_id = uuid.uuid4()
+    scheduled_for = datetime.now(timezone.utc)
+    return [
+        NotificationTask(
+            delivery_id=uuid.uuid4(),
+            # Registration tokens issued by FCM are 142 to 163 characters long.
+            user_fcm_token=uuid.uuid4().hex * 5,
+            template_id=template_id,
+            template_version=1,
+            variables={"name": "Alexandra"},
+            scheduled_for=scheduled_for,
+        )
+        for _ in range(count)
+    ]
+
+
+def get_used_memory(client: redis.Redis) -> int:
+    return client.info("memory")["used_memory"]
+
+
+def measure(client: redis.Redis, profile: Profile, tasks: list[NotificationTask]) -> Measurement:
+    queue = f"{QUEUE_PREFIX}-{profile.serializer}"
+    used_memory = get_used_memory(client)
+    task_ids = []
+    with celery.producer_or_acquire() as producer:
+        for idx in range(0, len(tasks), FCM_BATCH_SIZE):
+            chunk = tasks[idx : idx + FCM_BATCH_SIZE]
+            payload = [
+                task.to_compact() if profile.compact else task.model_dump(mode="json")
+                for task in chunk
+            ]
+            result = send_fcm_notification_batch.apply_async(
+                args=(payload,),
+                queue=queue,
+                serializer=profile.serializer,
+                producer=producer,
+                ignore_result=True,
+            )
+            task_ids.append(result.id)
+    if profile.store_results:
+        for task_id in task_ids:
+            celery.backend.store_result(task_id, None, "SUCCESS")
+    used_memory = get_used_memory(client) - used_memory
+
+    broker_bytes = 0
+    for start in range(0, client.llen(queue), 10):
+        broker_bytes += sum(len(message) for message in client.lrange(queue, start, start + 9))
+    client.delete(queue, f"_kombu.binding.{queue}")
+    result_bytes = 0
+    if profile.store_results:
+        keys = [celery.backend.get_key_for_task(task_id) for task_id in task_ids]
+        result_bytes = sum(celery.backend.client.strlen(key) for key in keys)
+        celery.backend.client.delete(*keys)
+    return Measurement(profile, len(tasks), broker_bytes, result_bytes, used_memory)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--deliveries", type=int, default=100_000)
+    args = parser.parse_args()
+
+    if not settings.CELERY_BROKER_URL.startswith("redis"):
+        parser.error("CELERY_BROKER_URL has to point to redis")
+    client = redis.Redis.from_url(settings.CELERY_BROKER_URL)
+    tasks = build_tasks(args.deliveries)
+
+    print(f"{args.deliveries} deliveries in batches of {FCM_BATCH_SIZE}")
+    for profile in PROFILES:
+        result = measure(client, profile, tasks)
+        print(
+            f"{profile.name:<22} "
+            f"broker {result.broker_bytes / result.deliveries:7.1f} B/delivery, "
+            f"results {result.result_bytes / result.deliveries:5.1f} B/delivery, "
+            f"redis used_memory +{result.used_memory / 1024 / 1024:.1f} MiB"
+        )
+
+
+if __name__ == "__main__":
+    main()
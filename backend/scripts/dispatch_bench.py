@@ -0,0 +1,189 @@
+"""Counts database round trips of turning a batch of due rules into deliveries.
+
+Seeds synthetic users, devices and due rules like scripts/loadtest.py, then claims them in
+batches of DUE_NOTIFICATIONS_BATCH_SIZE and creates their deliveries twice: once the way
+it was done before, with an INSERT and a SELECT for every delivery, and once with the
+single multi-row INSERT ... RETURNING of prepare_notification_tasks_for_rules. Both runs
+are rolled back, so they see the same rules. Reports round trips and time per batch, and
+removes the seeded data. Round trips include the UPDATEs of the rescheduled rules, which
+both paths share, statements writing deliveries are also reported on their own.
+
+Run it from the backend directory with the usual environment variables set:
+
+    python -m scripts.dispatch_bench --users 2000 --devices-per-user 3
+"""
+
+import argparse
+import time
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Callable
+
+from app.database import get_sync_db_context
+from app.database.conn import sync_engine
+from app.database.models import (
+    NotificationDelivery,
+    NotificationRule,
+    NotificationStatus,
+    User,
+    UserDevice,
+)
+from app.schemas import NotificationTask
+from app.services import (
+    ROUTINE_REMINDER_TEMPLATE,
+    NotificationScheduler,
+    NotificationTemplateRegistry,
+)
+from app.workers.tasks import (
+    DUE_NOTIFICATIONS_BATCH_SIZE,
+    claim_due_notification_rules,
+    prepare_notification_tasks_for_rules,
+)
+from scripts.loadtest import cleanup, seed
+from sqlalchemy import event, select
+from sqlalchemy.orm import Session
+
+Prepare = Callable[
+    [Session, list[NotificationRule], dict[str, list[str]], dict[str, dict[str, str]]],
+    list[NotificationTask],
+]
+
+
+def prepare_per_delivery(
+    session: Session,
+    rules: list[NotificationRule],
+    devices_by_user: dict[str, list[str]],
+    variables_by_user: dict[str, dict[str, str]],
+) -> list[NotificationTask]:
+    """The previous write path, which flushed and refreshed every delivery on its own."""
+    now = datetime.now(timezone.utc)
+    template = NotificationTemplateRegistry.get_by_name(session, ROUTINE_REMINDER_TEMPLATE)
+    next_runs = NotificationScheduler.plan_next_runs(
+        rules, [rule.next_run for rule in rules], now=now
+    )
+    tasks = []
+    for rule, next_run in zip(rules, next_runs, strict=True):
+        rule.next_run = next_run
+        variables = variables_by_user.get(str(rule.user_id), {})
+        for fcm_token in devices_by_user.get(str(rule.user_id), []):
+            delivery = NotificationDelivery(
+                notification_rule_id=rule.id,
+                status=NotificationStatus.PENDING,
+                scheduled_for=now,
+                template_id=template.id,
+                variables=variables,
+            )
+            session.add(delivery)
+            session.flush()
+            session.refresh(delivery)
+            tasks.append(
+                NotificationTask(
+                    delivery_id=delivery.id,
+                    user_fcm_token=fcm_token,
+                    template_id=template.id,
+                    template_version=template.version,
+                    variables=variables,
+                    scheduled_for=now,
+                )
+            )
+    return tasks
+
+
+def load_devices(
+    session: Session, rules: list[NotificationRule]
+) -> tuple[dict[str, list[str]], dict[str, dict[str, str]]]:
+    statement = (
+        select(UserDevice.user_id, UserDevice.fcm_token, User.name)
+        .join(User, User.id == UserDevice.user_id)
+        .where(UserDevice.user_id.in_({rule.user_id for rule in rules}))
+    )
+    devices_by_user: dict[str, list[str]] = defaultdict(list)
+    variables_by_user = {}
+    for user_id, fcm_token, name in session.execute(statement):
+        devices_by_user[str(user_id)].append(fcm_token)
+        variables_by_user[str(user_id)] = {"name": name}
+    return devices_by_user, variables_by_user
+
+
+@dataclass
+class Measurement:
+    batches: int = 0
+    round_trips: int = 0
+    delivery_round_trips: int = 0
+    seconds: float = 0.0
+    deliveries: int = 0
+
+
+def measure(prepare: Prepare, batches: int) -> Measurement:
+    """Returns the round trips and time spent writing the given number of batches."""
+    result = Measurement()
+
+    def count_round_trip(conn: Any, cursor: Any, statement: str, *_: Any) -> None:
+        result.round_trips += 1
+        if NotificationDelivery.__tablename__ in statement:
+            result.delivery_round_trips += 1
+
+    session = Session(sync_engine)
+    try:
+        now = datetime.now(timezone.utc)
+        for _ in range(batches):
+            rules = claim_due_notification_rules(session, now)
+            if not rules:
+                break
+            devices_by_user, variables_by_user = load_devices(session, rules)
+            event.listen(sync_engine, "before_cursor_execute", count_round_trip)
+            started = time.perf_counter()
+            try:
+                tasks = prepare(session, rules, devices_by_user, variables_by_user)
+                session.flush()
+            finally:
+                event.remove(sync_engine, "before_cursor_execute", count_round_trip)
+            result.seconds += time.perf_counter() - started
+            # Rules were moved to their next run, so the next claim takes further rules.
+            result.batches += 1
+            result.deliveries += len(tasks)
+    finally:
+        session.rollback()
+        session.close()
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=2000)
+    parser.add_argument("--devices-per-user", type=int, default=3)
+    parser.add_argument("--rules-per-user", type=int, default=1)
+    parser.add_argument("--batches", type=int, default=3, help="batches measured per path")
+    args = parser.parse_args()
+
+    seed_args = argparse.Namespace(
+        users=args.users,
+        devices_per_user=args.devices_per_user,
+        rules_per_user=args.rules_per_user,
+        dead_token_ratio=0.0,
+        spread_seconds=60,
+    )
+    seed(seed_args, f"dispatchbench{int(time.time())}")
+    with get_sync_db_context() as session:
+        NotificationTemplateRegistry.get_by_name(session, ROUTINE_REMINDER_TEMPLATE)
+    try:
+        print(
+            f"batches of {DUE_NOTIFICATIONS_BATCH_SIZE} rules, {args.devices_per_user} devices each"
+        )
+        paths = {"per delivery": prepare_per_delivery, "bulk": prepare_notification_tasks_for_rules}
+        for name, prepare in paths.items():
+            result = measure(prepare, args.batches)
+            batches = max(result.batches, 1)
+            print(
+                f"{name:<13} {result.round_trips / batches:7.1f} round trips/batch "
+                f"({result.delivery_round_trips / batches:.1f} writing deliveries), "
+                f"{result.seconds / batches * 1000:7.1f} ms/batch, "
+                f"{result.deliveries / batches:.0f} deliveries/batch"
+            )
+    finally:
+        cleanup()
+
+
+if __name__ == "__main__":
+    main()
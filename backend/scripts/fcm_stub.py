@@ -0,0 +1,94 @@
+"""Local stand-in for the FCM HTTP v1 API, used to exercise the notification pipeline offline.
+
+Start it with:
+
+    uvicorn scripts.fcm_stub:app --port 9000
+
+and point the workers to it with FCM_TRANSPORT=http2, FCM_ENDPOINT=http://localhost:9000,
+FCM_IID_ENDPOINT=http://localhost:9000, FCM_AUTH_ENABLED=false and any FCM_PROJECT_ID, or
+pass its URL to scripts/loadtest.py. Tokens starting with FCM_STUB_DEAD_PREFIX are answered
+with UNREGISTERED errors, or NOT_FOUND when subscribed to topics, every request is delayed
+by FCM_STUB_LATENCY_MS.
+"""
+
+import asyncio
+import os
+import uuid
+from collections import Counter
+from typing import Annotated, Any
+
+from fastapi import Body, FastAPI
+from fastapi.responses import JSONResponse
+
+LATENCY = float(os.getenv("FCM_STUB_LATENCY_MS", "20")) / 1000
+DEAD_PREFIX = os.getenv("FCM_STUB_DEAD_PREFIX", "dead-")
+
+app = FastAPI(title="fcm-stub")
+stats: Counter[str] = Counter()
+
+
+@app.post("/v1/projects/{project_id}/messages:send")
+async def send(project_id: str, payload: Annotated[dict[str, Any], Body()]) -> JSONResponse:
+    stats["requests"] += 1
+    if LATENCY:
+        await asyncio.sleep(LATENCY)
+    message = payload.get("message") or {}
+    token = message.get("token")
+    if not token and not message.get("topic"):
+        stats["invalid"] += 1
+        return JSONResponse(
+            status_code=400,
+            content={
+                "error": {
+                    "code": 400,
+                    "message": "Recipient of the message is not set.",
+                    "status": "INVALID_ARGUMENT",
+                }
+            },
+        )
+    if token and token.startswith(DEAD_PREFIX):
+        stats["unregistered"] += 1
+        return JSONResponse(
+            status_code=404,
+            content={
+                "error": {
+                    "code": 404,
+                    "message": "Requested entity was not found.",
+                    "status": "NOT_FOUND",
+                    "details": [
+                        {
+                            "@type": "type.googleapis.com/google.firebase.fcm.v1.FcmError",
+                            "errorCode": "UNREGISTERED",
+                        }
+                    ],
+                }
+            },
+        )
+    stats["sent"] += 1
+    return JSONResponse(content={"name": f"projects/{project_id}/messages/{uuid.uuid4()}"})
+
+
+@app.post("/iid/v1:batchAdd")
+async def batch_add(payload: Annotated[dict[str, Any], Body()]) -> dict[str, Any]:
+    stats["topic_requests"] += 1
+    if LATENCY:
+        await asyncio.sleep(LATENCY)
+    results = []
+    for token in payload.get("registration_tokens", []):
+        if token.startswith(DEAD_PREFIX):
+            stats["topic_unregistered"] += 1
+            results.append({"error": "NOT_FOUND"})
+        else:
+            stats["subscribed"] += 1
+            results.append({})
+    return {"results": results}
+
+
+@app.get("/stats")
+async def get_stats() -> dict[str, int]:
+    return dict(stats)
+
+
+@app.delete("/stats", status_code=204)
+async def reset_stats() -> None:
+    stats.clear()
@@ -0,0 +1,253 @@
+"""End-to-end load test of the notification dispatch pipeline.
+
+Seeds synthetic users, devices and due notification rules of every frequency into the
+configured postgres database, then drains them with dispatch_due_notifications while the
+FCM send tasks run eagerly in the same process. Reports dispatch lag percentiles, delivery
+throughput, database round trips per delivery and peak RSS, and removes the seeded data,
+together with any left over by previous runs. Dispatch lag is the time from when a
+delivery was due, the earliest seeded next run of the rules it covers, until its status
+was written.
+
+Run it from the backend directory with the usual environment variables set:
+
+    python -m scripts.loadtest --users 10000 --devices-per-user 2
+
+By default messages are answered by an in-process fake transport. Pass --fcm-endpoint to
+send them over HTTP to scripts/fcm_stub.py instead, which exercises the http2 transport.
+"""
+
+import argparse
+import random
+import resource
+import statistics
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from datetime import time as dt_time
+from typing import Any, Sequence, override
+
+from app.core import celery, settings
+from app.database import get_sync_db_context
+from app.database.conn import sync_engine
+from app.database.models import (
+    NotificationDelivery,
+    NotificationFrequency,
+    NotificationRule,
+    User,
+    UserDevice,
+)
+from app.services import FCMSendResult, FCMService
+from app.services.fcm import FCMTransport, HTTPv1Transport
+from app.workers.buffer import delivery_status_buffer
+from app.workers.tasks import dispatch_due_notifications
+from firebase_admin import messaging
+from sqlalchemy import delete, event, insert, select
+
+DEAD_TOKEN_PREFIX = "dead-"
+EMAIL_DOMAIN = "loadtest.example.com"
+
+
+class FakeTransport(FCMTransport):
+    """Accepts every message, except those sent to tokens marked as dead."""
+
+    @override
+    def send(self, message: messaging.Message) -> str:
+        (result,) = self.send_each([message])
+        if result.exception is not None:
+            raise result.exception
+        return result.message_id
+
+    @override
+    def send_each(self, messages: Sequence[messaging.Message]) -> list[FCMSendResult]:
+        return [
+            (
+                FCMSendResult(exception=messaging.UnregisteredError("Token is not registered"))
+                if message.token.startswith(DEAD_TOKEN_PREFIX)
+                else FCMSendResult(message_id=f"projects/loadtest/messages/{uuid.uuid4()}")
+            )
+            for message in messages
+        ]
+
+    @override
+    def subscribe_to_topic(
+        self, tokens: Sequence[str], topic: str
+    ) -> messaging.TopicManagementResponse:
+        return messaging.TopicManagementResponse(
+            {
+                "results": [
+                    {"error": "NOT_FOUND"} if token.startswith(DEAD_TOKEN_PREFIX) else {}
+                    for token in tokens
+                ]
+            }
+        )
+
+
+def build_rule(
+    user_id: uuid.UUID, frequency: NotificationFrequency, now: datetime, spread_seconds: int
+) -> dict:
+    rule = {
+        "id": uuid.uuid4(),
+        "user_id": user_id,
+        "frequency": frequency,
+        "time_of_day": dt_time(random.randrange(24), random.randrange(60), tzinfo=timezone.utc),
+        "enabled": True,
+        "next_run": now - timedelta(seconds=random.uniform(0, spread_seconds)),
+    }
+    if frequency == NotificationFrequency.EVERY_N_DAYS:
+        rule["every_n"] = random.randint(2, 14)
+    elif frequency == NotificationFrequency.CUSTOM:
+        rule["weekdays"] = [random.randint(0, 1) for _ in range(6)] + [1]
+    return rule
+
+
+def seed(args: argparse.Namespace, run_id: str) -> tuple[dict[uuid.UUID, datetime], int]:
+    """Returns the next runs of the seeded rules by their ids and the number of devices."""
+    now = datetime.now(timezone.utc)
+    frequencies = list(NotificationFrequency)
+    users, devices, rules = [], [], []
+    for idx in range(args.users):
+        user_id = uuid.uuid4()
+        users.append(
+            {
+                "id": user_id,
+                "email": f"{run_id}.{idx}@{EMAIL_DOMAIN}",
+                "name": "Load",
+                "surname": "Test",
+                "username": f"loadtest_{idx}",
+                "password": "!",
+            }
+        )
+        for _ in range(args.devices_per_user):
+            prefix = DEAD_TOKEN_PREFIX if random.random() < args.dead_token_ratio else ""
+            devices.append(
+                {
+                    "user_id": user_id,
+                    "meta": "platform=loadtest",
+                    "fcm_token": prefix + uuid.uuid4().hex,
+                }
+            )
+        rules.extend(
+            build_rule(user_id, frequencies[(idx + n) % len(frequencies)], now, args.spread_seconds)
+            for n in range(args.rules_per_user)
+        )
+
+    with get_sync_db_context() as session:
+        for model, rows in ((User, users), (UserDevice, devices), (NotificationRule, rules)):
+            for idx in range(0, len(rows), 5000):
+                session.execute(insert(model), rows[idx : idx + 5000])
+    return {rule["id"]: rule["next_run"] for rule in rules}, len(devices)
+
+
+def cleanup() -> None:
+    user_ids = select(User.id).where(User.email.endswith(f"@{EMAIL_DOMAIN}"))
+    rule_ids = select(NotificationRule.id).where(NotificationRule.user_id.in_(user_ids))
+    with get_sync_db_context() as session:
+        session.execute(
+            delete(NotificationDelivery).where(
+                NotificationDelivery.notification_rule_id.in_(rule_ids)
+            )
+        )
+        session.execute(delete(NotificationRule).where(NotificationRule.user_id.in_(user_ids)))
+        session.execute(delete(UserDevice).where(UserDevice.user_id.in_(user_ids)))
+        session.execute(delete(User).where(User.id.in_(user_ids)))
+
+
+def percentile(values: list[float], pct: int) -> float:
+    if len(values) < 2:
+        return values[0] if values else float("nan")
+    return statistics.quantiles(values, n=100, method="inclusive")[pct - 1]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--devices-per-user", type=int, default=2)
+    parser.add_argument("--rules-per-user", type=int, default=5, help="cycles the frequencies")
+    parser.add_argument("--dispatchers", type=int, default=1, help="concurrent dispatch loops")
+    parser.add_argument("--dead-token-ratio", type=float, default=0.0)
+    parser.add_argument("--spread-seconds", type=int, default=60, help="how long rules are due")
+    parser.add_argument("--fcm-endpoint", help="URL of scripts/fcm_stub.py")
+    parser.add_argument("--keep", action="store_true", help="do not remove the seeded data")
+    args = parser.parse_args()
+
+    # Tasks run in-process, the in-memory broker only answers queue depth checks.
+    celery.conf.update(task_always_eager=True, broker_url="memory://")
+    if args.fcm_endpoint:
+        FCMService._transport = HTTPv1Transport(
+            endpoint=args.fcm_endpoint,
+            iid_endpoint=args.fcm_endpoint,
+            project_id="loadtest",
+            credentials=None,
+            max_concurrency=settings.FCM_MAX_CONCURRENCY,
+        )
+    else:
+        FCMService._transport = FakeTransport()
+
+    run_id = f"loadtest{int(time.time())}"
+    seed_started = time.perf_counter()
+    due_by_rule, device_count = seed(args, run_id)
+    print(
+        f"seeded {args.users} users, {device_count} devices and {len(due_by_rule)} rules "
+        f"in {time.perf_counter() - seed_started:.1f}s"
+    )
+
+    round_trips = 0
+    counter_lock = threading.Lock()
+
+    def count_round_trip(*_: Any) -> None:
+        nonlocal round_trips
+        with counter_lock:
+            round_trips += 1
+
+    event.listen(sync_engine, "before_cursor_execute", count_round_trip)
+    try:
+        started = time.perf_counter()
+        dispatchers = [
+            threading.Thread(target=dispatch_due_notifications) for _ in range(args.dispatchers)
+        ]
+        for dispatcher in dispatchers:
+            dispatcher.start()
+        for dispatcher in dispatchers:
+            dispatcher.join()
+        delivery_status_buffer.flush()
+        elapsed = time.perf_counter() - started
+    finally:
+        event.remove(sync_engine, "before_cursor_execute", count_round_trip)
+
+    try:
+        with get_sync_db_context() as session:
+            rows = session.execute(
+                select(
+                    NotificationDelivery.status,
+                    NotificationDelivery.processed_at,
+                    NotificationDelivery.notification_rule_ids,
+                ).where(NotificationDelivery.notification_rule_id.in_(due_by_rule))
+            ).all()
+    finally:
+        if not args.keep:
+            cleanup()
+
+    lags = sorted(
+        (processed_at - min(due_by_rule[rule_id] for rule_id in rule_ids)).total_seconds()
+        for _, processed_at, rule_ids in rows
+        if processed_at
+    )
+    statuses: dict[str, int] = {}
+    for status, _, _ in rows:
+        statuses[status] = statuses.get(status, 0) + 1
+    deliveries = len(rows)
+    print(f"deliveries:        {deliveries} {statuses}")
+    print(f"elapsed:           {elapsed:.2f}s")
+    print(f"throughput:        {deliveries / elapsed:.0f} deliveries/s")
+    print(
+        "dispatch lag:      "
+        + ", ".join(f"p{pct} {percentile(lags, pct):.3f}s" for pct in (50, 90, 99))
+        + (f", max {lags[-1]:.3f}s" if lags else "")
+    )
+    print(f"db round trips:    {round_trips} ({round_trips / max(deliveries, 1):.4f} per delivery)")
+    print(f"peak RSS:          {resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024:.1f} MiB")
+
+
+if __name__ == "__main__":
+    main()
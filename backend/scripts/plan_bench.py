@@ -0,0 +1,94 @@
+"""Microbenchmark of planning next runs of a batch of claimed notification rules.
+
+Builds synthetic rules of every frequency, half of them already run once, and times
+planning their next runs one rule at a time with NotificationScheduler.plan_next_run
+against the single vectorized pass of NotificationScheduler.plan_next_runs. Nothing is
+read from or written to the database.
+
+Run it from the backend directory with the usual environment variables set:
+
+    python -m scripts.plan_bench --sizes 1000 10000 100000
+"""
+
+import argparse
+import random
+import time
+from datetime import datetime, timedelta, timezone
+from datetime import time as time_of_day
+from typing import Callable, Sequence
+
+from app.database.models import NotificationFrequency, NotificationRule
+from app.services import NotificationScheduler
+
+
+def build_rules(
+    size: int, now: datetime, rng: random.Random
+) -> tuple[list[NotificationRule], list[datetime | None]]:
+    rules = []
+    last_runs: list[datetime | None] = []
+    for _ in range(size):
+        rules.append(
+            NotificationRule(
+                frequency=rng.choice(list(NotificationFrequency)),
+                time_of_day=time_of_day(rng.randrange(24), rng.randrange(60), tzinfo=timezone.utc),
+                every_n=rng.randint(1, 30),
+                weekdays=[rng.randint(0, 1) for _ in range(7)],
+            )
+        )
+        age = timedelta(seconds=rng.randrange(60 * 86400))
+        last_runs.append(now - age if rng.random() < 0.5 else None)
+    return rules, last_runs
+
+
+Plan = Callable[[Sequence[NotificationRule], Sequence[datetime | None], datetime], object]
+
+
+def plan_per_rule(
+    rules: Sequence[NotificationRule], last_runs: Sequence[datetime | None], now: datetime
+) -> list[datetime | None]:
+    return [
+        NotificationScheduler.plan_next_run(rule, last_run, now=now)
+        for rule, last_run in zip(rules, last_runs, strict=True)
+    ]
+
+
+def best_of(
+    repeats: int,
+    plan: Plan,
+    rules: Sequence[NotificationRule],
+    last_runs: Sequence[datetime | None],
+    now: datetime,
+) -> float:
+    """Returns the fastest of the given number of planning runs, in seconds."""
+    timings = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        plan(rules, last_runs, now)
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    now = datetime.now(timezone.utc)
+    for size in args.sizes:
+        rules, last_runs = build_rules(size, now, rng)
+        per_rule = best_of(args.repeats, plan_per_rule, rules, last_runs, now)
+        vectorized = best_of(
+            args.repeats, NotificationScheduler.plan_next_runs, rules, last_runs, now
+        )
+        print(
+            f"{size:>7} rules: {per_rule / size * 1_000_000:6.2f} us/rule per rule, "
+            f"{vectorized / size * 1_000_000:6.2f} us/rule vectorized "
+            f"({per_rule / vectorized:.1f}x), {vectorized * 1000:8.1f} ms/batch"
+        )
+
+
+if __name__ == "__main__":
+    main()
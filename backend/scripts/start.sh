@@ -12,6 +12,10 @@ fi
 echo "Running database migrations..."
 alembic upgrade head
 
+if [ -n "$API_METRICS_PORT" ]; then
+  python -m app.exporter &
+fi
+
 if [ "$APP_ENV" == "production" ]; then
   exec fastapi run --host 0.0.0.0 --workers 4 app/main.py
 else
@@ -0,0 +1,123 @@
+import uuid
+from contextlib import contextmanager
+from datetime import datetime, time, timedelta, timezone
+from typing import Any, AsyncGenerator, Callable, ContextManager, Iterator
+
+import pytest
+from app.core import settings
+from app.crud.routine import get_user_routine_summaries
+from app.database.models import (
+    NotificationFrequency,
+    NotificationRule,
+    Product,
+    Routine,
+    RoutineProduct,
+    RoutineType,
+    User,
+    UserDevice,
+)
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession, create_async_engine
+from sqlalchemy.pool import NullPool
+
+Statement = tuple[str, Any]
+
+
+@pytest.fixture
+def anyio_backend() -> str:
+    return "asyncio"
+
+
+@pytest.fixture
+async def connection() -> AsyncGenerator[AsyncConnection]:
+    """A connection to the migrated database whose transaction is rolled back afterwards."""
+    engine = create_async_engine(str(settings.ASYNC_POSTGRES_DSN), poolclass=NullPool)
+    try:
+        async with engine.connect() as connection:
+            transaction = await connection.begin()
+            try:
+                yield connection
+            finally:
+                await transaction.rollback()
+    finally:
+        await engine.dispose()
+
+
+@pytest.fixture
+async def session(connection: AsyncConnection) -> AsyncGenerator[AsyncSession]:
+    """A session on the test connection, whose commits only release savepoints."""
+    async with AsyncSession(
+        bind=connection,
+        autoflush=False,
+        expire_on_commit=False,
+        join_transaction_mode="create_savepoint",
+    ) as session:
+        yield session
+
+
+@pytest.fixture
+def record_statements(
+    connection: AsyncConnection,
+) -> Callable[[], ContextManager[list[Statement]]]:
+    """Records statements sent over the test connection, the way scripts/loadtest.py
+    counts round trips, together with their parameters."""
+
+    @contextmanager
+    def record() -> Iterator[list[Statement]]:
+        statements: list[Statement] = []
+
+        def record_statement(conn: Any, cursor: Any, statement: str, parameters: Any, *_: Any):
+            statements.append((statement, parameters))
+
+        event.listen(connection.sync_engine, "before_cursor_execute", record_statement)
+        try:
+            yield statements
+        finally:
+            event.remove(connection.sync_engine, "before_cursor_execute", record_statement)
+
+    return record
+
+
+@pytest.fixture
+async def user(session: AsyncSession) -> User:
+    user = User(
+        email=f"{uuid.uuid4().hex}@example.com",
+        name="Test",
+        surname="User",
+        username="test_user",
+        password="not-a-hash",
+    )
+    session.add(user)
+    await session.flush()
+    return user
+
+
+@pytest.fixture
+async def seeded_user(session: AsyncSession, user: User) -> User:
+    """The test user with 3 products, 5 routines using all of them, 5 rules and 5 devices."""
+    now = datetime.now(timezone.utc)
+    products = [Product(user_id=user.id, name=f"Product {idx}") for idx in range(3)]
+    session.add_all(products)
+    for idx in range(5):
+        session.add(
+            NotificationRule(
+                user_id=user.id,
+                time_of_day=time(8, idx, tzinfo=timezone.utc),
+                frequency=NotificationFrequency.DAILY,
+                next_run=now - timedelta(minutes=idx),
+            )
+        )
+        session.add(UserDevice(user_id=user.id, meta="os=android", fcm_token=uuid.uuid4().hex))
+        session.add(
+            Routine(
+                user_id=user.id, type=RoutineType.MORNING, performed_at=now - timedelta(days=idx)
+            )
+        )
+    await session.flush()
+    routines = (await get_user_routine_summaries(session, user.id))[0]
+    for routine in routines:
+        session.add_all(
+            RoutineProduct(routine_id=routine.id, product_id=product.id) for product in products
+        )
+    await session.flush()
+    return user
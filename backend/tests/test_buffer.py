@@ -0,0 +1,100 @@
+import time
+import uuid
+from datetime import datetime, timezone
+from typing import Any, Iterator
+
+import pytest
+from app.database import get_sync_db_context
+from app.database.models import NotificationDelivery, NotificationStatus
+from app.schemas import NotificationTask
+from app.services import FCMSendResult, FCMService
+from app.workers import buffer, tasks
+from app.workers.buffer import DeliveryStatusBuffer
+from firebase_admin import messaging
+from sqlalchemy import delete, select
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session
+
+
+def test_failed_flush_is_retried_by_the_timer(monkeypatch: pytest.MonkeyPatch) -> None:
+    attempts = []
+
+    def update_delivery_statuses(session: Session, statuses: list[dict[str, Any]]) -> None:
+        attempts.append([item["id"] for item in statuses])
+        if len(attempts) == 1:
+            raise OperationalError("UPDATE notification_delivery", {}, Exception("connection lost"))
+
+    monkeypatch.setattr(buffer, "update_delivery_statuses", update_delivery_statuses)
+    status_buffer = DeliveryStatusBuffer(max_items=10, max_wait_ms=10)
+    delivery_id = uuid.uuid4()
+    status_buffer.add_many(
+        [
+            {
+                "id": delivery_id,
+                "status": NotificationStatus.SENT,
+                "processed_at": datetime.now(timezone.utc),
+                "provider_message_id": "message",
+            }
+        ]
+    )
+
+    deadline = time.monotonic() + 5
+    while len(attempts) < 2 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert attempts == [[delivery_id], [delivery_id]]
+
+
+@pytest.fixture
+def deliveries() -> Iterator[list[NotificationDelivery]]:
+    now = datetime.now(timezone.utc)
+    with get_sync_db_context() as session:
+        deliveries = [NotificationDelivery(scheduled_for=now) for _ in range(3)]
+        session.add_all(deliveries)
+        session.flush()
+        session.expunge_all()
+    yield deliveries
+    with get_sync_db_context() as session:
+        session.execute(
+            delete(NotificationDelivery).where(
+                NotificationDelivery.id.in_([delivery.id for delivery in deliveries])
+            )
+        )
+
+
+def test_statuses_of_send_tasks_are_written_together(
+    monkeypatch: pytest.MonkeyPatch, deliveries: list[NotificationDelivery]
+) -> None:
+    writes = []
+    update_delivery_statuses = buffer.update_delivery_statuses
+
+    def record_update(session: Session, statuses: list[dict[str, Any]]) -> None:
+        writes.append({item["id"] for item in statuses})
+        update_delivery_statuses(session, statuses)
+
+    def send_batch(messages: list[messaging.Message]) -> list[FCMSendResult]:
+        return [FCMSendResult(message_id="message") for _ in messages]
+
+    monkeypatch.setattr(buffer, "update_delivery_statuses", record_update)
+    monkeypatch.setattr(
+        tasks, "delivery_status_buffer", DeliveryStatusBuffer(max_items=10, max_wait_ms=60_000)
+    )
+    monkeypatch.setattr(FCMService, "send_batch", send_batch)
+    for delivery in deliveries:
+        task = NotificationTask(
+            delivery_id=delivery.id,
+            user_fcm_token="token",
+            title="Routine reminder",
+            body="Time for your routine",
+            scheduled_for=delivery.scheduled_for,
+        )
+        tasks.send_fcm_notification_batch([task.to_compact()])
+
+    assert writes == []
+    tasks.flush_delivery_statuses()
+
+    assert writes == [{delivery.id for delivery in deliveries}]
+    with get_sync_db_context() as session:
+        statement = select(NotificationDelivery.status).where(
+            NotificationDelivery.id.in_([delivery.id for delivery in deliveries])
+        )
+        assert session.scalars(statement).all() == [NotificationStatus.SENT] * 3
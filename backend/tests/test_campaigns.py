@@ -0,0 +1,64 @@
+from typing import Iterator
+
+import pytest
+from app.database import get_sync_db_context
+from app.database.models import NotificationCampaign, NotificationStatus
+from app.services import CampaignSegments, FCMService
+from app.workers.tasks import send_campaign
+
+
+def test_overlapping_segments_are_sent_a_single_condition() -> None:
+    condition = CampaignSegments.get_condition(["platform-android", "brand-samsung"])
+
+    assert condition == "'platform-android' in topics || 'brand-samsung' in topics"
+
+
+def test_all_segment_covers_the_other_segments() -> None:
+    assert CampaignSegments.get_condition(["brand-samsung", "all"]) == "'all' in topics"
+
+
+def test_too_many_segments_for_a_condition_are_rejected() -> None:
+    with pytest.raises(ValueError):
+        CampaignSegments.get_condition([f"brand-{idx}" for idx in range(6)])
+
+
+@pytest.fixture
+def campaign() -> Iterator[NotificationCampaign]:
+    with get_sync_db_context() as session:
+        campaign = NotificationCampaign(
+            title="Title", body="Body", segments=["platform-android", "brand-samsung"]
+        )
+        session.add(campaign)
+        session.flush()
+        session.expunge(campaign)
+    yield campaign
+    with get_sync_db_context() as session:
+        session.delete(session.get(NotificationCampaign, campaign.id))
+
+
+def test_redelivered_campaign_is_sent_once(
+    monkeypatch: pytest.MonkeyPatch, campaign: NotificationCampaign
+) -> None:
+    sent = []
+
+    def send_to_condition(condition: str, title: str, body: str) -> str:
+        with get_sync_db_context() as session:
+            sent.append((condition, session.get(NotificationCampaign, campaign.id).status))
+        return "message"
+
+    monkeypatch.setattr(FCMService, "send_to_condition", send_to_condition)
+    send_campaign(str(campaign.id))
+    send_campaign(str(campaign.id))
+
+    with get_sync_db_context() as session:
+        sent_campaign = session.get(NotificationCampaign, campaign.id)
+        assert (sent_campaign.status, sent_campaign.message_id) == (
+            NotificationStatus.SENT,
+            "message",
+        )
+    assert sent == [
+        (
+            "'platform-android' in topics || 'brand-samsung' in topics",
+            NotificationStatus.SENDING,
+        )
+    ]
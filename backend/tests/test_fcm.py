@@ -0,0 +1,33 @@
+import httpx
+import pytest
+from app.services import FCMSendResult
+from app.services.fcm.transport import _error_from_response
+
+FCM_ERROR_TYPE = "type.googleapis.com/google.firebase.fcm.v1.FcmError"
+
+
+def error_response(status: str, error_code: str | None = None) -> httpx.Response:
+    details = [{"@type": FCM_ERROR_TYPE, "errorCode": error_code}] if error_code else []
+    return httpx.Response(
+        400, json={"error": {"status": status, "message": "error", "details": details}}
+    )
+
+
+@pytest.mark.parametrize(
+    ("response", "permanent_failure", "rejected"),
+    [
+        (error_response("NOT_FOUND", "UNREGISTERED"), True, False),
+        (error_response("PERMISSION_DENIED", "SENDER_ID_MISMATCH"), True, False),
+        # A malformed payload, every recipient of the message gets the same answer.
+        (error_response("INVALID_ARGUMENT", "INVALID_ARGUMENT"), False, True),
+        (error_response("INVALID_ARGUMENT"), False, True),
+        (error_response("UNAVAILABLE", "UNAVAILABLE"), False, False),
+    ],
+)
+def test_only_token_errors_are_permanent_failures(
+    response: httpx.Response, permanent_failure: bool, rejected: bool
+) -> None:
+    result = FCMSendResult(exception=_error_from_response(response))
+
+    assert result.permanent_failure is permanent_failure
+    assert result.rejected is rejected
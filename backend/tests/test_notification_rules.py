@@ -0,0 +1,54 @@
+from datetime import time, timezone
+from typing import Any
+
+import pytest
+import redis
+from app.api.routes.notification import create_notification_rule, delete_notification_rule
+from app.core import settings
+from app.database.models import NotificationFrequency, NotificationRule, User
+from app.schemas.notification import SimpleVariant
+from app.services import RedisScheduleIndex
+from sqlalchemy.ext.asyncio import AsyncSession
+
+pytestmark = pytest.mark.anyio
+
+
+class UnavailableRedis:
+    async def zadd(self, *args: Any) -> None:
+        raise redis.ConnectionError("Connection refused")
+
+    async def zrem(self, *args: Any) -> None:
+        raise redis.ConnectionError("Connection refused")
+
+
+def daily_rule() -> SimpleVariant:
+    return SimpleVariant(
+        time_of_day=time(8, 0, tzinfo=timezone.utc), frequency=NotificationFrequency.DAILY
+    )
+
+
+async def test_schedule_index_is_synced_after_the_rule_is_committed(
+    monkeypatch: pytest.MonkeyPatch, session: AsyncSession, user: User
+) -> None:
+    synced = []
+
+    async def sync_rule(rule: NotificationRule) -> None:
+        synced.append((rule.id, rule.next_run, session.in_transaction()))
+
+    monkeypatch.setattr(RedisScheduleIndex, "sync_rule", sync_rule)
+    rule = await create_notification_rule(rule_in=daily_rule(), session=session, user_id=user.id)
+
+    assert synced == [(rule.id, rule.next_run, False)]
+
+
+async def test_unavailable_schedule_index_does_not_fail_rule_requests(
+    monkeypatch: pytest.MonkeyPatch, session: AsyncSession, user: User
+) -> None:
+    monkeypatch.setattr(settings, "NOTIFICATION_SCHEDULER_ENGINE", "redis")
+    monkeypatch.setattr(RedisScheduleIndex, "_async_client", UnavailableRedis())
+
+    rule = await create_notification_rule(rule_in=daily_rule(), session=session, user_id=user.id)
+    response = await delete_notification_rule(rule.id, session=session, user_id=user.id)
+
+    assert rule.next_run is not None
+    assert response.status_code == 204
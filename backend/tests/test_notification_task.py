@@ -0,0 +1,67 @@
+import uuid
+from datetime import datetime, timezone
+
+import msgpack
+import pytest
+from app.schemas import NotificationTask
+from app.workers.tasks import send_fcm_notification, send_fcm_notification_batch
+from kombu import serialization
+from kombu.utils import json
+from pydantic import ValidationError
+
+
+def build_task(**kwargs: object) -> NotificationTask:
+    return NotificationTask(
+        delivery_id=uuid.uuid4(),
+        user_fcm_token="token",
+        template_id=uuid.uuid4(),
+        variables={"name": "Alexandra"},
+        **kwargs,
+    )
+
+
+def test_compact_form_keeps_scheduled_for_to_the_microsecond() -> None:
+    task = build_task(scheduled_for=datetime(2026, 10, 18, 7, 45, 1, 999999, tzinfo=timezone.utc))
+
+    compact = msgpack.unpackb(msgpack.packb(task.to_compact()))
+
+    assert NotificationTask.from_compact(compact) == task
+
+
+def test_compact_form_without_scheduled_for_is_accepted() -> None:
+    task = build_task()
+
+    assert NotificationTask.from_compact(task.to_compact()[:4]) == task
+
+
+def test_legacy_task_is_forwarded_in_a_msgpack_encodable_form(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    legacy = {
+        "delivery_id": uuid.uuid4(),
+        "user_fcm_token": "token",
+        "title": "Routine reminder",
+        "body": "Time for your routine, Alexandra",
+    }
+    # Tasks of the previous release were published as JSON, which kombu decodes into UUIDs.
+    data = json.loads(json.dumps(legacy))
+    assert isinstance(data["delivery_id"], uuid.UUID)
+    forwarded = []
+    monkeypatch.setattr(send_fcm_notification_batch, "delay", forwarded.append)
+
+    send_fcm_notification(data)
+
+    _, _, payload = serialization.dumps(forwarded[0], serializer="msgpack")
+    [item] = msgpack.unpackb(payload)
+    task = NotificationTask.from_compact(item)
+    assert (task.delivery_id, task.template_id, task.title, task.body) == (
+        legacy["delivery_id"],
+        None,
+        legacy["title"],
+        legacy["body"],
+    )
+
+
+def test_task_without_template_or_content_is_rejected() -> None:
+    with pytest.raises(ValidationError):
+        NotificationTask.from_compact({"delivery_id": str(uuid.uuid4()), "user_fcm_token": "t"})
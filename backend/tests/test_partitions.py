@@ -0,0 +1,49 @@
+import uuid
+from datetime import date, datetime, timezone
+
+import pytest
+from app.database.models import NotificationDelivery, NotificationStatus
+from app.workers.partitions import (
+    DEFAULT_PARTITION,
+    create_delivery_partitions,
+    get_delivery_partitions,
+    get_partition_name,
+)
+from sqlalchemy import Connection, insert, literal_column, select
+from sqlalchemy.ext.asyncio import AsyncConnection
+from sqlalchemy.orm import Session
+
+pytestmark = pytest.mark.anyio
+
+
+def get_delivery_table(session: Session, delivery_id: uuid.UUID) -> str:
+    statement = select(literal_column("tableoid::regclass::text")).where(
+        NotificationDelivery.id == delivery_id
+    )
+    return session.scalar(statement)
+
+
+async def test_created_partition_takes_over_deliveries_of_the_default_one(
+    connection: AsyncConnection,
+) -> None:
+    # Far enough ahead that partition maintenance never created the month.
+    month = date(2090, 1, 1)
+    delivery_id = uuid.uuid4()
+
+    def run(sync_connection: Connection) -> None:
+        session = Session(bind=sync_connection)
+        session.execute(
+            insert(NotificationDelivery).values(
+                id=delivery_id,
+                status=NotificationStatus.PENDING,
+                scheduled_for=datetime(2090, 1, 15, tzinfo=timezone.utc),
+            )
+        )
+        assert get_delivery_table(session, delivery_id) == DEFAULT_PARTITION
+
+        create_delivery_partitions(session, date(2089, 12, 1), months=0)
+
+        assert {date(2089, 12, 1), month} <= get_delivery_partitions(session).keys()
+        assert get_delivery_table(session, delivery_id) == get_partition_name(month)
+
+    await connection.run_sync(run)
@@ -0,0 +1,156 @@
+"""EXPLAIN regression tests of the hot API and worker queries.
+
+Every statement issued by the tested function is explained on the test connection with
+sequential scans disabled, so the planner falls back to a Seq Scan only when no index can
+answer the statement, regardless of how little data the test database holds.
+"""
+
+import json
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, ContextManager, Iterator
+
+import pytest
+from app.crud.device import get_user_devices
+from app.crud.notification import get_user_notification_rules
+from app.crud.product import get_user_products
+from app.crud.routine import get_user_routine_summaries, get_user_routines
+from app.database.models import NotificationStatus, User
+from app.schemas import PaginationParams, RoutineParams
+from app.workers.buffer import update_delivery_statuses
+from app.workers.partitions import DELIVERY_TABLE, get_partition_name
+from app.workers.tasks import claim_due_notification_rules
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession
+from sqlalchemy.orm import Session
+
+pytestmark = pytest.mark.anyio
+
+RecordStatements = Callable[[], ContextManager[list[tuple[str, Any]]]]
+
+
+def iter_plan_nodes(node: dict[str, Any]) -> Iterator[dict[str, Any]]:
+    yield node
+    for child in node.get("Plans", []):
+        yield from iter_plan_nodes(child)
+
+
+async def explain(
+    connection: AsyncConnection, statements: list[tuple[str, Any]]
+) -> list[dict[str, Any]]:
+    """Returns the plan nodes of the given queries, planned without seq scans.
+
+    Statements which cannot be explained, like savepoints of the session, are skipped.
+    """
+    await connection.exec_driver_sql("SET LOCAL enable_seqscan = off")
+    nodes = []
+    for statement, parameters in statements:
+        if not statement.lstrip().upper().startswith(("SELECT", "UPDATE")):
+            continue
+        result = await connection.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {statement}", parameters)
+        plan = result.scalar_one()
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        nodes.extend(iter_plan_nodes(plan[0]["Plan"]))
+    return nodes
+
+
+def assert_uses_indexes(nodes: list[dict[str, Any]], *indexes: str) -> None:
+    seq_scans = [node["Relation Name"] for node in nodes if node["Node Type"] == "Seq Scan"]
+    assert seq_scans == []
+    used = {node["Index Name"] for node in nodes if "Index Name" in node}
+    assert set(indexes) <= used
+
+
+def assert_not_sorted(nodes: list[dict[str, Any]]) -> None:
+    assert [node for node in nodes if node["Node Type"] == "Sort"] == []
+
+
+async def test_due_rule_claim_uses_partial_next_run_index(
+    connection: AsyncConnection, seeded_user: User, record_statements: RecordStatements
+) -> None:
+    with record_statements() as statements:
+        await connection.run_sync(
+            lambda sync_connection: claim_due_notification_rules(
+                Session(bind=sync_connection), datetime.now(timezone.utc)
+            )
+        )
+
+    nodes = await explain(connection, statements)
+    assert_uses_indexes(nodes, "ix_notification_rule_next_run_enabled")
+
+
+async def test_user_rule_and_device_lookups_use_user_id_indexes(
+    connection: AsyncConnection,
+    session: AsyncSession,
+    seeded_user: User,
+    record_statements: RecordStatements,
+) -> None:
+    with record_statements() as statements:
+        await get_user_notification_rules(session, seeded_user.id)
+        await get_user_devices(session, seeded_user.id)
+
+    nodes = await explain(connection, statements)
+    assert_uses_indexes(nodes, "ix_notification_rule_user_id", "ix_user_device_user_id")
+
+
+async def test_product_pages_are_read_in_index_order(
+    connection: AsyncConnection,
+    session: AsyncSession,
+    seeded_user: User,
+    record_statements: RecordStatements,
+) -> None:
+    _, _, cursor = await get_user_products(session, seeded_user.id, PaginationParams(limit=1))
+    with record_statements() as statements:
+        await get_user_products(
+            session, seeded_user.id, PaginationParams(limit=1, include_total=True)
+        )
+        await get_user_products(session, seeded_user.id, PaginationParams(limit=1, cursor=cursor))
+
+    nodes = await explain(connection, statements)
+    assert_uses_indexes(nodes, "ix_product_user_id_updated_at_id")
+    assert_not_sorted(nodes)
+
+
+@pytest.mark.parametrize("get_routines", [get_user_routines, get_user_routine_summaries])
+async def test_routine_pages_are_read_in_index_order(
+    connection: AsyncConnection,
+    session: AsyncSession,
+    seeded_user: User,
+    record_statements: RecordStatements,
+    get_routines: Callable[..., Any],
+) -> None:
+    with record_statements() as statements:
+        await get_routines(session, seeded_user.id, RoutineParams(limit=2))
+
+    nodes = await explain(connection, statements)
+    assert_uses_indexes(nodes, "ix_routine_user_id_performed_at_id")
+
+
+async def test_delivery_status_updates_only_scan_their_partition(
+    connection: AsyncConnection, record_statements: RecordStatements
+) -> None:
+    now = datetime.now(timezone.utc)
+    statuses = [
+        {
+            "id": uuid.uuid4(),
+            "scheduled_for": now - timedelta(seconds=idx),
+            "status": NotificationStatus.SENT,
+            "processed_at": now,
+            "provider_message_id": None,
+        }
+        for idx in range(3)
+    ]
+    with record_statements() as statements:
+        await connection.run_sync(
+            lambda sync_connection: update_delivery_statuses(
+                Session(bind=sync_connection), statuses
+            )
+        )
+
+    nodes = await explain(connection, statements)
+    partitions = {
+        node["Relation Name"]
+        for node in nodes
+        if node.get("Relation Name", "").startswith(f"{DELIVERY_TABLE}_")
+    }
+    assert partitions == {get_partition_name(item["scheduled_for"].date()) for item in statuses}
@@ -0,0 +1,74 @@
+"""Statement counts of the routine endpoints, which must not grow with the page size."""
+
+from typing import Any, Callable, ContextManager
+
+import pytest
+from app.api.routes.routine import get_routine_by_id, get_routines
+from app.database.models import User
+from app.schemas import RoutineExpand, RoutineParams, RoutineRead, RoutineSummary
+from pydantic import BaseModel
+from sqlalchemy.ext.asyncio import AsyncSession
+
+pytestmark = pytest.mark.anyio
+
+RecordStatements = Callable[[], ContextManager[list[tuple[str, Any]]]]
+
+
+def count_queries(statements: list[tuple[str, Any]]) -> int:
+    """Returns the number of statements, leaving out savepoints of the test session."""
+    return sum(1 for statement, _ in statements if "SAVEPOINT" not in statement.upper())
+
+
+@pytest.mark.parametrize(
+    ("expand", "schema", "queries"),
+    [
+        # The page, and the total count.
+        (None, RoutineSummary, 2),
+        # The page, its products, and the total count.
+        (RoutineExpand.PRODUCTS, RoutineRead, 3),
+    ],
+)
+async def test_routine_list_queries(
+    session: AsyncSession,
+    seeded_user: User,
+    record_statements: RecordStatements,
+    expand: RoutineExpand | None,
+    schema: type[BaseModel],
+    queries: int,
+) -> None:
+    session.expunge_all()
+    with record_statements() as statements:
+        page = await get_routines(
+            RoutineParams(limit=5, expand=expand), session=session, user_id=seeded_user.id
+        )
+        items = [schema.model_validate(item) for item in page.items]
+
+    assert len(items) == 5
+    assert all(len(item.products) == 3 for item in items)
+    assert count_queries(statements) == queries
+
+
+async def test_routine_list_pages_after_a_cursor_take_a_single_query(
+    session: AsyncSession, seeded_user: User, record_statements: RecordStatements
+) -> None:
+    first = await get_routines(RoutineParams(limit=2), session=session, user_id=seeded_user.id)
+    with record_statements() as statements:
+        await get_routines(
+            RoutineParams(limit=2, cursor=first.next_cursor),
+            session=session,
+            user_id=seeded_user.id,
+        )
+
+    assert count_queries(statements) == 1
+
+
+async def test_routine_is_read_with_its_products(
+    session: AsyncSession, seeded_user: User, record_statements: RecordStatements
+) -> None:
+    page = await get_routines(RoutineParams(limit=1), session=session, user_id=seeded_user.id)
+    session.expunge_all()
+    with record_statements() as statements:
+        routine = await get_routine_by_id(page.items[0].id, session=session, user_id=seeded_user.id)
+        RoutineRead.model_validate(routine)
+
+    assert count_queries(statements) == 2
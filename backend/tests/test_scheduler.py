@@ -0,0 +1,154 @@
+from datetime import datetime, time, timedelta, timezone
+from unittest.mock import patch
+
+from app.core import settings
+from app.database.models import NotificationFrequency, NotificationRule
+from app.services import NotificationScheduler
+from app.services.scheduler import SchedulingStrategy, weekdays_to_mask
+from hypothesis import example, given
+from hypothesis import strategies as st
+
+ONE_DAY = timedelta(days=1)
+WORKING_DAYS = [1, 1, 1, 1, 1, 0, 0]
+# Daylight saving time transitions of Europe/Warsaw and America/New_York, in UTC.
+DST_TRANSITIONS = [
+    datetime(2026, 3, 8, 7, 0, tzinfo=timezone.utc),
+    datetime(2026, 3, 29, 1, 0, tzinfo=timezone.utc),
+    datetime(2026, 10, 25, 1, 0, tzinfo=timezone.utc),
+    datetime(2026, 11, 1, 6, 0, tzinfo=timezone.utc),
+]
+
+
+def execution_time(day: datetime, time_of_day: time) -> datetime:
+    event = datetime.combine(day.date(), time_of_day).replace(tzinfo=timezone.utc)
+    return event - timedelta(minutes=settings.NOTIFICATION_OFFSET_MINUTES)
+
+
+def iterative_next_run(
+    rule: NotificationRule, last_run: datetime | None, now: datetime
+) -> datetime | None:
+    """The iterative planning the closed form replaced, stepping one slot at a time.
+
+    It differs from the original loops only where they were wrong: days are stepped from
+    the base date, because re-deriving the date from a candidate never advanced when the
+    time of day was earlier than the offset, every n days rules are moved past now instead
+    of being returned in the past, and custom weekdays are not searched 15 days ahead only.
+    """
+    if rule.frequency == NotificationFrequency.ONCE:
+        if last_run is not None:
+            return None
+        candidate = execution_time(now, rule.time_of_day)
+        return candidate if candidate > now else None
+
+    if rule.frequency == NotificationFrequency.EVERY_N_DAYS:
+        interval = timedelta(days=rule.every_n)
+        base = last_run + interval if last_run is not None else now
+        candidate = execution_time(base, rule.time_of_day)
+        while candidate <= now:
+            candidate += interval
+        return candidate
+
+    weekdays = {
+        NotificationFrequency.DAILY: [1] * 7,
+        NotificationFrequency.WEEKDAY_ONLY: WORKING_DAYS,
+        NotificationFrequency.CUSTOM: rule.weekdays,
+    }[rule.frequency]
+    if not any(weekdays):
+        return None
+    base = last_run if last_run is not None else now
+    days_ahead = 0
+    while True:
+        candidate = execution_time(base + days_ahead * ONE_DAY, rule.time_of_day)
+        if candidate > now and weekdays[candidate.weekday()]:
+            return candidate
+        days_ahead += 1
+
+
+utc_datetimes = st.datetimes(
+    min_value=datetime(2000, 1, 1), max_value=datetime(2100, 1, 1), timezones=st.just(timezone.utc)
+)
+nows = st.one_of(
+    utc_datetimes,
+    st.builds(
+        lambda transition, seconds: transition + timedelta(seconds=seconds),
+        st.sampled_from(DST_TRANSITIONS),
+        st.integers(min_value=-2 * 86400, max_value=2 * 86400),
+    ),
+)
+rules = st.builds(
+    NotificationRule,
+    frequency=st.sampled_from(NotificationFrequency),
+    time_of_day=st.times().map(lambda t: t.replace(microsecond=0, tzinfo=timezone.utc)),
+    every_n=st.integers(min_value=1, max_value=60),
+    weekdays=st.lists(st.integers(min_value=0, max_value=1), min_size=7, max_size=7),
+)
+# Last runs are whole seconds in the past, like the next runs they were planned as.
+last_run_ages = st.one_of(
+    st.none(), st.integers(min_value=0, max_value=400 * 86400).map(lambda s: timedelta(seconds=s))
+)
+offsets = st.sampled_from([0, 15, 90, 24 * 60])
+
+
+def last_run_for(now: datetime, age: timedelta | None) -> datetime | None:
+    return None if age is None else now.replace(microsecond=0) - age
+
+
+@given(rules, nows, last_run_ages, offsets)
+@example(
+    NotificationRule(
+        frequency=NotificationFrequency.DAILY,
+        time_of_day=time(0, 5, tzinfo=timezone.utc),
+        every_n=1,
+        weekdays=[0] * 7,
+    ),
+    DST_TRANSITIONS[1],
+    timedelta(days=90),
+    15,
+)
+def test_plan_next_run_matches_iterative_planning(
+    rule: NotificationRule, now: datetime, age: timedelta | None, offset: int
+) -> None:
+    last_run = last_run_for(now, age)
+    with patch.object(settings, "NOTIFICATION_OFFSET_MINUTES", offset):
+        expected = iterative_next_run(rule, last_run, now)
+        assert NotificationScheduler.plan_next_run(rule, last_run, now=now) == expected
+
+
+@given(st.lists(st.tuples(rules, last_run_ages), min_size=1, max_size=50), nows, offsets)
+def test_plan_next_runs_matches_plan_next_run(
+    rules_and_ages: list[tuple[NotificationRule, timedelta | None]], now: datetime, offset: int
+) -> None:
+    batch = [rule for rule, _ in rules_and_ages]
+    last_runs = [last_run_for(now, age) for _, age in rules_and_ages]
+    with patch.object(settings, "NOTIFICATION_OFFSET_MINUTES", offset):
+        expected = [
+            NotificationScheduler.plan_next_run(rule, last_run, now=now)
+            for rule, last_run in zip(batch, last_runs, strict=True)
+        ]
+        assert NotificationScheduler.plan_next_runs(batch, last_runs, now=now) == expected
+
+
+@given(
+    utc_datetimes,
+    nows,
+    st.integers(min_value=1, max_value=60).map(lambda n: timedelta(days=n)),
+)
+def test_first_after_returns_first_slot_later_than_now(
+    candidate: datetime, now: datetime, interval: timedelta
+) -> None:
+    result = SchedulingStrategy._first_after(candidate, now, interval)
+
+    assert result > now
+    assert (result - candidate) % interval == timedelta(0)
+    assert result == candidate or result - interval <= now
+
+
+@given(utc_datetimes, st.lists(st.integers(min_value=0, max_value=1), min_size=7, max_size=7))
+def test_first_on_weekdays_returns_nearest_enabled_day(
+    candidate: datetime, weekdays: list[int]
+) -> None:
+    result = SchedulingStrategy._first_on_weekdays(candidate, weekdays_to_mask(weekdays))
+
+    enabled = [candidate + days * ONE_DAY for days in range(7)]
+    enabled = [day for day in enabled if weekdays[day.weekday()]]
+    assert result == (enabled[0] if enabled else None)
@@ -0,0 +1,43 @@
+import uuid
+
+import pytest
+from app.database.models import NotificationTemplate
+from app.services import NotificationTemplateRegistry
+from sqlalchemy import Connection
+from sqlalchemy.ext.asyncio import AsyncConnection
+from sqlalchemy.orm import Session
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_updated_template_is_not_served_from_the_cache(connection: AsyncConnection) -> None:
+    def run(sync_connection: Connection) -> None:
+        session = Session(bind=sync_connection)
+        template = NotificationTemplate(
+            name=f"test_{uuid.uuid4().hex}", title="Hello {name}", body="Body"
+        )
+        session.add(template)
+        session.flush()
+        first = NotificationTemplateRegistry.get_by_name(session, template.name)
+
+        template.title = "Hi {name}"
+        session.flush()
+        current = NotificationTemplateRegistry.get_by_name(session, template.name)
+        dispatched_before = NotificationTemplateRegistry.get_many(
+            session, [(template.id, first.version)]
+        )
+
+        assert first.render({"name": "Ann"}) == ("Hello Ann", "Body")
+        assert current.version == first.version + 1
+        assert current.render({"name": "Ann"}) == ("Hi Ann", "Body")
+        assert dispatched_before == {(template.id, first.version): current}
+
+    await connection.run_sync(run)
+
+
+async def test_missing_template_name_raises(connection: AsyncConnection) -> None:
+    def run(sync_connection: Connection) -> None:
+        with pytest.raises(LookupError):
+            NotificationTemplateRegistry.get_by_name(Session(bind=sync_connection), "missing")
+
+    await connection.run_sync(run)
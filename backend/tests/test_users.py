@@ -0,0 +1,27 @@
+import uuid
+
+import pytest
+from app.api.routes.user import update_user_me
+from app.database.models import User
+from app.schemas import UserUpdatePartial
+from app.services import UserCache
+from sqlalchemy.ext.asyncio import AsyncSession
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_cached_user_is_invalidated_after_the_update_is_committed(
+    monkeypatch: pytest.MonkeyPatch, session: AsyncSession, user: User
+) -> None:
+    invalidated = []
+
+    async def invalidate(user_id: uuid.UUID) -> None:
+        invalidated.append((user_id, session.in_transaction()))
+
+    monkeypatch.setattr(UserCache, "invalidate", invalidate)
+    updated = await update_user_me(
+        user_in=UserUpdatePartial(name="Updated"), session=session, user_id=user.id
+    )
+
+    assert updated.name == "Updated"
+    assert invalidated == [(user.id, False)]
@@ -6,6 +6,7 @@ import com.raczu.skincareapp.data.domain.models.product.ProductUpdate
 import com.raczu.skincareapp.data.remote.ExplicitNull
 import com.raczu.skincareapp.data.remote.dto.product.ProductCreateRequest
 import com.raczu.skincareapp.data.remote.dto.product.ProductResponse
+import com.raczu.skincareapp.data.remote.dto.product.ProductSummaryResponse
 import com.raczu.skincareapp.data.remote.dto.product.ProductUpdateRequest
 
 fun ProductResponse.toDomain(): Product {
@@ -18,6 +19,13 @@ fun ProductResponse.toDomain(): Product {
     )
 }
 
+fun ProductSummaryResponse.toDomain(): Product {
+    return Product(
+        id = this.id,
+        name = this.name
+    )
+}
+
 fun ProductCreate.toRequest(): ProductCreateRequest {
     return ProductCreateRequest(
         name = this.name,
@@ -8,6 +8,7 @@ import com.raczu.skincareapp.data.remote.ExplicitNull
 import com.raczu.skincareapp.data.remote.api.toIsoString
 import com.raczu.skincareapp.data.remote.dto.routine.RoutineCreateRequest
 import com.raczu.skincareapp.data.remote.dto.routine.RoutineResponse
+import com.raczu.skincareapp.data.remote.dto.routine.RoutineSummaryResponse
 import com.raczu.skincareapp.data.remote.dto.routine.RoutineUpdateRequest
 import java.time.Instant
 import java.time.LocalDateTime
@@ -35,6 +36,19 @@ fun RoutineResponse.toDomain(): Routine {
     )
 }
 
+fun RoutineSummaryResponse.toDomain(): Routine {
+    return Routine(
+        id = this.id,
+        type = RoutineType.valueOf(this.type),
+        performedAt = LocalDateTime.ofInstant(
+            Instant.parse(this.performedAt),
+            ZoneId.systemDefault()
+        ),
+        notes = this.notes,
+        products = this.products.map { it.toDomain() }
+    )
+}
+
 fun RoutineUpdate.toRequest(): RoutineUpdateRequest {
     return RoutineUpdateRequest(
         type = this.type?.name,
@@ -3,6 +3,7 @@ package com.raczu.skincareapp.data.remote.api
 import com.raczu.skincareapp.data.remote.dto.PagedResponse
 import com.raczu.skincareapp.data.remote.dto.routine.RoutineCreateRequest
 import com.raczu.skincareapp.data.remote.dto.routine.RoutineResponse
+import com.raczu.skincareapp.data.remote.dto.routine.RoutineSummaryResponse
 import com.raczu.skincareapp.data.remote.dto.routine.RoutineUpdateRequest
 import retrofit2.Response
 import retrofit2.http.Body
@@ -23,7 +24,7 @@ interface RoutineApiService {
         @Query("offset") offset: Int,
         @Query("performed_after") performedAfter: String? = null,
         @Query("performed_before") performedBefore: String? = null
-    ): Response<PagedResponse<RoutineResponse>>
+    ): Response<PagedResponse<RoutineSummaryResponse>>
 
     @DELETE("routines/{id}")
     suspend fun deleteRoutine(@Path("id") routineId: String): Response<Unit>
@@ -0,0 +1,6 @@
+package com.raczu.skincareapp.data.remote.dto.product
+
+data class ProductSummaryResponse(
+    val id: String,
+    val name: String
+)